@@ -16,10 +16,13 @@ from app.db.base import Base
 # Import all models so Alembic can detect them
 from app.models.user import User
 from app.models.model import Model
+from app.models.model_alias import ModelAlias
 from app.models.prediction import Prediction
 from app.models.api_key import APIKey
 from app.models.webhook import Webhook
+from app.models.webhook_delivery import WebhookDelivery
 from app.models.model_share import ModelShare
+from app.models.usage_rollup import ModelLatencyBin, ModelStats, ModelUsageRollup
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -39,6 +42,17 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 target_metadata = Base.metadata
 
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Skip prediction partitions, which app.db.partitions manages outside the models"""
+    if type_ == "table" and reflected and compare_to is None:
+        return not name.startswith("predictions_")
+    if type_ == "index" and reflected and compare_to is None:
+        return not object.table.name.startswith("predictions_")
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -63,6 +77,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        include_object=include_object,
     )
 
     with context.begin_transaction():
@@ -83,7 +98,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,127 @@
+"""Partition predictions by month on created_at
+
+Revision ID: 3c5e0b7f4d21
+Revises: 7a1628dc92d8
+Create Date: 2026-10-19 13:40:52.118307
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c5e0b7f4d21'
+down_revision: Union[str, None] = '7a1628dc92d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, model_id, user_id, input_data, output_data, inference_time_ms, "
+    "status, error_message, created_at"
+)
+INDEXED_COLUMNS = ('created_at', 'id', 'model_id', 'status', 'user_id')
+# Future months created up front; `python -m app.db.partitions` keeps adding them
+MONTHS_AHEAD = 2
+
+
+def _prediction_columns(created_at_nullable: bool) -> list:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('model_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('input_data', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+        sa.Column('output_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('inference_time_ms', sa.Integer(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=created_at_nullable),
+        sa.ForeignKeyConstraint(['model_id'], ['models.id'], name='predictions_model_id_fkey', ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='predictions_user_id_fkey', ondelete='CASCADE'),
+    ]
+
+
+def _set_aside(name: str) -> None:
+    """Rename the current predictions table out of the way, freeing index names"""
+    for column in INDEXED_COLUMNS:
+        op.drop_index(op.f(f'ix_predictions_{column}'), table_name='predictions')
+    op.execute(f"ALTER TABLE predictions RENAME TO {name}")
+    op.execute(f"ALTER TABLE {name} RENAME CONSTRAINT predictions_pkey TO {name}_pkey")
+
+
+def _create_indexes() -> None:
+    for column in INDEXED_COLUMNS:
+        op.create_index(op.f(f'ix_predictions_{column}'), 'predictions', [column], unique=False)
+
+
+def _month_start(moment: datetime) -> datetime:
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(start: datetime, months: int) -> datetime:
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_partitions(oldest: datetime | None) -> None:
+    """Default partition plus one per month from the oldest row to MONTHS_AHEAD from now"""
+    op.execute("CREATE TABLE predictions_default PARTITION OF predictions DEFAULT")
+
+    current = _month_start(datetime.now(timezone.utc))
+    start = _month_start(oldest) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while start <= last:
+        end = _add_months(start, 1)
+        op.execute(
+            f"CREATE TABLE predictions_p{start.year:04d}_{start.month:02d} "
+            f"PARTITION OF predictions "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        start = end
+
+
+def upgrade() -> None:
+    _set_aside('predictions_legacy')
+
+    op.create_table('predictions',
+    *_prediction_columns(created_at_nullable=False),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    _create_indexes()
+
+    # One partition per month from the oldest logged prediction onwards
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(created_at) FROM predictions_legacy")
+    ).scalar()
+    _create_partitions(oldest)
+
+    op.execute(
+        f"""
+        INSERT INTO predictions ({COLUMNS})
+        SELECT id, model_id, user_id, input_data, output_data, inference_time_ms,
+            status, error_message, coalesce(created_at, now())
+        FROM predictions_legacy
+        """
+    )
+    op.drop_table('predictions_legacy')
+
+
+def downgrade() -> None:
+    _set_aside('predictions_partitioned')
+
+    op.create_table('predictions',
+    *_prediction_columns(created_at_nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    _create_indexes()
+
+    op.execute(
+        f"INSERT INTO predictions ({COLUMNS}) SELECT {COLUMNS} FROM predictions_partitioned"
+    )
+    # Dropping the parent drops every partition with it
+    op.drop_table('predictions_partitioned')
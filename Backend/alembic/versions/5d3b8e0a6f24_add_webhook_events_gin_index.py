@@ -0,0 +1,25 @@
+"""Add GIN index on webhook events
+
+Revision ID: 5d3b8e0a6f24
+Revises: 0a4f6d2c9b17
+Create Date: 2026-10-19 17:10:44.902371
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3b8e0a6f24'
+down_revision: Union[str, None] = '0a4f6d2c9b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_webhooks_events', 'webhooks', ['events'], unique=False, postgresql_using='gin', postgresql_ops={'events': 'jsonb_path_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhooks_events', table_name='webhooks', postgresql_using='gin', postgresql_ops={'events': 'jsonb_path_ops'})
@@ -0,0 +1,54 @@
+"""Add model latency sketch bins
+
+Revision ID: 7a1628dc92d8
+Revises: 90914f90a90b
+Create Date: 2026-10-19 11:02:17.284410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1628dc92d8'
+down_revision: Union[str, None] = '90914f90a90b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('model_latency_bins',
+    sa.Column('model_id', sa.UUID(), nullable=False),
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('bin', sa.Integer(), nullable=False),
+    sa.Column('count', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['model_id'], ['models.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('model_id', 'bucket', 'bin')
+    )
+
+    # Backfill sketch bins from successful predictions, using the same
+    # mapping as app.core.latency_sketch (1% relative accuracy)
+    op.execute(
+        """
+        INSERT INTO model_latency_bins (model_id, bucket, bin, count)
+        SELECT
+            model_id,
+            date_trunc('day', created_at),
+            CASE
+                WHEN inference_time_ms <= 0 THEN -2147483648
+                ELSE ceil(ln(inference_time_ms) / ln(1.01 / 0.99))::integer
+            END AS bin,
+            count(*)
+        FROM predictions
+        WHERE status = 'success'
+            AND inference_time_ms IS NOT NULL
+            AND created_at IS NOT NULL
+        GROUP BY 1, 2, 3
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('model_latency_bins')
@@ -0,0 +1,61 @@
+"""Add model usage rollups
+
+Revision ID: 90914f90a90b
+Revises: d12b8b029bf9
+Create Date: 2026-10-19 10:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90914f90a90b'
+down_revision: Union[str, None] = 'd12b8b029bf9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('model_usage_rollups',
+    sa.Column('model_id', sa.UUID(), nullable=False),
+    sa.Column('bucket', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('prediction_count', sa.BigInteger(), nullable=False),
+    sa.Column('success_count', sa.BigInteger(), nullable=False),
+    sa.Column('failure_count', sa.BigInteger(), nullable=False),
+    sa.Column('latency_count', sa.BigInteger(), nullable=False),
+    sa.Column('latency_sum_ms', sa.BigInteger(), nullable=False),
+    sa.Column('latency_min_ms', sa.Integer(), nullable=True),
+    sa.Column('latency_max_ms', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['model_id'], ['models.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('model_id', 'bucket')
+    )
+
+    # Backfill rollups from the existing prediction log
+    op.execute(
+        """
+        INSERT INTO model_usage_rollups (
+            model_id, bucket, prediction_count, success_count, failure_count,
+            latency_count, latency_sum_ms, latency_min_ms, latency_max_ms
+        )
+        SELECT
+            model_id,
+            date_trunc('hour', created_at),
+            count(*),
+            count(*) FILTER (WHERE status = 'success'),
+            count(*) FILTER (WHERE status <> 'success'),
+            count(inference_time_ms) FILTER (WHERE status = 'success'),
+            coalesce(sum(inference_time_ms) FILTER (WHERE status = 'success'), 0),
+            min(inference_time_ms) FILTER (WHERE status = 'success'),
+            max(inference_time_ms) FILTER (WHERE status = 'success')
+        FROM predictions
+        WHERE created_at IS NOT NULL
+        GROUP BY model_id, date_trunc('hour', created_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('model_usage_rollups')
@@ -0,0 +1,49 @@
+"""Add model aliases
+
+Revision ID: 927ceca28ce5
+Revises: bc5f1b1d939e
+Create Date: 2026-10-19 19:12:46.584056
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '927ceca28ce5'
+down_revision: Union[str, None] = 'bc5f1b1d939e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('model_aliases',
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('alias', sa.String(length=50), nullable=False),
+    sa.Column('model_id', sa.UUID(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['model_id'], ['models.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'name', 'alias')
+    )
+    op.create_index(op.f('ix_model_aliases_model_id'), 'model_aliases', ['model_id'], unique=False)
+
+    # Every family starts with "latest" on its highest active version
+    op.execute(
+        """
+        INSERT INTO model_aliases (user_id, name, alias, model_id)
+        SELECT DISTINCT ON (user_id, name) user_id, name, 'latest', id
+        FROM models
+        WHERE status = 'active'
+        ORDER BY user_id, name, version DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_model_aliases_model_id'), table_name='model_aliases')
+    op.drop_table('model_aliases')
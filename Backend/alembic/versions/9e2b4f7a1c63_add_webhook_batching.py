@@ -0,0 +1,28 @@
+"""Add webhook batching settings
+
+Revision ID: 9e2b4f7a1c63
+Revises: 5d3b8e0a6f24
+Create Date: 2026-10-19 18:02:17.311845
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e2b4f7a1c63'
+down_revision: Union[str, None] = '5d3b8e0a6f24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('webhooks', sa.Column('batch_size', sa.Integer(), nullable=True))
+    op.add_column('webhooks', sa.Column('batch_window_seconds', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('webhooks', 'batch_window_seconds')
+    op.drop_column('webhooks', 'batch_size')
@@ -0,0 +1,60 @@
+"""Add composite indexes for hot queries, drop redundant ones
+
+Revision ID: b84d2e61c0f9
+Revises: 3c5e0b7f4d21
+Create Date: 2026-10-19 14:21:07.530914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b84d2e61c0f9'
+down_revision: Union[str, None] = '3c5e0b7f4d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexes on primary key columns duplicate the primary key index
+PRIMARY_KEY_INDEXES = {
+    'ix_users_id': 'users',
+    'ix_models_id': 'models',
+    'ix_api_keys_id': 'api_keys',
+    'ix_model_shares_id': 'model_shares',
+    'ix_webhooks_id': 'webhooks',
+    'ix_predictions_id': 'predictions',
+}
+
+# Single-column indexes covered by a composite index (or never queried alone)
+SUPERSEDED_INDEXES = {
+    'ix_models_user_id': ('models', 'user_id'),
+    'ix_predictions_user_id': ('predictions', 'user_id'),
+    'ix_predictions_model_id': ('predictions', 'model_id'),
+    'ix_predictions_status': ('predictions', 'status'),
+    'ix_predictions_created_at': ('predictions', 'created_at'),
+}
+
+
+def upgrade() -> None:
+    op.create_index('ix_models_user_created', 'models', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_predictions_user_created', 'predictions', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_predictions_user_model_created', 'predictions', ['user_id', 'model_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_predictions_model_status_created', 'predictions', ['model_id', 'status', 'created_at'], unique=False)
+
+    for name, table in PRIMARY_KEY_INDEXES.items():
+        op.drop_index(name, table_name=table)
+    for name, (table, _) in SUPERSEDED_INDEXES.items():
+        op.drop_index(name, table_name=table)
+
+
+def downgrade() -> None:
+    for name, (table, column) in SUPERSEDED_INDEXES.items():
+        op.create_index(name, table, [column], unique=False)
+    for name, table in PRIMARY_KEY_INDEXES.items():
+        op.create_index(name, table, ['id'], unique=False)
+
+    op.drop_index('ix_predictions_model_status_created', table_name='predictions')
+    op.drop_index('ix_predictions_user_model_created', table_name='predictions')
+    op.drop_index('ix_predictions_user_created', table_name='predictions')
+    op.drop_index('ix_models_user_created', table_name='models')
@@ -0,0 +1,44 @@
+"""Add keyset pagination indexes for list endpoints
+
+Revision ID: bc5f1b1d939e
+Revises: 9e2b4f7a1c63
+Create Date: 2026-10-19 18:41:09.486825
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bc5f1b1d939e'
+down_revision: Union[str, None] = '9e2b4f7a1c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index(op.f('ix_api_keys_user_id'), table_name='api_keys')
+    op.create_index('ix_api_keys_user_created', 'api_keys', ['user_id', 'created_at', 'id'], unique=False)
+    op.drop_index(op.f('ix_model_shares_created_at'), table_name='model_shares')
+    op.drop_index(op.f('ix_model_shares_model_id'), table_name='model_shares')
+    op.drop_index(op.f('ix_model_shares_shared_with_user_id'), table_name='model_shares')
+    op.create_index('ix_model_shares_model_created', 'model_shares', ['model_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_model_shares_recipient_created', 'model_shares', ['shared_with_user_id', 'created_at', 'id'], unique=False)
+    op.drop_index(op.f('ix_webhooks_created_at'), table_name='webhooks')
+    op.drop_index(op.f('ix_webhooks_user_id'), table_name='webhooks')
+    op.create_index('ix_webhooks_user_created', 'webhooks', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_webhooks_user_created', table_name='webhooks')
+    op.create_index(op.f('ix_webhooks_user_id'), 'webhooks', ['user_id'], unique=False)
+    op.create_index(op.f('ix_webhooks_created_at'), 'webhooks', ['created_at'], unique=False)
+    op.drop_index('ix_model_shares_recipient_created', table_name='model_shares')
+    op.drop_index('ix_model_shares_model_created', table_name='model_shares')
+    op.create_index(op.f('ix_model_shares_shared_with_user_id'), 'model_shares', ['shared_with_user_id'], unique=False)
+    op.create_index(op.f('ix_model_shares_model_id'), 'model_shares', ['model_id'], unique=False)
+    op.create_index(op.f('ix_model_shares_created_at'), 'model_shares', ['created_at'], unique=False)
+    op.drop_index('ix_api_keys_user_created', table_name='api_keys')
+    op.create_index(op.f('ix_api_keys_user_id'), 'api_keys', ['user_id'], unique=False)
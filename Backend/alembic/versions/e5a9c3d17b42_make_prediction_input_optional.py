@@ -0,0 +1,32 @@
+"""Make prediction input_data nullable for payload-free logging
+
+Revision ID: e5a9c3d17b42
+Revises: b84d2e61c0f9
+Create Date: 2026-10-19 15:02:36.804127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c3d17b42'
+down_revision: Union[str, None] = 'b84d2e61c0f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column('predictions', 'input_data',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("UPDATE predictions SET input_data = '{}'::jsonb WHERE input_data IS NULL")
+    op.alter_column('predictions', 'input_data',
+               existing_type=postgresql.JSONB(astext_type=sa.Text()),
+               nullable=False)
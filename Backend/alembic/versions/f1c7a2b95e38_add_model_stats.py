@@ -0,0 +1,57 @@
+"""Add model stats counters
+
+Revision ID: f1c7a2b95e38
+Revises: e5a9c3d17b42
+Create Date: 2026-10-19 15:48:20.661042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c7a2b95e38'
+down_revision: Union[str, None] = 'e5a9c3d17b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('model_stats',
+    sa.Column('model_id', sa.UUID(), nullable=False),
+    sa.Column('prediction_count', sa.BigInteger(), nullable=False),
+    sa.Column('success_count', sa.BigInteger(), nullable=False),
+    sa.Column('failure_count', sa.BigInteger(), nullable=False),
+    sa.Column('latency_count', sa.BigInteger(), nullable=False),
+    sa.Column('latency_sum_ms', sa.BigInteger(), nullable=False),
+    sa.Column('last_prediction_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['model_id'], ['models.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('model_id')
+    )
+
+    # Backfill all-time counters from the hourly rollups (the last
+    # prediction time is only known to the hour there)
+    op.execute(
+        """
+        INSERT INTO model_stats (
+            model_id, prediction_count, success_count, failure_count,
+            latency_count, latency_sum_ms, last_prediction_at
+        )
+        SELECT
+            model_id,
+            sum(prediction_count),
+            sum(success_count),
+            sum(failure_count),
+            sum(latency_count),
+            sum(latency_sum_ms),
+            max(bucket)
+        FROM model_usage_rollups
+        GROUP BY model_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('model_stats')
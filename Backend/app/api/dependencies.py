@@ -196,6 +196,8 @@ def check_model_access(
     """
     Check if user has access to a model (owner or shared)
 
+    Answered from the user's cached access list (see app.core.access_control)
+
     Args:
         model_id: Model UUID
         user_id: User UUID
@@ -205,29 +207,6 @@ def check_model_access(
     Returns:
         True if user has access, False otherwise
     """
-    from app.models.model import Model
-    from app.models.model_share import ModelShare
-
-    # Check if user owns the model
-    model = db.query(Model).filter(Model.id == model_id).first()
-    if model and str(model.user_id) == str(user_id):
-        return True
-
-    # Check if model is shared with user
-    share = (
-        db.query(ModelShare)
-        .filter(
-            ModelShare.model_id == model_id, ModelShare.shared_with_user_id == user_id
-        )
-        .first()
-    )
-
-    if not share:
-        return False
-
-    # Check permission level
-    permission_levels = {"view": 0, "use": 1, "edit": 2}
-    user_level = permission_levels.get(share.permission.value, 0)
-    required_level = permission_levels.get(required_permission, 0)
+    from app.core.access_control import get_access_control
 
-    return user_level >= required_level
+    return get_access_control().can_access(db, user_id, model_id, required_permission)
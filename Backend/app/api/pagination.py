@@ -0,0 +1,212 @@
+"""
+Keyset pagination helpers
+Opaque cursors over (created_at, id) for constant-time deep pages
+
+Totals are optional: list endpoints take a count_mode of "exact"
+(COUNT(*)), "estimate" (the planner's row estimate, counted exactly when
+small) or "none".
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+# Accepted count_mode values (also the pattern for the query parameter)
+COUNT_MODES = ("exact", "estimate", "none")
+COUNT_MODE_PATTERN = f"^({'|'.join(COUNT_MODES)})$"
+
+# Estimates below this are replaced by an exact count, which is cheap there
+# and where planner estimates are least reliable
+EXACT_COUNT_BELOW = 1000
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper that keeps the statement's bind parameter processing"""
+
+    inherit_cache = False
+
+    def __init__(self, statement, format: Optional[str] = None):
+        self.statement = statement
+        self.format = format
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    options = f"(FORMAT {element.format.upper()}) " if element.format else ""
+    return f"EXPLAIN {options}" + compiler.process(element.statement, **kw)
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """
+    Encode the position after a row as an opaque cursor
+
+    Args:
+        created_at: The row's created_at
+        row_id: The row's primary key
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"t": created_at.isoformat(), "id": str(row_id)})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload["t"]), UUID(payload["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
+        )
+
+
+def keyset_query(
+    query: Query,
+    created_at_column: Any,
+    id_column: Any,
+    per_page: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+) -> Query:
+    """
+    The query paginate_keyset runs for one page (plus one lookahead row)
+
+    Args:
+        query: Filtered query
+        created_at_column: Column to order by (descending)
+        id_column: Unique tie-breaker column
+        per_page: Page size
+        cursor: Cursor from a previous page's next_cursor
+        offset: Rows to skip when no cursor is given
+
+    Returns:
+        Ordered and limited query
+    """
+    if cursor:
+        cursor_created_at, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(created_at_column, id_column) < tuple_(cursor_created_at, cursor_id)
+        )
+    elif offset:
+        query = query.offset(offset)
+
+    # One extra row tells us whether another page exists
+    return query.order_by(created_at_column.desc(), id_column.desc()).limit(per_page + 1)
+
+
+def paginate_keyset(
+    query: Query,
+    created_at_column: Any,
+    id_column: Any,
+    per_page: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    position: Callable[[Any], tuple[datetime, UUID]] = lambda row: (row.created_at, row.id),
+) -> tuple[list, Optional[str]]:
+    """
+    Fetch one page ordered newest first, continuing after a cursor
+
+    Uses a row comparison on (created_at, id) instead of OFFSET, so every
+    page costs the same regardless of depth (given an index ending in
+    created_at, id).
+
+    Args:
+        query: Filtered query
+        created_at_column: Column to order by (descending)
+        id_column: Unique tie-breaker column
+        per_page: Page size
+        cursor: Cursor from a previous page's next_cursor
+        offset: Rows to skip when no cursor is given (page-number clients)
+        position: Extracts (created_at, id) from a result row
+
+    Returns:
+        Tuple of (rows, next_cursor or None on the last page)
+    """
+    rows = keyset_query(
+        query, created_at_column, id_column, per_page, cursor=cursor, offset=offset
+    ).all()
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        next_cursor = encode_cursor(*position(rows[-1]))
+
+    return rows, next_cursor
+
+
+def resolve_count_mode(count_mode: Optional[str], cursor: Optional[str]) -> str:
+    """Default count mode: exact for the first page-number request, none when following a cursor"""
+    if count_mode is not None:
+        return count_mode
+    return "exact" if cursor is None else "none"
+
+
+def count_rows(query: Query, count_mode: str) -> Optional[int]:
+    """
+    Count the rows a filtered query matches
+
+    Args:
+        query: Filtered query (ordering is ignored)
+        count_mode: "exact", "estimate" or "none"
+
+    Returns:
+        Row count, or None for count_mode "none"
+    """
+    if count_mode == "none":
+        return None
+
+    query = query.order_by(None)
+    if count_mode == "estimate":
+        plan = query.session.execute(Explain(query.statement, format="json")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate >= EXACT_COUNT_BELOW:
+            return estimate
+
+    return query.count()
+
+
+def page_info(
+    page: int,
+    per_page: int,
+    cursor: Optional[str],
+    next_cursor: Optional[str],
+    total_items: Optional[int],
+    count_mode: str,
+) -> dict:
+    """
+    Pagination block for list responses
+
+    Returns:
+        Dict with page, per_page, total_pages, total_items, count_mode,
+        next_cursor and has_more (totals are None without a count)
+    """
+    return {
+        "page": page if cursor is None else None,
+        "per_page": per_page,
+        "total_pages": (
+            (total_items + per_page - 1) // per_page if total_items is not None else None
+        ),
+        "total_items": total_items,
+        "count_mode": count_mode,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None,
+    }
@@ -2,10 +2,12 @@
 API Key management endpoints
 Handles creation, listing, and revocation of API keys
 """
-from fastapi import APIRouter, Depends, HTTPException, Security, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
 import secrets
 import hashlib
 
@@ -18,6 +20,8 @@ from app.schemas.api_key import (
     APIKeyUpdate
 )
 from app.api.dependencies import get_current_user, bearer_scheme
+from app.api.pagination import (COUNT_MODE_PATTERN, count_rows, page_info, paginate_keyset,
+                                resolve_count_mode)
 from app.core.rate_limiter import rate_limit
 from app.core.rate_limit_config import (
     API_KEYS_CREATE, API_KEYS_LIST, API_KEYS_GET, API_KEYS_UPDATE, API_KEYS_REVOKE
@@ -36,6 +40,18 @@ def hash_api_key(api_key: str) -> str:
     return hashlib.sha256(api_key.encode()).hexdigest()
 
 
+def api_key_list_query(db: Session, user_id: UUID):
+    """A user's API keys as list items (never the key hash), for GET /api-keys"""
+    return db.query(
+        APIKey.id,
+        APIKey.name,
+        APIKey.is_active,
+        APIKey.last_used_at,
+        APIKey.expires_at,
+        APIKey.created_at,
+    ).filter(APIKey.user_id == user_id)
+
+
 @router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def create_api_key(
     key_data: APIKeyCreate,
@@ -89,34 +105,50 @@ async def create_api_key(
 
 @router.get("", response_model=dict)
 async def list_api_keys(
+    page: int = 1,
+    per_page: int = 20,
+    cursor: Optional[str] = None,
+    count_mode: Optional[str] = Query(None, pattern=COUNT_MODE_PATTERN),
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
     _rate_limit: None = Depends(rate_limit(API_KEYS_LIST)),
 ):
     """
-    List all API keys for the current user
+    List API keys for the current user
     
+    - **cursor**: Cursor from the previous page's `pagination.next_cursor`
+    - **page**: Page number (without a cursor; deep pages are slower)
+    - **per_page**: Items per page (default: 20, max: 100)
+    - **count_mode**: Total count: exact, estimate or none (default: exact without a cursor)
+
     Requires authentication
     
-    Returns list of API keys (without the actual keys)
+    Returns paginated list of API keys (without the actual keys), newest first
     """
-    api_keys = db.query(APIKey).filter(APIKey.user_id == current_user.id).all()
-    
-    keys_list = []
-    for key in api_keys:
-        keys_list.append({
-            "id": str(key.id),
-            "name": key.name,
-            "is_active": key.is_active,
-            "last_used_at": key.last_used_at.isoformat() if key.last_used_at else None,
-            "expires_at": key.expires_at.isoformat() if key.expires_at else None,
-            "created_at": key.created_at.isoformat(),
-            "prefix": "mlp_" + "*" * 8  # Show prefix only
-        })
+    per_page = max(1, min(per_page, 100))
+    count_mode = resolve_count_mode(count_mode, cursor)
+
+    query = api_key_list_query(db, current_user.id)
+
+    total = count_rows(query, count_mode)
+    rows, next_cursor = paginate_keyset(
+        query,
+        APIKey.created_at,
+        APIKey.id,
+        per_page,
+        cursor=cursor,
+        offset=(max(page, 1) - 1) * per_page,
+    )
+
+    keys_list = [
+        {**row._asdict(), "prefix": "mlp_" + "*" * 8}  # Show prefix only
+        for row in rows
+    ]
     
     return {
         "success": True,
-        "data": keys_list
+        "data": keys_list,
+        "pagination": page_info(page, per_page, cursor, next_cursor, total, count_mode),
     }
 
 
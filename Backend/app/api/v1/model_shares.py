@@ -3,12 +3,16 @@ Model sharing endpoints
 Handles sharing models between users
 """
 
+from typing import Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Security, status
-from sqlalchemy import desc
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
+from sqlalchemy.orm import Session, aliased
 
 from app.api.dependencies import get_current_user
+from app.api.pagination import (COUNT_MODE_PATTERN, count_rows, page_info, paginate_keyset,
+                                resolve_count_mode)
+from app.core.access_control import AccessControl, get_access_control
 from app.core.rate_limiter import rate_limit
 from app.core.rate_limit_config import (
     SHARING_CREATE, SHARING_LIST, SHARING_UPDATE, SHARING_DELETE, SHARED_WITH_ME
@@ -23,6 +27,43 @@ from app.schemas.model_share import (ModelShareCreate, ModelShareResponse,
 router = APIRouter(prefix="/models", tags=["Model Sharing"])
 
 
+def model_shares_query(db: Session, model_id: UUID):
+    """A model's shares with recipient details, for GET /models/{id}/shares"""
+    # Recipient details come from the same query (no per-row lookups)
+    return (
+        db.query(
+            ModelShare.id,
+            User.email.label("shared_with_email"),
+            User.full_name.label("shared_with_name"),
+            ModelShare.permission,
+            ModelShare.created_at,
+        )
+        .join(User, User.id == ModelShare.shared_with_user_id)
+        .filter(ModelShare.model_id == model_id)
+    )
+
+
+def shared_with_me_query(db: Session, user_id: UUID):
+    """Shares received by a user with model and owner details, for GET /models/shared-with-me"""
+    # Model and owner details come from the same query (no per-row lookups)
+    owner = aliased(User)
+    return (
+        db.query(
+            ModelShare.id,
+            ModelShare.model_id,
+            Model.name.label("model_name"),
+            Model.version.label("model_version"),
+            owner.email.label("owner_email"),
+            owner.full_name.label("owner_name"),
+            ModelShare.permission,
+            ModelShare.created_at,
+        )
+        .join(Model, Model.id == ModelShare.model_id)
+        .join(owner, owner.id == ModelShare.owner_id)
+        .filter(ModelShare.shared_with_user_id == user_id)
+    )
+
+
 @router.post(
     "/{model_id}/share", response_model=dict, status_code=status.HTTP_201_CREATED
 )
@@ -31,6 +72,7 @@ async def share_model(
     share_request: ModelShareCreate,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
+    access: AccessControl = Depends(get_access_control),
     _rate_limit: None = Depends(rate_limit(SHARING_CREATE)),
 ):
     """
@@ -100,6 +142,7 @@ async def share_model(
     db.add(new_share)
     db.commit()
     db.refresh(new_share)
+    access.invalidate(str(target_user.id))
 
     return {
         "success": True,
@@ -111,6 +154,10 @@ async def share_model(
 @router.get("/{model_id}/shares", response_model=dict)
 async def list_model_shares(
     model_id: str,
+    page: int = 1,
+    per_page: int = 20,
+    cursor: Optional[str] = None,
+    count_mode: Optional[str] = Query(None, pattern=COUNT_MODE_PATTERN),
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
     _rate_limit: None = Depends(rate_limit(SHARING_LIST)),
@@ -119,9 +166,16 @@ async def list_model_shares(
     List users this model is shared with
 
     - **model_id**: Model UUID
+    - **cursor**: Cursor from the previous page's `pagination.next_cursor`
+    - **page**: Page number (without a cursor; deep pages are slower)
+    - **per_page**: Items per page (default: 20, max: 100)
+    - **count_mode**: Total count: exact, estimate or none (default: exact without a cursor)
 
     Requires authentication and model ownership
     """
+    per_page = max(1, min(per_page, 100))
+    count_mode = resolve_count_mode(count_mode, cursor)
+
     # Validate model exists and user owns it
     model = db.query(Model).filter(Model.id == model_id).first()
 
@@ -136,26 +190,28 @@ async def list_model_shares(
             detail="You can only view shares for your own models",
         )
 
-    # Get shares
-    shares = (
-        db.query(ModelShare)
-        .filter(ModelShare.model_id == model_id)
-        .order_by(desc(ModelShare.created_at))
-        .all()
+    query = model_shares_query(db, model_id)
+
+    total = count_rows(query, count_mode)
+    rows, next_cursor = paginate_keyset(
+        query,
+        ModelShare.created_at,
+        ModelShare.id,
+        per_page,
+        cursor=cursor,
+        offset=(max(page, 1) - 1) * per_page,
     )
 
     share_list = [
-        {
-            "id": str(share.id),
-            "shared_with_email": share.shared_with_user.email,
-            "shared_with_name": share.shared_with_user.full_name,
-            "permission": share.permission.value,
-            "created_at": share.created_at.isoformat(),
-        }
-        for share in shares
+        {**row._asdict(), "permission": row.permission.value} for row in rows
     ]
 
-    return {"success": True, "data": share_list, "total": len(share_list)}
+    return {
+        "success": True,
+        "data": share_list,
+        "total": total,
+        "pagination": page_info(page, per_page, cursor, next_cursor, total, count_mode),
+    }
 
 
 @router.patch("/{model_id}/shares/{share_id}", response_model=dict)
@@ -165,6 +221,7 @@ async def update_model_share(
     update_request: ModelShareUpdate,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
+    access: AccessControl = Depends(get_access_control),
     _rate_limit: None = Depends(rate_limit(SHARING_UPDATE)),
 ):
     """
@@ -206,6 +263,7 @@ async def update_model_share(
     share.permission = update_request.permission
     db.commit()
     db.refresh(share)
+    access.invalidate(str(share.shared_with_user_id))
 
     return {
         "success": True,
@@ -220,6 +278,7 @@ async def delete_model_share(
     share_id: str,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
+    access: AccessControl = Depends(get_access_control),
     _rate_limit: None = Depends(rate_limit(SHARING_DELETE)),
 ):
     """
@@ -256,8 +315,10 @@ async def delete_model_share(
             status_code=status.HTTP_404_NOT_FOUND, detail="Share not found"
         )
 
+    shared_with_user_id = str(share.shared_with_user_id)
     db.delete(share)
     db.commit()
+    access.invalidate(shared_with_user_id)
 
     return None
 
@@ -266,6 +327,8 @@ async def delete_model_share(
 async def list_shared_models(
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = None,
+    count_mode: Optional[str] = Query(None, pattern=COUNT_MODE_PATTERN),
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
     _rate_limit: None = Depends(rate_limit(SHARED_WITH_ME)),
@@ -273,42 +336,43 @@ async def list_shared_models(
     """
     List models shared with the current user
 
-    - **page**: Page number (default: 1)
+    - **cursor**: Cursor from the previous page's `pagination.next_cursor`
+    - **page**: Page number (without a cursor; deep pages are slower)
     - **per_page**: Items per page (default: 20, max: 100)
+    - **count_mode**: Total count: exact, estimate or none (default: exact without a cursor)
 
     Requires authentication
     """
-    # Query shares
-    query = db.query(ModelShare).filter(
-        ModelShare.shared_with_user_id == current_user.id
-    )
-
-    total = query.count()
-    skip = (page - 1) * per_page
-    shares = (
-        query.order_by(desc(ModelShare.created_at)).offset(skip).limit(per_page).all()
+    per_page = max(1, min(per_page, 100))
+    count_mode = resolve_count_mode(count_mode, cursor)
+
+    query = shared_with_me_query(db, current_user.id)
+
+    total = count_rows(query, count_mode)
+    rows, next_cursor = paginate_keyset(
+        query,
+        ModelShare.created_at,
+        ModelShare.id,
+        per_page,
+        cursor=cursor,
+        offset=(max(page, 1) - 1) * per_page,
     )
 
     shared_models = [
         {
-            "model_id": str(share.model.id),
-            "model_name": share.model.name,
-            "model_version": share.model.version,
-            "owner_email": share.owner.email,
-            "owner_name": share.owner.full_name,
-            "permission": share.permission.value,
-            "shared_at": share.created_at.isoformat(),
+            "model_id": row.model_id,
+            "model_name": row.model_name,
+            "model_version": row.model_version,
+            "owner_email": row.owner_email,
+            "owner_name": row.owner_name,
+            "permission": row.permission.value,
+            "shared_at": row.created_at,
         }
-        for share in shares
+        for row in rows
     ]
 
     return {
         "success": True,
         "data": shared_models,
-        "pagination": {
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page,
-            "total_items": total,
-        },
+        "pagination": page_info(page, per_page, cursor, next_cursor, total, count_mode),
     }
@@ -7,14 +7,24 @@ import os
 import uuid as uuid_lib
 from typing import Optional
 
-from fastapi import (APIRouter, Depends, File, Form, HTTPException, Security, UploadFile,
-                     status)
-from sqlalchemy import desc, func
+from fastapi import (APIRouter, Depends, File, Form, HTTPException, Path, Query, Security,
+                     UploadFile, status)
+from sqlalchemy import desc
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_user
+from app.api.pagination import (COUNT_MODE_PATTERN, count_rows, page_info, paginate_keyset,
+                                resolve_count_mode)
+from app.core.access_control import AccessControl, get_access_control
+from app.core.caching import PredictionCache, get_cache
 from app.core.config import settings
+from app.core.model_aliases import (ALIAS_PATTERN, LATEST_ALIAS, AliasResolver,
+                                    get_alias_resolver)
+from app.core.model_policy import (CachePolicy, LoggingPolicy, PolicyStore,
+                                   get_policy_store, with_policy)
 from app.core.rate_limiter import rate_limit
+from app.core.usage_rollups import (get_latency_percentiles, get_model_stats,
+                                    get_usage_summary)
 from app.core.rate_limit_config import (
     MODELS_UPLOAD, MODELS_LIST, MODELS_GET, MODELS_UPDATE, MODELS_DELETE, MODELS_ANALYTICS
 )
@@ -22,14 +32,63 @@ from app.db.session import get_db
 from app.models.model import Model
 from app.models.prediction import Prediction
 from app.models.user import User
-from app.schemas.model import ModelListResponse, ModelResponse, ModelUpdate
+from app.schemas.model import ModelResponse, ModelUpdate
 from app.core.storage import StorageService
 
 router = APIRouter(prefix="/models", tags=["Models"])
 
+# Columns of a model list item (see ModelListResponse)
+MODEL_LIST_COLUMNS = (
+    Model.id,
+    Model.name,
+    Model.version,
+    Model.status,
+    Model.model_type,
+    Model.file_size,
+    Model.created_at,
+)
+
 storage = StorageService()
 
 
+def model_list_query(db: Session, user_id: uuid_lib.UUID, status_filter: Optional[str] = None):
+    """
+    A user's models as list items, for GET /models
+
+    Args:
+        db: Database session
+        user_id: The owner
+        status_filter: Optional status to filter by
+
+    Returns:
+        Unordered query of MODEL_LIST_COLUMNS rows
+    """
+    # Only the summary columns, as plain rows
+    query = db.query(*MODEL_LIST_COLUMNS).filter(Model.user_id == user_id)
+    if status_filter:
+        query = query.filter(Model.status == status_filter)
+    return query
+
+
+def latest_version_query(db: Session, user_id: uuid_lib.UUID, name: str):
+    """Versions of a user's model family, newest first (for the next upload's version)"""
+    return (
+        db.query(Model)
+        .filter(Model.user_id == user_id, Model.name == name)
+        .order_by(desc(Model.version))
+    )
+
+
+def recent_errors_query(db: Session, model_id: uuid_lib.UUID, limit: int = 10):
+    """A model's most recent failed predictions, for GET /models/{id}/analytics"""
+    return (
+        db.query(Prediction)
+        .filter(Prediction.model_id == model_id, Prediction.status == "failed")
+        .order_by(desc(Prediction.created_at))
+        .limit(limit)
+    )
+
+
 @router.post("/upload", response_model=dict, status_code=status.HTTP_201_CREATED)
 async def upload_model(
     file: UploadFile = File(...),
@@ -38,6 +97,8 @@ async def upload_model(
     model_type: str = Form(...),
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
+    access: AccessControl = Depends(get_access_control),
+    aliases: AliasResolver = Depends(get_alias_resolver),
     _rate_limit: None = Depends(rate_limit(MODELS_UPLOAD)),
 ):
     """
@@ -71,12 +132,7 @@ async def upload_model(
         )
 
     # Get next version number for this model name
-    latest_model = (
-        db.query(Model)
-        .filter(Model.user_id == current_user.id, Model.name == name)
-        .order_by(desc(Model.version))
-        .first()
-    )
+    latest_model = latest_version_query(db, current_user.id, name).first()
 
     version = 1 if not latest_model else latest_model.version + 1
 
@@ -104,8 +160,12 @@ async def upload_model(
     )
 
     db.add(new_model)
+    # The new version becomes the family's "latest"
+    aliases.refresh_latest(db, current_user.id, name)
     db.commit()
     db.refresh(new_model)
+    access.invalidate(str(current_user.id))
+    aliases.invalidate(current_user.id, name)
 
     return {
         "success": True,
@@ -121,6 +181,8 @@ async def upload_model(
 async def list_models(
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = None,
+    count_mode: Optional[str] = Query(None, pattern=COUNT_MODE_PATTERN),
     status_filter: Optional[str] = None,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
@@ -129,45 +191,46 @@ async def list_models(
     """
     List user's models
 
-    - **page**: Page number (default: 1)
+    - **cursor**: Cursor from the previous page's `pagination.next_cursor`
+    - **page**: Page number (without a cursor; deep pages are slower)
     - **per_page**: Items per page (default: 20, max: 100)
+    - **count_mode**: Total count: exact, estimate or none (default: exact without a cursor)
     - **status**: Filter by status (active, deprecated, archived)
 
     Requires authentication
 
-    Returns paginated list of models
+    Returns paginated list of models, newest first
     """
-    # Build query
-    query = db.query(Model).filter(Model.user_id == current_user.id)
-
-    if status_filter:
-        query = query.filter(Model.status == status_filter)
-
-    # Get total count
-    total = query.count()
-
-    # Paginate
-    skip = (page - 1) * per_page
-    models = query.order_by(desc(Model.created_at)).offset(skip).limit(per_page).all()
+    per_page = max(1, min(per_page, 100))
+    count_mode = resolve_count_mode(count_mode, cursor)
+
+    query = model_list_query(db, current_user.id, status_filter)
+
+    total = count_rows(query, count_mode)
+    rows, next_cursor = paginate_keyset(
+        query,
+        Model.created_at,
+        Model.id,
+        per_page,
+        cursor=cursor,
+        offset=(max(page, 1) - 1) * per_page,
+    )
 
-    # TODO: Add prediction count from predictions table
+    # Counters for the whole page in one lookup
+    stats = get_model_stats(db, [row.id for row in rows])
     model_list = [
         {
-            **ModelListResponse.model_validate(model).model_dump(),
-            "prediction_count": 0,  # Placeholder
+            **row._asdict(),
+            "prediction_count": stats[row.id]["total_predictions"],
+            "last_prediction_at": stats[row.id]["last_prediction_at"],
         }
-        for model in models
+        for row in rows
     ]
 
     return {
         "success": True,
         "data": model_list,
-        "pagination": {
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page,
-            "total_items": total,
-        },
+        "pagination": page_info(page, per_page, cursor, next_cursor, total, count_mode),
     }
 
 
@@ -176,6 +239,7 @@ async def get_model(
     model_id: str,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
+    aliases: AliasResolver = Depends(get_alias_resolver),
     _rate_limit: None = Depends(rate_limit(MODELS_GET)),
 ):
     """
@@ -200,13 +264,15 @@ async def get_model(
             detail="Not authorized to access this model",
         )
 
-    # TODO: Add statistics from predictions table
     response_data = ModelResponse.model_validate(model).model_dump()
-    response_data["statistics"] = {
-        "total_predictions": 0,
-        "avg_inference_time_ms": 0,
-        "success_rate": 100.0,
-    }
+    response_data["statistics"] = get_model_stats(db, [model.id])[model.id]
+    response_data["cache_policy"] = CachePolicy.from_metadata(model.model_metadata).to_dict()
+    response_data["logging_policy"] = LoggingPolicy.from_metadata(model.model_metadata).to_dict()
+    response_data["aliases"] = sorted(
+        alias
+        for alias, target in aliases.get_aliases(db, model.user_id, model.name).items()
+        if target == str(model.id)
+    )
 
     return {"success": True, "data": response_data}
 
@@ -217,6 +283,9 @@ async def update_model(
     model_update: ModelUpdate,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
+    cache: PredictionCache = Depends(get_cache),
+    policies: PolicyStore = Depends(get_policy_store),
+    aliases: AliasResolver = Depends(get_alias_resolver),
     _rate_limit: None = Depends(rate_limit(MODELS_UPDATE)),
 ):
     """
@@ -225,6 +294,10 @@ async def update_model(
     - **model_id**: Model UUID
     - **description**: New description (optional)
     - **status**: New status (optional): active, deprecated, archived
+    - **cache_policy**: Prediction cache policy (optional): enabled, ttl,
+      max_entry_bytes, float_precision
+    - **logging_policy**: Prediction logging policy (optional): sample_rate,
+      payload (full, hash, none). Failed predictions are always logged.
 
     Requires authentication and ownership
     """
@@ -246,10 +319,39 @@ async def update_model(
         model.description = model_update.description
     if model_update.status is not None:
         model.status = model_update.status
+    if model_update.cache_policy is not None:
+        model.model_metadata = with_policy(
+            model.model_metadata,
+            CachePolicy,
+            model_update.cache_policy.model_dump(exclude_unset=True),
+        )
+    if model_update.logging_policy is not None:
+        model.model_metadata = with_policy(
+            model.model_metadata,
+            LoggingPolicy,
+            model_update.logging_policy.model_dump(exclude_unset=True),
+        )
+
+    status_changed = model_update.status is not None
+    if status_changed:
+        # Pinned aliases don't outlive their version; "latest" follows the
+        # highest active version
+        if model.status == "archived":
+            aliases.remove_model_aliases(db, model.id)
+        aliases.refresh_latest(db, model.user_id, model.name)
 
     db.commit()
     db.refresh(model)
 
+    if status_changed:
+        aliases.invalidate(model.user_id, model.name)
+    if model_update.cache_policy is not None or model_update.logging_policy is not None:
+        # Workers re-read the model's policies
+        policies.invalidate(str(model.id))
+    if model_update.cache_policy is not None:
+        # Entries keyed or sized under the old cache policy are dropped
+        await cache.invalidate_model_cache(str(model.id))
+
     # Trigger model_update webhooks in background
 
 
@@ -267,6 +369,7 @@ async def delete_model(
     model_id: str,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
+    aliases: AliasResolver = Depends(get_alias_resolver),
     _rate_limit: None = Depends(rate_limit(MODELS_DELETE)),
 ):
     """
@@ -293,7 +396,117 @@ async def delete_model(
 
     # Soft delete
     model.status = "archived"
+    aliases.remove_model_aliases(db, model.id)
+    aliases.refresh_latest(db, model.user_id, model.name)
+    db.commit()
+    aliases.invalidate(model.user_id, model.name)
+
+    return None
+
+
+@router.put("/{model_id}/aliases/{alias}", response_model=dict)
+async def set_model_alias(
+    model_id: str,
+    alias: str = Path(..., pattern=ALIAS_PATTERN),
+    current_user: User = Security(get_current_user),
+    db: Session = Depends(get_db),
+    aliases: AliasResolver = Depends(get_alias_resolver),
+    _rate_limit: None = Depends(rate_limit(MODELS_UPDATE)),
+):
+    """
+    Point an alias of the model's family at this version
+
+    - **model_id**: Model UUID (the version to pin)
+    - **alias**: Alias name, e.g. stable or canary ("latest" is maintained automatically)
+
+    Requires authentication and ownership
+
+    Predict through the alias with POST /predict/by-name/{name}/{alias}
+    """
+    if alias == LATEST_ALIAS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'"{LATEST_ALIAS}" always points at the highest active version',
+        )
+
+    model = db.query(Model).filter(Model.id == model_id).first()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Model not found"
+        )
+
+    if model.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to modify this model",
+        )
+
+    if model.status == "archived":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot alias an archived model",
+        )
+
+    aliases.set_alias(db, model, alias)
+    db.commit()
+    aliases.invalidate(model.user_id, model.name)
+
+    return {
+        "success": True,
+        "data": {
+            "name": model.name,
+            "alias": alias,
+            "model_id": str(model.id),
+            "version": model.version,
+        },
+        "message": f"{model.name}@{alias} now points at version {model.version}",
+    }
+
+
+@router.delete("/{model_id}/aliases/{alias}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_model_alias(
+    model_id: str,
+    alias: str,
+    current_user: User = Security(get_current_user),
+    db: Session = Depends(get_db),
+    aliases: AliasResolver = Depends(get_alias_resolver),
+    _rate_limit: None = Depends(rate_limit(MODELS_UPDATE)),
+):
+    """
+    Remove an alias from the model's family
+
+    - **model_id**: Model UUID (any version of the family)
+    - **alias**: Alias name ("latest" cannot be removed)
+
+    Requires authentication and ownership
+    """
+    if alias == LATEST_ALIAS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'"{LATEST_ALIAS}" is maintained automatically',
+        )
+
+    model = db.query(Model).filter(Model.id == model_id).first()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Model not found"
+        )
+
+    if model.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to modify this model",
+        )
+
+    if not aliases.remove_alias(db, model.user_id, model.name, alias):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Alias not found"
+        )
+
     db.commit()
+    aliases.invalidate(model.user_id, model.name)
 
     return None
 
@@ -314,7 +527,8 @@ async def get_model_analytics(
 
     Requires authentication and ownership
 
-    Returns prediction count, avg inference time, success rate, and usage trends
+    Returns prediction count, avg inference time, latency percentiles
+    (p50/p95/p99 over the period and per day), success rate, and usage trends
     """
     # Validate model exists and user has access
     model = db.query(Model).filter(Model.id == model_id).first()
@@ -334,93 +548,16 @@ async def get_model_analytics(
     if days > 90:
         days = 90
 
-    # Query predictions for this model
-    predictions_query = db.query(Prediction).filter(Prediction.model_id == model_id)
-
-    # Overall statistics
-    total_predictions = predictions_query.count()
-    successful_predictions = predictions_query.filter(
-        Prediction.status == "success"
-    ).count()
-    failed_predictions = predictions_query.filter(Prediction.status == "failed").count()
-
-    # Calculate success rate
-    success_rate = (
-        (successful_predictions / total_predictions * 100)
-        if total_predictions > 0
-        else 0
-    )
-
-    # Average inference time (only for successful predictions)
-    avg_inference_time = (
-        db.query(func.avg(Prediction.inference_time_ms))
-        .filter(
-            Prediction.model_id == model_id,
-            Prediction.status == "success",
-            Prediction.inference_time_ms.isnot(None),
-        )
-        .scalar()
-    )
-
-    # Min and max inference time
-    min_inference_time = (
-        db.query(func.min(Prediction.inference_time_ms))
-        .filter(
-            Prediction.model_id == model_id,
-            Prediction.status == "success",
-            Prediction.inference_time_ms.isnot(None),
-        )
-        .scalar()
-    )
-
-    max_inference_time = (
-        db.query(func.max(Prediction.inference_time_ms))
-        .filter(
-            Prediction.model_id == model_id,
-            Prediction.status == "success",
-            Prediction.inference_time_ms.isnot(None),
-        )
-        .scalar()
-    )
-
-    # Daily usage trends (last N days)
-    from datetime import datetime, timedelta
+    # Overall statistics and daily usage trends from the hourly rollups
+    usage = get_usage_summary(db, model.id, days)
 
-    from sqlalchemy import Date, cast
-
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
-
-    daily_stats = (
-        db.query(
-            cast(Prediction.created_at, Date).label("date"),
-            func.count(Prediction.id).label("count"),
-            func.avg(Prediction.inference_time_ms).label("avg_time"),
-        )
-        .filter(Prediction.model_id == model_id, Prediction.created_at >= cutoff_date)
-        .group_by(cast(Prediction.created_at, Date))
-        .order_by(cast(Prediction.created_at, Date))
-        .all()
-    )
-
-    usage_trends = [
-        {
-            "date": str(stat.date),
-            "prediction_count": stat.count,
-            "avg_inference_time_ms": (
-                round(float(stat.avg_time), 2) if stat.avg_time else None
-            ),
-        }
-        for stat in daily_stats
-    ]
+    # Tail latency merged from the daily latency sketches
+    latency = get_latency_percentiles(db, model.id, days)
+    for trend in usage["usage_trends"]:
+        trend["latency_percentiles_ms"] = latency["daily"].get(trend["date"])
 
     # Recent errors (last 10)
-    recent_errors = (
-        db.query(Prediction)
-        .filter(Prediction.model_id == model_id, Prediction.status == "failed")
-        .order_by(desc(Prediction.created_at))
-        .limit(10)
-        .all()
-    )
+    recent_errors = recent_errors_query(db, model_id).all()
 
     error_list = [
         {
@@ -438,17 +575,10 @@ async def get_model_analytics(
             "model_name": model.name,
             "model_version": model.version,
             "statistics": {
-                "total_predictions": total_predictions,
-                "successful_predictions": successful_predictions,
-                "failed_predictions": failed_predictions,
-                "success_rate": round(success_rate, 2),
-                "avg_inference_time_ms": (
-                    round(float(avg_inference_time), 2) if avg_inference_time else None
-                ),
-                "min_inference_time_ms": min_inference_time,
-                "max_inference_time_ms": max_inference_time,
+                **usage["statistics"],
+                "latency_percentiles_ms": latency["overall"],
             },
-            "usage_trends": usage_trends,
+            "usage_trends": usage["usage_trends"],
             "recent_errors": error_list,
             "analysis_period_days": days,
         },
@@ -8,28 +8,46 @@ import joblib
 import logging
 import time
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from uuid import UUID
 
 import numpy as np
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Security, status
+from fastapi import (APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request,
+                     Response, Security, status)
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_user
+from app.api.pagination import (COUNT_MODE_PATTERN, count_rows, page_info, paginate_keyset,
+                                resolve_count_mode)
+from app.core.access_control import AccessControl, get_access_control
 from app.core.caching import PredictionCache, get_cache
+from app.core.input_converter import FeatureMismatchError, is_batch_payload
+from app.core.model_aliases import AliasResolver, get_alias_resolver
 from app.core.model_loader import ModelLoader, get_model_loader
+from app.core.model_policy import (DEFAULT_LOGGING_POLICY, CachePolicy, LoggingPolicy,
+                                   PolicyStore, get_policy_store)
 from app.core.rate_limiter import rate_limit
 from app.core.rate_limit_config import PREDICT, PREDICT_HISTORY
+from app.core.serialization import FastJSONResponse
+from app.core.tensor_codec import (TENSOR_MEDIA_TYPES, TensorCodecError, decode_tensor,
+                                   encode_tensor, is_tensor_content_type,
+                                   negotiate_tensor_type)
+from app.core.usage_rollups import get_usage_recorder
 from app.core.webhook_service import trigger_webhooks
 from app.db.session import get_db
 from app.models.model import Model
+from app.models.model_share import SharePermission
 from app.models.prediction import Prediction
 from app.models.user import User
 from app.schemas.prediction import PredictionInput
 from app.core.storage import StorageService
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/predict", tags=["Predictions"])
+router = APIRouter(
+    prefix="/predict", tags=["Predictions"], default_response_class=FastJSONResponse
+)
 
 
 # Background task to log predictions
@@ -42,35 +60,266 @@ def log_prediction_to_db(
     inference_time_ms: int,
     status: str = "success",
     error_message: str = None,
+    logging_policy: LoggingPolicy = DEFAULT_LOGGING_POLICY,
 ):
-    """Background task to log prediction to database"""
+    """
+    Background task to log prediction to database
+
+    The model's logging policy decides whether a row is written (failures
+    always are) and how much of the payload it keeps. Every prediction is
+    counted towards the usage rollups, so analytics stay exact under sampling.
+    """
     try:
-        prediction_log = Prediction(
-            user_id=user_id,
-            model_id=model_id,
-            input_data=input_data,
-            output_data=output_data,
-            inference_time_ms=inference_time_ms,
-            status=status,
-            error_message=error_message,
-        )
-        db.add(prediction_log)
-        db.commit()
-        logger.info(f"Logged prediction for model {model_id}, status: {status}")
+        logged = logging_policy.should_log(status)
+        if logged:
+            input_data = logging_policy.trim_payload(input_data)
+            prediction_log = Prediction(
+                user_id=user_id,
+                model_id=model_id,
+                input_data=loggable_input(input_data) if input_data is not None else None,
+                output_data=logging_policy.trim_payload(output_data),
+                inference_time_ms=inference_time_ms,
+                status=status,
+                error_message=error_message,
+            )
+            db.add(prediction_log)
+            db.commit()
+            logger.info(f"Logged prediction for model {model_id}, status: {status}")
     except Exception as e:
         logger.error(f"Failed to log prediction: {str(e)}")
         db.rollback()
 
+    # Analytics rollups are buffered and written in batches, outside the log transaction
+    get_usage_recorder().record(model_id, status, inference_time_ms)
+
+
+async def get_prediction_input(
+    request: Request, version: Optional[int] = None
+) -> PredictionInput:
+    """
+    Parse the prediction request body
+
+    JSON bodies are validated as PredictionInput. Binary tensor bodies
+    (application/x-npy, application/octet-stream) are decoded zero-copy into an
+    ndarray under input["tensor"], with the model version taken from the query.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type")
+
+    if is_tensor_content_type(content_type):
+        try:
+            tensor = decode_tensor(body, content_type, request.headers)
+        except TensorCodecError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        return PredictionInput(input={"tensor": tensor}, version=version)
+
+    try:
+        return PredictionInput.model_validate_json(body)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
+
+
+def loggable_input(input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Replace binary tensors with a JSON-safe shape/dtype summary for logs and webhooks"""
+    return {
+        key: (
+            {"shape": list(value.shape), "dtype": str(value.dtype)}
+            if isinstance(value, np.ndarray)
+            else value
+        )
+        for key, value in input_data.items()
+    }
+
 
-@router.post("/{model_id}", response_model=dict)
+def format_prediction_result(
+    prediction: np.ndarray, proba: Optional[np.ndarray] = None
+) -> Dict[str, Any]:
+    """
+    Format model outputs for the response and cache
+
+    Whole arrays are converted with ndarray.tolist(). A single sample keeps
+    the scalar shape; a batch returns one entry per row plus batch_size.
+    """
+    predictions = prediction.tolist()
+    probabilities = proba.tolist() if proba is not None else None
+    confidence = proba.max(axis=1).tolist() if proba is not None else None
+
+    if len(predictions) == 1:
+        return {
+            "prediction": predictions[0],
+            "confidence": confidence[0] if confidence is not None else None,
+            "probabilities": probabilities[0] if probabilities is not None else None,
+        }
+
+    return {
+        "prediction": predictions,
+        "confidence": confidence,
+        "probabilities": probabilities,
+        "batch_size": len(predictions),
+    }
+
+
+def split_prediction_rows(
+    prediction: np.ndarray, proba: Optional[np.ndarray] = None
+) -> list[Dict[str, Any]]:
+    """Format model outputs as one single-sample result per row (for per-row caching)"""
+    predictions = prediction.tolist()
+    probabilities = proba.tolist() if proba is not None else [None] * len(predictions)
+    confidence = proba.max(axis=1).tolist() if proba is not None else [None] * len(predictions)
+
+    return [
+        {"prediction": p, "confidence": c, "probabilities": pr}
+        for p, c, pr in zip(predictions, confidence, probabilities)
+    ]
+
+
+def merge_prediction_rows(rows: list[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine single-sample results into the batch result format"""
+    has_proba = rows[0]["probabilities"] is not None
+    return {
+        "prediction": [row["prediction"] for row in rows],
+        "confidence": [row["confidence"] for row in rows] if has_proba else None,
+        "probabilities": [row["probabilities"] for row in rows] if has_proba else None,
+        "batch_size": len(rows),
+    }
+
+
+async def convert_input(
+    loader: ModelLoader,
+    model_id: str,
+    file_path: str,
+    input_schema: Optional[Dict[str, Any]],
+    input_data: Any,
+) -> np.ndarray:
+    """
+    Convert a payload to the model's feature matrix
+
+    The rows of this matrix are the canonical form cache keys are built
+    from, so the same sample hits the same entry whether it was sent as a
+    feature mapping, a list, a tensor or one row of a batch.
+    """
+    converter = await loader.load_input_converter(
+        file_path=file_path, model_id=model_id, input_schema=input_schema
+    )
+    # Contiguous so each row view hashes directly for its cache key
+    return np.ascontiguousarray(converter.convert(input_data))
+
+
+async def predict_batch_rows(
+    cache: PredictionCache,
+    loader: ModelLoader,
+    model_id: str,
+    version: int,
+    file_path: str,
+    input_schema: Optional[Dict[str, Any]],
+    input_data: Any,
+    policy: CachePolicy,
+) -> tuple[Dict[str, Any], int]:
+    """
+    Run a batch prediction with per-row caching
+
+    All rows are looked up with one multi-get; only the missing rows are sent
+    to the estimator, and their results are written back in one pipelined
+    multi-set. Rows are keyed on their converted feature row, like single
+    predictions, so batch and single requests share cache entries.
+
+    Returns:
+        Tuple of (batch result, number of rows served from cache)
+    """
+    X = await convert_input(loader, model_id, file_path, input_schema, input_data)
+    rows = list(X)
+
+    # Keys are built once so the misses are written under the generation they were read in
+    keys = cache.cache_keys(model_id, rows, version=version, policy=policy)
+    row_results = await cache.get_many(model_id, rows, version=version, policy=policy, keys=keys)
+    missing = [i for i, result in enumerate(row_results) if result is None]
+
+    if missing:
+        model = await loader.load_model(file_path=file_path, model_id=model_id)
+        X_missing = X[missing]
+        prediction = model.predict(X_missing)
+        proba = model.predict_proba(X_missing) if hasattr(model, "predict_proba") else None
+        computed = split_prediction_rows(prediction, proba)
+
+        for i, result in zip(missing, computed):
+            row_results[i] = result
+
+        await cache.set_many(
+            model_id,
+            [rows[i] for i in missing],
+            computed,
+            version=version,
+            policy=policy,
+            keys=[keys[i] for i in missing] if keys else None,
+        )
+
+    return merge_prediction_rows(row_results), len(rows) - len(missing)
+
+
+def tensor_response(
+    prediction_result: Dict[str, Any],
+    metadata: Dict[str, Any],
+    media_type: str,
+    output: str,
+) -> Response:
+    """Encode a prediction result as a binary tensor response with metadata headers"""
+    values = prediction_result.get(output)
+    if values is None:
+        raise HTTPException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Model does not provide '{output}' output",
+        )
+
+    # Tensors always keep the batch dimension, even for a single sample
+    if "batch_size" not in prediction_result:
+        values = [values]
+
+    try:
+        body, headers = encode_tensor(np.asarray(values), media_type)
+    except TensorCodecError as e:
+        raise HTTPException(status_code=status.HTTP_406_NOT_ACCEPTABLE, detail=str(e))
+
+    headers.update(
+        {
+            "X-Model-Id": metadata["model_id"],
+            "X-Model-Version": str(metadata["model_version"]),
+            "X-Inference-Time-Ms": str(metadata["inference_time_ms"]),
+            "X-Prediction-Cached": str(metadata["prediction_cached"]).lower(),
+        }
+    )
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+# Request body of the predict routes: JSON or a binary tensor
+PREDICT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": PredictionInput.model_json_schema()},
+            **{
+                media_type: {"schema": {"type": "string", "format": "binary"}}
+                for media_type in TENSOR_MEDIA_TYPES
+            },
+        },
+    }
+}
+
+
+@router.post("/{model_id}", response_model=dict, openapi_extra=PREDICT_OPENAPI)
 async def predict(
     model_id: str,
-    prediction_input: PredictionInput,
+    request: Request,
     background_tasks: BackgroundTasks,
+    output: str = "prediction",
+    prediction_input: PredictionInput = Depends(get_prediction_input),
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
     loader: ModelLoader = Depends(get_model_loader),
     cache: PredictionCache = Depends(get_cache),
+    policies: PolicyStore = Depends(get_policy_store),
+    access: AccessControl = Depends(get_access_control),
     _rate_limit: None = Depends(rate_limit(PREDICT)),
 ):
     """
@@ -79,15 +328,29 @@ async def predict(
     - **model_id**: Model UUID
     - **input**: Input data as JSON object
     - **version**: Optional model version (defaults to latest)
+    - **output**: Field returned in binary responses (prediction or probabilities)
 
-    Requires authentication
+    Requires authentication and ownership or a "use" share of the model
 
     Returns prediction result with metadata
+
+    **Binary tensors:** Send `Content-Type: application/x-npy` (or
+    `application/octet-stream` with `X-Tensor-Shape`/`X-Tensor-Dtype` headers)
+    to skip JSON parsing, and `Accept` with the same types to get the output
+    back as a tensor with metadata in `X-*` response headers.
     
     **Performance:** Results are cached in Redis. Identical inputs return cached results instantly.
+    Caching follows the model's cache policy (see PATCH /models/{model_id}).
     """
     start_time = time.time()
     cache_hit = False
+    tensor_type = negotiate_tensor_type(request.headers.get("accept"))
+
+    if output not in ("prediction", "probabilities"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="output must be 'prediction' or 'probabilities'",
+        )
 
     # Get model
     query = db.query(Model).filter(Model.id == model_id)
@@ -104,6 +367,13 @@ async def predict(
             detail="Model not found or version not available",
         )
 
+    # Owned and shared models come from the user's cached access list
+    if not access.can_access(db, current_user.id, model_record.id, SharePermission.USE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to make predictions with this model",
+        )
+
     if model_record.status not in ["active", "deprecated"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -111,115 +381,93 @@ async def predict(
         )
 
     try:
-        # ==================== CHECK CACHE FIRST ====================
-        cached_result = await cache.get_prediction(
-            model_id=str(model_record.id),
-            input_data=prediction_input.input,
-            version=model_record.version,
-        )
-        
-        if cached_result:
-            cache_hit = True
+        # Plain values so inference can run after the request (background refresh)
+        record_id = str(model_record.id)
+        file_path = model_record.file_path
+        model_type = model_record.model_type
+        input_schema = model_record.input_schema
+        input_data = prediction_input.input
+        # Per-model cache policy (TTL, size limit, key normalization, opt-out)
+        cache_policy = policies.get_cache_policy(record_id, model_record.model_metadata)
+        logging_policy = policies.get_logging_policy(record_id, model_record.model_metadata)
+
+        if model_type != "sklearn":
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail=f"Predictions for {model_type} models not yet implemented",
+            )
+
+        cached_rows = None
+
+        if is_batch_payload(input_data):
+            # ==================== BATCH: PER-ROW CACHE ====================
+            prediction_result, cached_rows = await predict_batch_rows(
+                cache,
+                loader,
+                model_id=record_id,
+                version=model_record.version,
+                file_path=file_path,
+                input_schema=input_schema,
+                input_data=input_data,
+                policy=cache_policy,
+            )
+            cache_hit = cached_rows == prediction_result["batch_size"]
+        else:
+            # ==================== CACHE LOOKUP / SINGLE-FLIGHT INFERENCE ====================
+            # Converter is compiled once per model version from its feature order;
+            # the converted row is the cache key input, shared with batch rows
+            X = await convert_input(loader, record_id, file_path, input_schema, input_data)
+
+            async def run_inference() -> dict:
+                # Load model using ModelLoader (handles model caching + S3/local storage)
+                model = await loader.load_model(file_path=file_path, model_id=record_id)
+                prediction = model.predict(X)
+                proba = model.predict_proba(X) if hasattr(model, "predict_proba") else None
+                return format_prediction_result(prediction, proba)
+
+            # Concurrent misses for the same input share one inference; the
+            # result is cached in the background after it's returned
+            prediction_result, cache_hit = await cache.get_or_compute(
+                model_id=record_id,
+                input_data=X[0],
+                compute=run_inference,
+                version=model_record.version,
+                policy=cache_policy,
+            )
+
+        if cache_hit:
             inference_time_ms = int((time.time() - start_time) * 1000)
-            
+
             logger.info(f"Cache HIT for model {model_id} - returning cached prediction")
-            
-            return {
-                "success": True,
-                "data": {
-                    "prediction": cached_result,
-                    "metadata": {
-                        "model_id": str(model_record.id),
-                        "model_version": model_record.version,
-                        "inference_time_ms": inference_time_ms,
-                        "model_cached": loader.is_model_cached(str(model_record.id)),
-                        "prediction_cached": True,
-                    },
-                    "timestamp": datetime.utcnow().isoformat(),
-                },
+
+            metadata = {
+                "model_id": record_id,
+                "model_version": model_record.version,
+                "inference_time_ms": inference_time_ms,
+                "model_cached": loader.is_model_cached(record_id),
+                "prediction_cached": True,
             }
-        
-        # ==================== CACHE MISS - RUN INFERENCE ====================
-        logger.info(f"Cache MISS for model {model_id} - running inference")
-        
-        # Load model using ModelLoader (handles model caching + S3/local storage)
-        model = await loader.load_model(
-            file_path=model_record.file_path,
-            model_id=str(model_record.id)
-        )
+            if cached_rows is not None:
+                metadata["cached_rows"] = cached_rows
 
-        # Prepare input data
-        input_data = prediction_input.input
+            if tensor_type:
+                return tensor_response(prediction_result, metadata, tensor_type, output)
 
-        # Convert input to numpy array for sklearn models
-        if model_record.model_type == "sklearn":
-            # Accept dict → single sample, list → single or batch
-            if isinstance(input_data, dict):
-                vals = list(input_data.values())
-                if len(vals) == 1 and isinstance(vals[0], (list, tuple, np.ndarray)):
-                    # Unwrap common payloads like {"features": [...]}
-                    inner = vals[0]
-                    if inner and all(isinstance(row, (list, tuple, np.ndarray)) for row in inner):
-                        # Batch inside the single key
-                        X = np.array(inner)
-                    else:
-                        X = np.array([list(inner)])
-                else:
-                    feature_values = vals
-                    X = np.array([feature_values])
-            elif isinstance(input_data, list):
-                # If already batch (list of lists/tuples), keep as-is; else wrap as single sample
-                if input_data and all(isinstance(row, (list, tuple)) for row in input_data):
-                    X = np.array(input_data)
-                else:
-                    X = np.array([input_data])
-            else:
-                raise ValueError("Input must be a dict or list")
-
-            if X.ndim > 2:
-                raise ValueError("Input must be 1D feature list or 2D batch of samples")
-
-            # Make prediction
-            prediction = model.predict(X)
-
-            # Get probabilities if available
-            probabilities = None
-            confidence = None
-            if hasattr(model, "predict_proba"):
-                proba = model.predict_proba(X)
-                probabilities = proba[0].tolist()
-                confidence = float(max(probabilities))
-
-            # Format result
-            prediction_result = {
-                "prediction": (
-                    int(prediction[0])
-                    if hasattr(prediction[0], "item")
-                    else prediction[0]
-                ),
-                "confidence": confidence,
-                "probabilities": probabilities,
-            }
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_501_NOT_IMPLEMENTED,
-                detail=f"Predictions for {model_record.model_type} models not yet implemented",
+            # Returned as a response object to skip response_model re-encoding
+            return FastJSONResponse(
+                {
+                    "success": True,
+                    "data": {
+                        "prediction": prediction_result,
+                        "metadata": metadata,
+                        "timestamp": datetime.utcnow().isoformat(),
+                    },
+                }
             )
 
         # Calculate inference time
         inference_time_ms = int((time.time() - start_time) * 1000)
 
-        # ==================== CACHE THE RESULT ====================
-        # Cache in background to not slow down response
-        background_tasks.add_task(
-            cache.set_prediction,
-            model_id=str(model_record.id),
-            input_data=prediction_input.input,
-            output_data=prediction_result,
-            version=model_record.version,
-            ttl=3600,  # 1 hour cache TTL
-        )
-
         # Log prediction to database asynchronously (non-blocking)
         background_tasks.add_task(
             log_prediction_to_db,
@@ -230,9 +478,11 @@ async def predict(
             output_data=prediction_result,
             inference_time_ms=inference_time_ms,
             status="success",
+            logging_policy=logging_policy,
         )
 
         # Trigger webhooks for prediction event
+        logged_input = loggable_input(prediction_input.input)
         background_tasks.add_task(
             trigger_webhooks,
             db=db,
@@ -240,35 +490,48 @@ async def predict(
             model_id=str(model_record.id),
             user_id=str(current_user.id),
             data={
-                "input": prediction_input.input,
+                "input": logged_input,
                 "output": prediction_result,
                 "inference_time_ms": inference_time_ms,
             },
         )
 
-        return {
-            "success": True,
-            "data": {
-                "prediction": prediction_result,
-                "metadata": {
-                    "model_id": str(model_record.id),
-                    "model_version": model_record.version,
-                    "inference_time_ms": inference_time_ms,
-                    "model_cached": loader.is_model_cached(str(model_record.id)),
-                    "prediction_cached": False,
-                },
-                "timestamp": datetime.utcnow().isoformat(),
-            },
+        metadata = {
+            "model_id": str(model_record.id),
+            "model_version": model_record.version,
+            "inference_time_ms": inference_time_ms,
+            "model_cached": loader.is_model_cached(str(model_record.id)),
+            "prediction_cached": False,
         }
+        if cached_rows is not None:
+            metadata["cached_rows"] = cached_rows
 
+        if tensor_type:
+            return tensor_response(prediction_result, metadata, tensor_type, output)
+
+        return FastJSONResponse(
+            {
+                "success": True,
+                "data": {
+                    "prediction": prediction_result,
+                    "metadata": metadata,
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+            }
+        )
+
+    except HTTPException:
+        raise
+    except FeatureMismatchError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Model file not found on disk"
         )
     except Exception as e:
-        # Log failed prediction asynchronously
-        background_tasks.add_task(
-            log_prediction_to_db,
+        # Log failed prediction inline: background tasks are dropped when
+        # the request ends in an exception
+        log_prediction_to_db(
             db=db,
             user_id=current_user.id,
             model_id=model_record.id,
@@ -277,16 +540,18 @@ async def predict(
             inference_time_ms=int((time.time() - start_time) * 1000),
             status="failed",
             error_message=str(e),
+            logging_policy=policies.get_logging_policy(
+                str(model_record.id), model_record.model_metadata
+            ),
         )
 
-        # Trigger webhooks for error event
-        background_tasks.add_task(
-            trigger_webhooks,
+        # Queue error webhooks inline as well
+        trigger_webhooks(
             db=db,
             event_type="error",
             model_id=str(model_record.id),
             user_id=str(current_user.id),
-            data={"error": str(e), "input": prediction_input.input},
+            data={"error": str(e), "input": loggable_input(prediction_input.input)},
         )
 
         logger.error(f"Prediction failed for model {model_id}: {str(e)}")
@@ -297,11 +562,89 @@ async def predict(
         )
 
 
+@router.post("/by-name/{name}/{alias}", response_model=dict, openapi_extra=PREDICT_OPENAPI)
+async def predict_by_alias(
+    name: str,
+    alias: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    output: str = "prediction",
+    prediction_input: PredictionInput = Depends(get_prediction_input),
+    current_user: User = Security(get_current_user),
+    db: Session = Depends(get_db),
+    loader: ModelLoader = Depends(get_model_loader),
+    cache: PredictionCache = Depends(get_cache),
+    policies: PolicyStore = Depends(get_policy_store),
+    access: AccessControl = Depends(get_access_control),
+    aliases: AliasResolver = Depends(get_alias_resolver),
+    _rate_limit: None = Depends(rate_limit(PREDICT)),
+):
+    """
+    Make a real-time prediction with the version an alias points at
+
+    - **name**: Model name (one of your model families)
+    - **alias**: Alias such as latest, stable or canary (see PUT /models/{model_id}/aliases/{alias})
+
+    Requires authentication
+
+    The alias is resolved from an in-process map, so this costs no more
+    than POST /predict/{model_id}. Accepts the same bodies and returns the
+    same result.
+    """
+    model_id = aliases.resolve(db, current_user.id, name, alias)
+
+    if model_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Model {name} has no alias {alias}",
+        )
+
+    return await predict(
+        model_id=model_id,
+        request=request,
+        background_tasks=background_tasks,
+        output=output,
+        prediction_input=prediction_input,
+        current_user=current_user,
+        db=db,
+        loader=loader,
+        cache=cache,
+        policies=policies,
+        access=access,
+        _rate_limit=_rate_limit,
+    )
+
+
+def prediction_history_query(db: Session, user_id: UUID, model_id: Optional[UUID] = None):
+    """
+    A user's predictions with their model names, for GET /predict/history
+
+    Args:
+        db: Database session
+        user_id: The user whose predictions to list
+        model_id: Optional model to filter by
+
+    Returns:
+        Unordered query of (Prediction, model_name) rows
+    """
+    # Model names come from the same query (no per-row lookups)
+    query = (
+        db.query(Prediction, Model.name.label("model_name"))
+        .outerjoin(Model, Model.id == Prediction.model_id)
+        .filter(Prediction.user_id == user_id)
+    )
+    if model_id:
+        query = query.filter(Prediction.model_id == model_id)
+    return query
+
+
 @router.get("/history", response_model=dict)
 async def get_prediction_history(
     model_id: str = None,
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = None,
+    count_mode: Optional[str] = Query(None, pattern=COUNT_MODE_PATTERN),
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
     _rate_limit: None = Depends(rate_limit(PREDICT_HISTORY)),
@@ -310,68 +653,63 @@ async def get_prediction_history(
     Get prediction history
 
     - **model_id**: Optional model UUID to filter by
-    - **page**: Page number
-    - **per_page**: Items per page
+    - **cursor**: Cursor from the previous page's `pagination.next_cursor`
+    - **page**: Page number (without a cursor; deep pages are slower)
+    - **per_page**: Items per page (max 100)
+    - **count_mode**: Total count: exact, estimate or none (default: exact without a cursor)
 
     Requires authentication
 
-    Returns paginated prediction history
+    Returns paginated prediction history, newest first
     """
-    try:
-        # Build query
-        query = db.query(Prediction).filter(Prediction.user_id == current_user.id)
+    per_page = max(1, min(per_page, 100))
+    count_mode = resolve_count_mode(count_mode, cursor)
 
+    try:
         # Filter by model if specified
+        model_uuid = None
         if model_id:
             try:
                 model_uuid = UUID(model_id)
-                query = query.filter(Prediction.model_id == model_uuid)
             except ValueError:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid model_id format",
                 )
 
-        # Get total count for pagination
-        total_items = query.count()
-        total_pages = (total_items + per_page - 1) // per_page
-
-        # Apply pagination and ordering
-        predictions = (
-            query.order_by(Prediction.created_at.desc())
-            .offset((page - 1) * per_page)
-            .limit(per_page)
-            .all()
+        query = prediction_history_query(db, current_user.id, model_uuid)
+
+        total = count_rows(query, count_mode)
+        rows, next_cursor = paginate_keyset(
+            query,
+            Prediction.created_at,
+            Prediction.id,
+            per_page,
+            cursor=cursor,
+            offset=(max(page, 1) - 1) * per_page,
+            position=lambda row: (row.Prediction.created_at, row.Prediction.id),
         )
 
-        # Format response with model names
-        data = []
-        for pred in predictions:
-            model = db.query(Model).filter(Model.id == pred.model_id).first()
-            data.append(
-                {
-                    "id": str(pred.id),
-                    "model_id": str(pred.model_id),
-                    "model_name": model.name if model else None,
-                    "user_id": str(pred.user_id),
-                    "input_data": pred.input_data,
-                    "output_data": pred.output_data,
-                    "inference_time_ms": pred.inference_time_ms,
-                    "status": pred.status,
-                    "error_message": pred.error_message,
-                    "created_at": pred.created_at.isoformat(),
-                }
-            )
+        data = [
+            {
+                "id": str(pred.id),
+                "model_id": str(pred.model_id),
+                "model_name": model_name,
+                "user_id": str(pred.user_id),
+                "input_data": pred.input_data,
+                "output_data": pred.output_data,
+                "inference_time_ms": pred.inference_time_ms,
+                "status": pred.status,
+                "error_message": pred.error_message,
+                "created_at": pred.created_at.isoformat(),
+            }
+            for pred, model_name in rows
+        ]
 
         return {
             "success": True,
             "data": data,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "total_items": total_items,
-            },
+            "pagination": page_info(page, per_page, cursor, next_cursor, total, count_mode),
         }
 
     except HTTPException:
@@ -443,14 +781,13 @@ async def invalidate_model_cache(
             detail="Not authorized to manage this model's cache",
         )
     
-    deleted_count = await cache.invalidate_model_cache(model_id)
+    generation = await cache.invalidate_model_cache(model_id)
     
     return {
         "success": True,
         "data": {
             "model_id": model_id,
-            "deleted_cache_entries": deleted_count,
+            "cache_generation": generation,
         },
-        "message": f"Invalidated {deleted_count} cached predictions for model {model_id}",
+        "message": f"Invalidated cached predictions for model {model_id}",
     }
-
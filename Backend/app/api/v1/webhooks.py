@@ -3,20 +3,21 @@ Webhook endpoints
 Handles webhook management and event dispatching
 """
 
-import hashlib
-import hmac
 from datetime import datetime
+from typing import Optional
+from uuid import UUID
 
-import httpx
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Security, status
-from sqlalchemy import desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
 from sqlalchemy.orm import Session
 
 from app.api.dependencies import get_current_user
+from app.api.pagination import (COUNT_MODE_PATTERN, count_rows, page_info, paginate_keyset,
+                                resolve_count_mode)
 from app.core.rate_limiter import rate_limit
 from app.core.rate_limit_config import (
     WEBHOOKS_CREATE, WEBHOOKS_LIST, WEBHOOKS_GET, WEBHOOKS_UPDATE, WEBHOOKS_DELETE, WEBHOOKS_TEST
 )
+from app.core.webhook_service import enqueue_delivery
 from app.db.session import get_db
 from app.models.model import Model
 from app.models.user import User
@@ -26,40 +27,26 @@ from app.schemas.webhook import (WebhookCreate, WebhookEvent, WebhookResponse,
 
 router = APIRouter(prefix="/webhooks", tags=["Webhooks"])
 
+# Columns of a webhook list item (see WebhookResponse)
+WEBHOOK_LIST_COLUMNS = (
+    Webhook.id,
+    Webhook.url,
+    Webhook.description,
+    Webhook.model_id,
+    Webhook.events,
+    Webhook.is_active,
+    Webhook.retry_count,
+    Webhook.timeout_seconds,
+    Webhook.batch_size,
+    Webhook.batch_window_seconds,
+    Webhook.created_at,
+    Webhook.last_triggered_at,
+)
 
-def generate_webhook_signature(payload: str, secret: str) -> str:
-    """Generate HMAC signature for webhook payload"""
-    return hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
-
-
-async def dispatch_webhook(webhook: Webhook, event: WebhookEvent):
-    """Dispatch webhook event with retries"""
-    payload = event.model_dump_json()
-    signature = generate_webhook_signature(payload, webhook.secret)
-
-    headers = {
-        "Content-Type": "application/json",
-        "X-Webhook-Signature": signature,
-        "X-Webhook-Timestamp": datetime.utcnow().isoformat(),
-    }
-
-    retry_count = int(webhook.retry_count)
-    timeout = int(webhook.timeout_seconds)
-
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        for attempt in range(retry_count):
-            try:
-                response = await client.post(
-                    str(webhook.url), content=payload, headers=headers
-                )
-                if response.status_code < 500:  # Success or client error
-                    return True
-            except httpx.RequestError:
-                if attempt < retry_count - 1:
-                    continue
-                return False
 
-    return False
+def webhook_list_query(db: Session, user_id: UUID):
+    """A user's webhooks as list items (never the secret), for GET /webhooks"""
+    return db.query(*WEBHOOK_LIST_COLUMNS).filter(Webhook.user_id == user_id)
 
 
 @router.post("", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -76,6 +63,8 @@ async def create_webhook(
     - **events**: List of events to listen for
     - **model_id**: Optional - specific model ID (NULL = all models)
     - **description**: Optional webhook description
+    - **batch_size**: Optional - post up to N events as one signed JSON array
+    - **batch_window_seconds**: Optional - longest wait for a batch to fill
 
     Requires authentication
     """
@@ -112,6 +101,8 @@ async def create_webhook(
         secret=secret,
         retry_count=str(webhook_create.retry_count or 3),
         timeout_seconds=str(webhook_create.timeout_seconds or 30),
+        batch_size=webhook_create.batch_size,
+        batch_window_seconds=webhook_create.batch_window_seconds,
     )
 
     db.add(new_webhook)
@@ -127,6 +118,8 @@ async def create_webhook(
         "is_active": new_webhook.is_active,
         "retry_count": new_webhook.retry_count,
         "timeout_seconds": new_webhook.timeout_seconds,
+        "batch_size": new_webhook.batch_size,
+        "batch_window_seconds": new_webhook.batch_window_seconds,
         "created_at": new_webhook.created_at,
         "last_triggered_at": new_webhook.last_triggered_at,
         "secret": secret,  # Only show secret once
@@ -143,6 +136,8 @@ async def create_webhook(
 async def list_webhooks(
     page: int = 1,
     per_page: int = 20,
+    cursor: Optional[str] = None,
+    count_mode: Optional[str] = Query(None, pattern=COUNT_MODE_PATTERN),
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
     _rate_limit: None = Depends(rate_limit(WEBHOOKS_LIST)),
@@ -150,31 +145,32 @@ async def list_webhooks(
     """
     List user's webhooks
 
-    - **page**: Page number (default: 1)
+    - **cursor**: Cursor from the previous page's `pagination.next_cursor`
+    - **page**: Page number (without a cursor; deep pages are slower)
     - **per_page**: Items per page (default: 20, max: 100)
+    - **count_mode**: Total count: exact, estimate or none (default: exact without a cursor)
 
     Requires authentication
     """
-    query = db.query(Webhook).filter(Webhook.user_id == current_user.id)
-    total = query.count()
-    skip = (page - 1) * per_page
-    webhooks = (
-        query.order_by(desc(Webhook.created_at)).offset(skip).limit(per_page).all()
+    per_page = max(1, min(per_page, 100))
+    count_mode = resolve_count_mode(count_mode, cursor)
+
+    query = webhook_list_query(db, current_user.id)
+
+    total = count_rows(query, count_mode)
+    rows, next_cursor = paginate_keyset(
+        query,
+        Webhook.created_at,
+        Webhook.id,
+        per_page,
+        cursor=cursor,
+        offset=(max(page, 1) - 1) * per_page,
     )
 
-    webhook_list = [
-        WebhookResponse.model_validate(webhook).model_dump() for webhook in webhooks
-    ]
-
     return {
         "success": True,
-        "data": webhook_list,
-        "pagination": {
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page,
-            "total_items": total,
-        },
+        "data": [row._asdict() for row in rows],
+        "pagination": page_info(page, per_page, cursor, next_cursor, total, count_mode),
     }
 
 
@@ -245,6 +241,10 @@ async def update_webhook(
         webhook.retry_count = str(update_request.retry_count)
     if update_request.timeout_seconds is not None:
         webhook.timeout_seconds = str(update_request.timeout_seconds)
+    if update_request.batch_size is not None:
+        webhook.batch_size = update_request.batch_size
+    if update_request.batch_window_seconds is not None:
+        webhook.batch_window_seconds = update_request.batch_window_seconds
 
     db.commit()
     db.refresh(webhook)
@@ -291,7 +291,6 @@ async def delete_webhook(
 async def test_webhook(
     webhook_id: str,
     test_request: WebhookTestRequest,
-    background_tasks: BackgroundTasks,
     current_user: User = Security(get_current_user),
     db: Session = Depends(get_db),
     _rate_limit: None = Depends(rate_limit(WEBHOOKS_TEST)),
@@ -323,11 +322,13 @@ async def test_webhook(
         data={"test": True, "message": "This is a test webhook"},
     )
 
-    # Dispatch in background
-    background_tasks.add_task(dispatch_webhook, webhook, test_event)
+    # Queue for the webhook dispatcher (sent right away, flushing any pending batch)
+    delivery = enqueue_delivery(db, webhook, test_event.model_dump(mode="json"), flush=True)
+    db.commit()
 
     return {
         "success": True,
-        "message": "Test event sent. Check your webhook URL logs.",
+        "message": "Test event queued. Check your webhook URL logs.",
+        "delivery_id": str(delivery.id),
         "event": test_event.model_dump(mode="json"),
     }
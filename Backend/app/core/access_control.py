@@ -0,0 +1,187 @@
+"""
+Access Control Service
+Resolves which models a user may view, use or edit
+
+Each user's access list (owned model IDs plus models shared with them and
+the share permission) is loaded with two queries and kept in process, so
+repeated checks, such as predictions against a shared model, cost no
+queries. Model uploads and share changes bump the affected user's ACL
+version in Redis and publish an invalidation. Every check compares the
+cached list's version with Redis (one GET), so a worker that missed the
+broadcast still stops honouring a revoked share on its next check.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+import redis
+from sqlalchemy.orm import Session
+
+from app.core.caching import LocalCache
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus, get_invalidation_bus
+from app.models.model import Model
+from app.models.model_share import ModelShare, SharePermission
+
+logger = logging.getLogger(__name__)
+
+
+# Invalidation bus topic for access lists (keyed by user ID)
+ACCESS_TOPIC = "model_access"
+
+# Redis counter bumped on every change to a user's access
+ACL_VERSION_KEY = "acl_ver:{user_id}"
+
+# Share permissions from weakest to strongest; owners can do everything
+PERMISSION_LEVELS = {
+    SharePermission.VIEW: 0,
+    SharePermission.USE: 1,
+    SharePermission.EDIT: 2,
+}
+OWNER_LEVEL = len(PERMISSION_LEVELS)
+
+
+@dataclass(frozen=True)
+class ModelACL:
+    """
+    A user's access to models
+
+    Attributes:
+        owned: IDs of models the user owns
+        shared: Model ID to share permission for models shared with the user
+    """
+
+    owned: frozenset[str] = frozenset()
+    shared: dict[str, SharePermission] = field(default_factory=dict)
+
+    def level(self, model_id: str) -> Optional[int]:
+        """Access level for a model (None = no access)"""
+        if model_id in self.owned:
+            return OWNER_LEVEL
+        permission = self.shared.get(model_id)
+        return PERMISSION_LEVELS[permission] if permission is not None else None
+
+    def allows(self, model_id: str, required: SharePermission) -> bool:
+        """Whether the user holds at least the required permission"""
+        level = self.level(model_id)
+        return level is not None and level >= PERMISSION_LEVELS[required]
+
+
+class AccessControl:
+    """In-process cache of per-user model access lists"""
+
+    def __init__(
+        self,
+        bus: Optional[InvalidationBus] = None,
+        redis_client: Optional[redis.Redis] = None,
+    ):
+        # user_id -> (ACL version, access list)
+        self.acls = LocalCache(
+            max_entries=settings.ACCESS_CACHE_MAX_USERS,
+            ttl=settings.ACCESS_CACHE_TTL_SECONDS,
+        )
+        self.bus = bus or InvalidationBus()
+        self.bus.subscribe(ACCESS_TOPIC, self._drop)
+        self.redis = redis_client
+
+    def get_acl(self, db: Session, user_id: str) -> ModelACL:
+        """
+        Get a user's access list, loading it on first use
+
+        Args:
+            db: Database session
+            user_id: User UUID
+
+        Returns:
+            The user's access list
+        """
+        user_id = str(user_id)
+        version = self._version(user_id)
+        cached = self.acls.get(user_id)
+        if cached is not None and version is not None and cached[0] == version:
+            return cached[1]
+
+        acl = self._load(db, user_id)
+        if version is not None:
+            self.acls.set(user_id, (version, acl), settings.ACCESS_CACHE_TTL_SECONDS)
+        return acl
+
+    def can_access(
+        self,
+        db: Session,
+        user_id: str,
+        model_id: str,
+        required: Union[SharePermission, str] = SharePermission.VIEW,
+    ) -> bool:
+        """
+        Check if a user owns a model or holds a share with the required permission
+
+        Args:
+            db: Database session
+            user_id: User UUID
+            model_id: Model UUID
+            required: Required permission level (view, use, edit)
+
+        Returns:
+            True if the user has access
+        """
+        return self.get_acl(db, user_id).allows(str(model_id), SharePermission(required))
+
+    def invalidate(self, user_id: str):
+        """Drop a user's access list on every worker after it changes"""
+        user_id = str(user_id)
+        if self.redis is not None:
+            try:
+                self.redis.incr(ACL_VERSION_KEY.format(user_id=user_id))
+            except Exception as e:
+                logger.error(f"ACL version bump failed for user {user_id}: {e}")
+        self.bus.publish(ACCESS_TOPIC, user_id)
+
+    def _version(self, user_id: str) -> Optional[int]:
+        """
+        Current ACL version of a user
+
+        Returns:
+            The version (0 without Redis, where invalidations are local
+            only), or None if Redis can't be read and nothing may be
+            served from the cache
+        """
+        if self.redis is None:
+            return 0
+        try:
+            return int(self.redis.get(ACL_VERSION_KEY.format(user_id=user_id)) or 0)
+        except Exception as e:
+            logger.error(f"ACL version read failed for user {user_id}: {e}")
+            return None
+
+    def _drop(self, user_id: str):
+        self.acls.delete(user_id)
+
+    @staticmethod
+    def _load(db: Session, user_id: str) -> ModelACL:
+        owned = db.query(Model.id).filter(Model.user_id == user_id).all()
+        shares = (
+            db.query(ModelShare.model_id, ModelShare.permission)
+            .filter(ModelShare.shared_with_user_id == user_id)
+            .all()
+        )
+        return ModelACL(
+            owned=frozenset(str(model_id) for (model_id,) in owned),
+            shared={str(model_id): permission for model_id, permission in shares},
+        )
+
+
+# Global access control instance
+_access_control: Optional[AccessControl] = None
+
+
+def get_access_control() -> AccessControl:
+    """Get or create the access control instance"""
+    global _access_control
+
+    if _access_control is None:
+        bus = get_invalidation_bus()
+        _access_control = AccessControl(bus, bus.redis)
+
+    return _access_control
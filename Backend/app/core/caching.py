@@ -5,16 +5,28 @@ Handles caching for predictions and other heavy operations.
 Memory-conscious implementation for Upstash Redis (250MB limit)
 """
 
-import hashlib
-import json
+import asyncio
 import logging
+import threading
 import time
-from typing import Any, Optional
-from dataclasses import dataclass
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from dataclasses import dataclass, replace
 
 import redis
 
 from app.core.config import settings
+from app.core.fingerprint import create_key_scheme
+from app.core.invalidation import InvalidationBus, get_invalidation_bus
+from app.core.model_policy import DEFAULT_CACHE_POLICY, CachePolicy
+from app.core.serialization import serializer
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
 
 logger = logging.getLogger(__name__)
 
@@ -22,180 +34,940 @@ logger = logging.getLogger(__name__)
 # Maximum size for cached items (1MB to be safe with 250MB limit)
 MAX_CACHE_SIZE_BYTES = 1 * 1024 * 1024  # 1MB per item
 
-# Default TTL for predictions (1 hour)
-DEFAULT_PREDICTION_TTL = 3600
+# Default TTL for predictions (1 hour), overridable per model via CachePolicy
+DEFAULT_PREDICTION_TTL = DEFAULT_CACHE_POLICY.ttl
 
 # Maximum number of predictions to cache per model
+# Enforced with a per-model sorted set of keys scored by last access
 MAX_CACHED_PREDICTIONS_PER_MODEL = 100
 
+# Set of model IDs that have a prediction index (for per-model stats)
+INDEXED_MODELS_KEY = "pred_models"
+
+# How often a worker waiting on another worker's computation polls Redis
+LOCK_POLL_INTERVAL_SECONDS = 0.05
+
+# Compare-and-delete: a holder whose lock already expired (and may have been
+# taken by another worker) must not release the new holder's lock
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+# Invalidation bus topic for prediction cache entries (keyed by model ID)
+PREDICTION_TOPIC = "prediction"
+
+# Header byte prefixed to every cached value so readers can tell formats apart
+FORMAT_RAW = b"\x00"
+FORMAT_ZLIB = b"\x01"
+FORMAT_ZSTD = b"\x02"
+
+
+class ValueCodec:
+    """
+    Encodes cached values with a one-byte format header.
+
+    Payloads at or above the compression threshold are compressed with zstd
+    (or zlib when zstandard isn't installed); smaller ones are stored raw.
+    """
+
+    def __init__(self, codec: str, threshold: int):
+        """
+        Initialize codec
+
+        Args:
+            codec: Compression codec (zstd, zlib, none)
+            threshold: Minimum payload size in bytes before compressing
+        """
+        codec = codec.lower()
+        if codec == "zstd" and zstandard is None:
+            logger.warning("zstandard not installed, falling back to zlib cache compression")
+            codec = "zlib"
+
+        self.codec = codec
+        self.threshold = threshold
+        self._zstd_compressor = zstandard.ZstdCompressor(level=3) if zstandard else None
+        self._zstd_decompressor = zstandard.ZstdDecompressor() if zstandard else None
+
+    def encode(self, payload: bytes) -> bytes:
+        """Prefix a format header, compressing large payloads"""
+        if len(payload) >= self.threshold:
+            if self.codec == "zstd":
+                return FORMAT_ZSTD + self._zstd_compressor.compress(payload)
+            if self.codec == "zlib":
+                return FORMAT_ZLIB + zlib.compress(payload, 6)
+        return FORMAT_RAW + payload
+
+    def decode(self, value: bytes) -> bytes:
+        """Strip the format header and decompress if needed"""
+        header, body = value[:1], value[1:]
+
+        if header == FORMAT_RAW:
+            return body
+        if header == FORMAT_ZLIB:
+            return zlib.decompress(body)
+        if header == FORMAT_ZSTD:
+            if self._zstd_decompressor is None:
+                raise ValueError("Cached value is zstd-compressed but zstandard is not installed")
+            return self._zstd_decompressor.decompress(body)
+
+        # Values written before format headers were plain JSON
+        return value
+
 
 @dataclass
 class CacheStats:
     """Statistics for cache operations"""
     hits: int = 0
+    local_hits: int = 0  # Hits served from the in-process cache
     misses: int = 0
     skipped_size: int = 0  # Skipped due to size limit
+    compressed: int = 0  # Values stored compressed
+    bytes_saved: int = 0  # Bytes saved by compression
+    evicted: int = 0  # Evicted by the per-model capacity limit
+    coalesced: int = 0  # Misses that waited for another request's computation
+    stale_served: int = 0  # Stale entries served while refreshing
     errors: int = 0
 
 
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry expiry.
+
+    Sits in front of Redis so hot keys are served without a network
+    round-trip. Thread-safe, since invalidations arrive on the
+    invalidation bus listener thread.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        """
+        Initialize local cache
+
+        Args:
+            max_entries: Maximum number of entries before LRU eviction
+            ttl: Upper bound for any entry's time-to-live in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store an entry for at most min(ttl, self.ttl) seconds"""
+        ttl = min(ttl, self.ttl)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        """Drop one entry"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """Drop every entry whose key starts with prefix"""
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class PredictionCache:
     """
     Redis-based cache for ML model predictions.
     
     Features:
     - Input-based cache key generation (same input = cache hit)
-    - Size-aware caching (skips large outputs)
+    - In-process LRU layer in front of Redis for hot keys
+    - Single-flight misses and optional stale-while-revalidate
+    - Transparent compression of large values
+    - Size-aware caching (skips outputs still too large after compression)
     - TTL-based expiration
     - Memory usage tracking
     """
     
-    def __init__(self, redis_client: Optional[redis.Redis] = None):
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        bus: Optional[InvalidationBus] = None,
+    ):
         self.redis = redis_client
         self.stats = CacheStats()
         self._enabled = redis_client is not None
+        self.local = LocalCache(
+            max_entries=settings.LOCAL_CACHE_MAX_ENTRIES,
+            ttl=settings.LOCAL_CACHE_TTL_SECONDS,
+        )
+        self.codec = ValueCodec(
+            codec=settings.CACHE_COMPRESSION,
+            threshold=settings.CACHE_COMPRESSION_THRESHOLD_BYTES,
+        )
+        # model_id -> (generation, local expiry)
+        self._generations: dict[str, tuple[int, float]] = {}
+        # Single-flight: cache key -> future of the in-progress computation
+        self._inflight: dict[str, asyncio.Future] = {}
+        # Background stale-while-revalidate refreshes: cache key -> task
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
+        # Cache writes scheduled after a computed result was returned
+        self._write_tasks: set[asyncio.Task] = set()
+        # model_id -> [hits, misses] in this process
+        self._model_counts: dict[str, list[int]] = {}
+        self.stale_seconds = settings.CACHE_STALE_WHILE_REVALIDATE_SECONDS
+        self.key_scheme = create_key_scheme()
+        self.bus = bus or InvalidationBus()
+        self.bus.subscribe(PREDICTION_TOPIC, self._invalidate_local)
         
         if not self._enabled:
             logger.warning("PredictionCache initialized without Redis - caching disabled")
+
+    def _invalidate_local(self, model_id: str):
+        """Drop a model's generation and entries from the in-process cache"""
+        self._generations.pop(model_id, None)
+        dropped = self.local.invalidate_prefix(f"pred:{model_id}:")
+        if dropped:
+            logger.debug(f"Dropped {dropped} local cache entries for model {model_id}")
+
+    @staticmethod
+    def _index_key(model_id: str) -> str:
+        """Sorted set of a model's cache keys scored by last access time"""
+        return f"pred_idx:{model_id}"
+
+    def _trim_model_index(self, model_id: str, size: int) -> int:
+        """
+        Evict a model's least recently used entries beyond its capacity.
+
+        Args:
+            model_id: The model UUID
+            size: Current index size
+
+        Returns:
+            Number of evicted entries
+        """
+        excess = size - MAX_CACHED_PREDICTIONS_PER_MODEL
+        if excess <= 0:
+            return 0
+
+        index_key = self._index_key(model_id)
+        evicted = self.redis.zrange(index_key, 0, excess - 1)
+        if not evicted:
+            return 0
+
+        pipe = self.redis.pipeline()
+        pipe.delete(*evicted)
+        pipe.zrem(index_key, *evicted)
+        pipe.execute()
+
+        self.stats.evicted += len(evicted)
+        logger.debug(f"Evicted {len(evicted)} cached predictions for model {model_id}")
+        return len(evicted)
+
+    def _get_generation(self, model_id: str) -> int:
+        """
+        Get the model's current cache generation.
+
+        The generation is part of every cache key, so bumping it invalidates
+        all of a model's entries at once. It's kept in process for at most
+        LOCAL_CACHE_TTL_SECONDS and dropped early by invalidation broadcasts.
+        """
+        cached = self._generations.get(model_id)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        generation = int(self.redis.get(f"pred_gen:{model_id}") or 0)
+        self._generations[model_id] = (
+            generation,
+            time.monotonic() + settings.LOCAL_CACHE_TTL_SECONDS,
+        )
+        return generation
     
-    def _generate_cache_key(self, model_id: str, input_data: Any, version: Optional[int] = None) -> str:
+    def _generate_cache_key(
+        self,
+        model_id: str,
+        input_data: Any,
+        version: Optional[int] = None,
+        generation: int = 0,
+        float_precision: Optional[int] = None,
+    ) -> str:
         """
         Generate a unique cache key based on model and input.
         
-        Key format: pred:{model_id}:{version}:{input_hash}
+        Key format: pred:{model_id}:g{generation}:{version}:{input_hash}
+
+        The input hash comes from the configured key scheme (a canonical
+        128-bit fingerprint by default), with floats rounded to
+        float_precision decimals first when set.
         """
-        # Serialize input to JSON for consistent hashing
-        input_json = json.dumps(input_data, sort_keys=True, default=str)
-        input_hash = hashlib.sha256(input_json.encode()).hexdigest()[:16]
-        
+        input_hash = self.key_scheme.digest(input_data, float_precision)
+
         version_str = str(version) if version else "latest"
-        return f"pred:{model_id}:{version_str}:{input_hash}"
-    
-    def _estimate_size(self, data: Any) -> int:
-        """Estimate the size of data in bytes"""
-        try:
-            return len(json.dumps(data, default=str).encode('utf-8'))
-        except Exception:
-            return 0
+        return f"pred:{model_id}:g{generation}:{version_str}:{input_hash}"
     
+    def _record(self, model_id: str, hits: int = 0, misses: int = 0):
+        """Count hits and misses globally and per model"""
+        self.stats.hits += hits
+        self.stats.misses += misses
+        counts = self._model_counts.setdefault(model_id, [0, 0])
+        counts[0] += hits
+        counts[1] += misses
+
+    def _key_for(self, model_id: str, input_data: Any, version: Optional[int], policy: CachePolicy) -> str:
+        """Cache key for an input under the model's current generation and policy"""
+        generation = self._get_generation(model_id)
+        return self._generate_cache_key(
+            model_id, input_data, version, generation, policy.float_precision
+        )
+
+    @staticmethod
+    def _resolve_policy(policy: Optional[CachePolicy], ttl: Optional[int]) -> CachePolicy:
+        """Model policy (or the default), with an explicit TTL taking precedence"""
+        policy = policy or DEFAULT_CACHE_POLICY
+        if ttl is not None and ttl != policy.ttl:
+            policy = replace(policy, ttl=ttl)
+        return policy
+
+    def _lookup(self, model_id: str, cache_key: str) -> Optional[tuple[dict, bool]]:
+        """
+        Read an entry from the local cache, then Redis.
+
+        Entries live in Redis for their TTL plus the stale-while-revalidate
+        window; an entry within that window is returned as stale.
+
+        Returns:
+            Tuple of (result, is_stale), or None on a miss
+        """
+        local_result = self.local.get(cache_key)
+        if local_result is not None:
+            self._record(model_id, hits=1)
+            self.stats.local_hits += 1
+            logger.debug(f"Local cache HIT for {cache_key}")
+            return local_result, False
+
+        # Fetch value and remaining TTL, and refresh the key's last access
+        # in the model index, in one round-trip
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.get(cache_key)
+        pipe.pttl(cache_key)
+        pipe.zadd(self._index_key(model_id), {cache_key: time.time()}, xx=True)
+        cached, ttl_ms, _ = pipe.execute()
+
+        if not cached:
+            self._record(model_id, misses=1)
+            logger.debug(f"Cache MISS for {cache_key}")
+            return None
+
+        self._record(model_id, hits=1)
+        return self._decode_entry(cache_key, cached, ttl_ms)
+
+    def _decode_entry(self, cache_key: str, cached: bytes, ttl_ms: Optional[int]) -> tuple[dict, bool]:
+        """Decode a Redis entry, keeping a local copy while it's fresh"""
+        result = serializer.loads(self.codec.decode(cached))
+
+        # Local copy never outlives the fresh part of the Redis entry
+        fresh_seconds = (ttl_ms or 0) / 1000 - self.stale_seconds
+        if fresh_seconds > 0:
+            self.local.set(cache_key, result, fresh_seconds)
+            logger.debug(f"Cache HIT for {cache_key}")
+            return result, False
+
+        logger.debug(f"Cache HIT (stale) for {cache_key}")
+        return result, ttl_ms is not None and ttl_ms >= 0
+
     async def get_prediction(
-        self, 
-        model_id: str, 
+        self,
+        model_id: str,
         input_data: Any,
-        version: Optional[int] = None
+        version: Optional[int] = None,
+        policy: Optional[CachePolicy] = None,
     ) -> Optional[dict]:
         """
         Get a cached prediction if it exists.
-        
+
         Args:
             model_id: The model UUID
             input_data: The prediction input
             version: Optional model version
-            
+            policy: The model's cache policy (defaults apply if omitted)
+
         Returns:
             Cached prediction result or None if not found
         """
-        if not self._enabled:
+        policy = policy or DEFAULT_CACHE_POLICY
+        if not self._enabled or not policy.enabled:
             return None
-        
-        cache_key = self._generate_cache_key(model_id, input_data, version)
-        
+
         try:
-            cached = self.redis.get(cache_key)
-            
-            if cached:
-                self.stats.hits += 1
-                result = json.loads(cached)
-                logger.debug(f"Cache HIT for {cache_key}")
-                return result
-            else:
-                self.stats.misses += 1
-                logger.debug(f"Cache MISS for {cache_key}")
-                return None
-                
+            cache_key = self._key_for(model_id, input_data, version, policy)
+            found = self._lookup(model_id, cache_key)
+            return found[0] if found else None
+
         except Exception as e:
             self.stats.errors += 1
             logger.error(f"Cache get error: {e}")
             return None
-    
+
+    async def get_or_compute(
+        self,
+        model_id: str,
+        input_data: Any,
+        compute: Callable[[], Awaitable[dict]],
+        version: Optional[int] = None,
+        ttl: Optional[int] = None,
+        policy: Optional[CachePolicy] = None,
+    ) -> tuple[dict, bool]:
+        """
+        Get a cached prediction, computing it at most once on a miss.
+
+        Concurrent misses for the same key share one computation: within a
+        process through an in-flight future, across workers through a short
+        Redis lock while the others wait for the value to appear. With
+        stale-while-revalidate enabled, a stale entry is returned immediately
+        while a single background refresh runs.
+
+        Args:
+            model_id: The model UUID
+            input_data: The prediction input
+            compute: Coroutine function producing the prediction result
+            version: Optional model version
+            ttl: Time-to-live in seconds (defaults to the policy's TTL)
+            policy: The model's cache policy (defaults apply if omitted)
+
+        Returns:
+            Tuple of (result, served_from_cache). served_from_cache is True
+            whenever this call didn't run compute itself: a cache hit, or a
+            result shared by a concurrent computation in this process or on
+            another worker
+        """
+        policy = self._resolve_policy(policy, ttl)
+        if not self._enabled or not policy.enabled:
+            return await compute(), False
+
+        cache_key = None
+        try:
+            cache_key = self._key_for(model_id, input_data, version, policy)
+            found = self._lookup(model_id, cache_key)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Cache get error: {e}")
+            found = None
+
+        if cache_key is None:
+            return await compute(), False
+
+        if found is not None:
+            result, is_stale = found
+            if is_stale:
+                self.stats.stale_served += 1
+                self._spawn_refresh(cache_key, model_id, input_data, compute, version, policy)
+            return result, True
+
+        return await self._single_flight(cache_key, model_id, input_data, compute, version, policy)
+
+    async def _single_flight(
+        self,
+        cache_key: str,
+        model_id: str,
+        input_data: Any,
+        compute: Callable[[], Awaitable[dict]],
+        version: Optional[int],
+        policy: CachePolicy,
+    ) -> tuple[dict, bool]:
+        """Run compute once per key per process, coordinating workers with a Redis lock"""
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            self.stats.coalesced += 1
+            # Like a waiter on another worker's lock: served without running compute
+            return await asyncio.shield(inflight), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+
+        try:
+            result, from_cache = await self._compute_with_lock(
+                cache_key, model_id, input_data, compute, version, policy
+            )
+            future.set_result(result)
+            return result, from_cache
+
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure isn't logged by asyncio
+            future.exception()
+            raise
+
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _compute_with_lock(
+        self,
+        cache_key: str,
+        model_id: str,
+        input_data: Any,
+        compute: Callable[[], Awaitable[dict]],
+        version: Optional[int],
+        policy: CachePolicy,
+    ) -> tuple[dict, bool]:
+        """Compute under a cross-worker lock, or wait for the worker holding it"""
+        lock_key = f"lock:{cache_key}"
+        lock_ms = settings.CACHE_LOCK_TIMEOUT_MS
+        token = uuid.uuid4().hex.encode()
+
+        try:
+            acquired = self.redis.set(lock_key, token, nx=True, px=lock_ms)
+        except Exception as e:
+            logger.error(f"Cache lock error: {e}")
+            acquired = False
+            token = None  # Fail open: compute locally without a lock
+
+        if not acquired and token is not None:
+            # Another worker is computing this key: wait for its result
+            self.stats.coalesced += 1
+            found = await self._wait_for_holder(cache_key, lock_key, lock_ms)
+            if found is not None:
+                return found[0], True
+
+        try:
+            result = await compute()
+        except BaseException:
+            if acquired:
+                self._release_lock(lock_key, token)
+            raise
+
+        # The write runs after the result is returned, keeping it off the
+        # response path; the lock is held until then so waiters on other
+        # workers find the value instead of computing it again
+        task = asyncio.create_task(
+            self._store_and_unlock(
+                cache_key, model_id, input_data, result, version, policy,
+                lock_key, token if acquired else None,
+            )
+        )
+        self._write_tasks.add(task)
+        task.add_done_callback(self._write_tasks.discard)
+        return result, False
+
+    async def _store_and_unlock(
+        self,
+        cache_key: str,
+        model_id: str,
+        input_data: Any,
+        result: dict,
+        version: Optional[int],
+        policy: CachePolicy,
+        lock_key: str,
+        token: Optional[bytes],
+    ):
+        """Cache a computed result, then release the lock if this worker holds it"""
+        try:
+            await self.set_prediction(
+                model_id, input_data, result, version, policy=policy, cache_key=cache_key
+            )
+        finally:
+            if token is not None:
+                self._release_lock(lock_key, token)
+
+    async def _wait_for_holder(
+        self, cache_key: str, lock_key: str, lock_ms: int
+    ) -> Optional[tuple[dict, bool]]:
+        """
+        Poll for the lock holder's result without counting each poll as a miss.
+
+        Stops as soon as the lock is released: if the value isn't in Redis by
+        then, the holder failed or skipped caching it and waiting longer
+        won't help.
+
+        Returns:
+            Tuple of (result, is_stale), or None if the caller should compute
+        """
+        deadline = time.monotonic() + lock_ms / 1000
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LOCK_POLL_INTERVAL_SECONDS)
+            try:
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.get(cache_key)
+                pipe.pttl(cache_key)
+                pipe.exists(lock_key)
+                cached, ttl_ms, locked = pipe.execute()
+            except Exception:
+                return None
+
+            if cached:
+                return self._decode_entry(cache_key, cached, ttl_ms)
+            if not locked:
+                logger.debug(f"Lock released without a cached value for {cache_key}, computing locally")
+                return None
+
+        logger.debug(f"Lock wait timed out for {cache_key}, computing locally")
+        return None
+
+    def _release_lock(self, lock_key: str, token: bytes):
+        """Delete the lock only if this worker still holds it"""
+        try:
+            self.redis.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except Exception as e:
+            # The lock still expires on its own after CACHE_LOCK_TIMEOUT_MS
+            logger.warning(f"Cache lock release error for {lock_key}: {e}")
+
+    def _spawn_refresh(
+        self,
+        cache_key: str,
+        model_id: str,
+        input_data: Any,
+        compute: Callable[[], Awaitable[dict]],
+        version: Optional[int],
+        policy: CachePolicy,
+    ):
+        """Refresh a stale entry in the background (once per key)"""
+        if cache_key in self._refresh_tasks or cache_key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                await self._single_flight(cache_key, model_id, input_data, compute, version, policy)
+            except Exception as e:
+                logger.error(f"Background cache refresh failed for {cache_key}: {e}")
+
+        # Registered before the task starts, so stale hits arriving in the
+        # meantime don't start refreshes of their own
+        task = asyncio.create_task(refresh())
+        self._refresh_tasks[cache_key] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(cache_key, None))
+
     async def set_prediction(
         self,
         model_id: str,
         input_data: Any,
         output_data: dict,
         version: Optional[int] = None,
-        ttl: int = DEFAULT_PREDICTION_TTL,
+        ttl: Optional[int] = None,
+        policy: Optional[CachePolicy] = None,
+        cache_key: Optional[str] = None,
     ) -> bool:
         """
         Cache a prediction result.
-        
+
         Args:
             model_id: The model UUID
             input_data: The prediction input
             output_data: The prediction result to cache
             version: Optional model version
-            ttl: Time-to-live in seconds
-            
+            ttl: Time-to-live in seconds (defaults to the policy's TTL)
+            policy: The model's cache policy (defaults apply if omitted)
+            cache_key: Key from the lookup that missed. Passing it stores a
+                result computed before an invalidation under the generation
+                it was computed for, rather than the new one
+
         Returns:
             True if cached successfully, False otherwise
         """
-        if not self._enabled:
+        policy = self._resolve_policy(policy, ttl)
+        if not self._enabled or not policy.enabled:
             return False
-        
-        # Check output size before caching
-        output_size = self._estimate_size(output_data)
-        
-        if output_size > MAX_CACHE_SIZE_BYTES:
+
+        # Encode once: the encoded payload is both size-checked and stored
+        try:
+            payload = serializer.dumps(output_data)
+            cache_data = self.codec.encode(payload)
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Cache serialization error: {e}")
+            return False
+
+        # Size limit applies to the stored (possibly compressed) value
+        output_size = len(cache_data)
+        max_size = min(policy.max_entry_bytes, MAX_CACHE_SIZE_BYTES)
+
+        if output_size > max_size:
             self.stats.skipped_size += 1
             logger.info(
                 f"Skipping cache for {model_id}: output size {output_size / 1024:.1f}KB "
-                f"exceeds limit {MAX_CACHE_SIZE_BYTES / 1024:.1f}KB"
+                f"exceeds limit {max_size / 1024:.1f}KB"
             )
             return False
-        
-        cache_key = self._generate_cache_key(model_id, input_data, version)
-        
+
         try:
-            # Store with TTL
-            cache_data = json.dumps(output_data, default=str)
-            self.redis.setex(cache_key, ttl, cache_data)
-            
-            logger.debug(f"Cached prediction: {cache_key} (size: {output_size / 1024:.1f}KB, TTL: {ttl}s)")
+            if cache_key is None:
+                cache_key = self._key_for(model_id, input_data, version, policy)
+
+            # Store with TTL and record the key in the model's bounded index
+            now = time.time()
+            index_key = self._index_key(model_id)
+            # Entries outlive their TTL by the stale-while-revalidate window
+            hard_ttl = policy.ttl + self.stale_seconds
+            pipe = self.redis.pipeline()
+            pipe.setex(cache_key, hard_ttl, cache_data)
+            pipe.zadd(index_key, {cache_key: now})
+            pipe.zremrangebyscore(index_key, "-inf", now - hard_ttl)  # Already expired
+            pipe.zcard(index_key)
+            pipe.expire(index_key, hard_ttl)
+            pipe.sadd(INDEXED_MODELS_KEY, model_id)
+            index_size = pipe.execute()[3]
+
+            self.local.set(cache_key, output_data, policy.ttl)
+            self._trim_model_index(model_id, index_size)
+
+            if cache_data[:1] != FORMAT_RAW:
+                self.stats.compressed += 1
+                self.stats.bytes_saved += len(payload) - output_size
+
+            logger.debug(f"Cached prediction: {cache_key} (size: {output_size / 1024:.1f}KB, TTL: {policy.ttl}s)")
             return True
-            
+
         except Exception as e:
             self.stats.errors += 1
             logger.error(f"Cache set error: {e}")
             return False
-    
+
+    def cache_keys(
+        self,
+        model_id: str,
+        inputs: list[Any],
+        version: Optional[int] = None,
+        policy: Optional[CachePolicy] = None,
+    ) -> Optional[list[str]]:
+        """
+        Cache keys for several inputs under the model's current generation.
+
+        Build them once per batch and pass them to get_many and set_many, so
+        the misses are written under the generation they were looked up in.
+
+        Args:
+            model_id: The model UUID
+            inputs: Prediction inputs
+            version: Optional model version
+            policy: The model's cache policy (defaults apply if omitted)
+
+        Returns:
+            One key per input, or None if caching is off or unavailable
+        """
+        policy = policy or DEFAULT_CACHE_POLICY
+        if not self._enabled or not policy.enabled:
+            return None
+
+        try:
+            return [self._key_for(model_id, input_data, version, policy) for input_data in inputs]
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Cache key error: {e}")
+            return None
+
+    async def get_many(
+        self,
+        model_id: str,
+        inputs: list[Any],
+        version: Optional[int] = None,
+        policy: Optional[CachePolicy] = None,
+        keys: Optional[list[str]] = None,
+    ) -> list[Optional[dict]]:
+        """
+        Get cached predictions for several inputs in one round-trip.
+
+        Stale entries (inside the stale-while-revalidate window) are reported
+        as misses so batch callers recompute them with the rest of the batch.
+
+        Args:
+            model_id: The model UUID
+            inputs: Prediction inputs (e.g. the rows of a batch)
+            version: Optional model version
+            policy: The model's cache policy (defaults apply if omitted)
+            keys: Keys from cache_keys (built here if omitted)
+
+        Returns:
+            Cached result or None for each input, in order
+        """
+        policy = policy or DEFAULT_CACHE_POLICY
+        results: list[Optional[dict]] = [None] * len(inputs)
+        if not self._enabled or not policy.enabled or not inputs:
+            return results
+
+        try:
+            if keys is None:
+                keys = [
+                    self._key_for(model_id, input_data, version, policy)
+                    for input_data in inputs
+                ]
+
+            pending = []
+            for i, cache_key in enumerate(keys):
+                local_result = self.local.get(cache_key)
+                if local_result is not None:
+                    results[i] = local_result
+                    self.stats.local_hits += 1
+                else:
+                    pending.append(i)
+
+            if pending:
+                pending_keys = [keys[i] for i in pending]
+                pipe = self.redis.pipeline(transaction=False)
+                pipe.mget(pending_keys)
+                for cache_key in pending_keys:
+                    pipe.pttl(cache_key)
+                replies = pipe.execute()
+                values, ttls = replies[0], replies[1:]
+
+                hit_keys = {}
+                for i, cache_key, cached, ttl_ms in zip(pending, pending_keys, values, ttls):
+                    fresh_seconds = (ttl_ms or 0) / 1000 - self.stale_seconds
+                    if not cached or fresh_seconds <= 0:
+                        continue
+                    results[i] = serializer.loads(self.codec.decode(cached))
+                    self.local.set(cache_key, results[i], fresh_seconds)
+                    hit_keys[cache_key] = time.time()
+
+                if hit_keys:
+                    self.redis.zadd(self._index_key(model_id), hit_keys, xx=True)
+
+            hits = sum(result is not None for result in results)
+            self._record(model_id, hits=hits, misses=len(inputs) - hits)
+            logger.debug(f"Cache multi-get for {model_id}: {hits}/{len(inputs)} hits")
+            return results
+
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Cache multi-get error: {e}")
+            return [None] * len(inputs)
+
+    async def set_many(
+        self,
+        model_id: str,
+        inputs: list[Any],
+        outputs: list[dict],
+        version: Optional[int] = None,
+        ttl: Optional[int] = None,
+        policy: Optional[CachePolicy] = None,
+        keys: Optional[list[str]] = None,
+    ) -> int:
+        """
+        Cache several prediction results in one pipelined round-trip.
+
+        At most MAX_CACHED_PREDICTIONS_PER_MODEL results are written, the
+        first ones in input order; the rest would only be evicted again by
+        the model's index trim.
+
+        Args:
+            model_id: The model UUID
+            inputs: Prediction inputs
+            outputs: Prediction results, one per input
+            version: Optional model version
+            ttl: Time-to-live in seconds (defaults to the policy's TTL)
+            policy: The model's cache policy (defaults apply if omitted)
+            keys: Keys the inputs were looked up under (built here if omitted)
+
+        Returns:
+            Number of results cached
+        """
+        policy = self._resolve_policy(policy, ttl)
+        if not self._enabled or not policy.enabled or not inputs:
+            return 0
+
+        try:
+            max_size = min(policy.max_entry_bytes, MAX_CACHE_SIZE_BYTES)
+            if keys is None:
+                keys = [None] * len(inputs)
+            entries = []
+            for input_data, output_data, cache_key in zip(inputs, outputs, keys):
+                if len(entries) >= MAX_CACHED_PREDICTIONS_PER_MODEL:
+                    break
+                payload = serializer.dumps(output_data)
+                cache_data = self.codec.encode(payload)
+                if len(cache_data) > max_size:
+                    self.stats.skipped_size += 1
+                    continue
+                if cache_key is None:
+                    cache_key = self._key_for(model_id, input_data, version, policy)
+                entries.append((cache_key, output_data, payload, cache_data))
+
+            if not entries:
+                return 0
+
+            now = time.time()
+            index_key = self._index_key(model_id)
+            hard_ttl = policy.ttl + self.stale_seconds
+            pipe = self.redis.pipeline()
+            for cache_key, _, _, cache_data in entries:
+                pipe.setex(cache_key, hard_ttl, cache_data)
+            pipe.zadd(index_key, {cache_key: now for cache_key, *_ in entries})
+            pipe.zremrangebyscore(index_key, "-inf", now - hard_ttl)  # Already expired
+            pipe.zcard(index_key)
+            pipe.expire(index_key, hard_ttl)
+            pipe.sadd(INDEXED_MODELS_KEY, model_id)
+            index_size = pipe.execute()[len(entries) + 2]
+
+            for cache_key, output_data, payload, cache_data in entries:
+                self.local.set(cache_key, output_data, policy.ttl)
+                if cache_data[:1] != FORMAT_RAW:
+                    self.stats.compressed += 1
+                    self.stats.bytes_saved += len(payload) - len(cache_data)
+            self._trim_model_index(model_id, index_size)
+
+            logger.debug(f"Cached {len(entries)} predictions for {model_id} (TTL: {policy.ttl}s)")
+            return len(entries)
+
+        except Exception as e:
+            self.stats.errors += 1
+            logger.error(f"Cache multi-set error: {e}")
+            return 0
+
     async def invalidate_model_cache(self, model_id: str) -> int:
         """
         Invalidate all cached predictions for a model.
         
-        Useful when a model is updated or deleted.
+        Useful when a model is updated or deleted. Bumps the model's cache
+        generation with a single INCR, so existing entries are no longer
+        addressable and simply age out by TTL. In-process copies are dropped
+        on every worker through the invalidation bus.
         
         Args:
             model_id: The model UUID
             
         Returns:
-            Number of keys deleted
+            The model's new cache generation (0 if caching is disabled)
         """
         if not self._enabled:
             return 0
-        
+
         try:
-            # Find and delete all keys for this model
-            pattern = f"pred:{model_id}:*"
-            keys = list(self.redis.scan_iter(match=pattern, count=100))
-            
-            if keys:
-                deleted = self.redis.delete(*keys)
-                logger.info(f"Invalidated {deleted} cached predictions for model {model_id}")
-                return deleted
-            return 0
+            generation = self.redis.incr(f"pred_gen:{model_id}")
+            logger.info(f"Invalidated cached predictions for model {model_id} (generation {generation})")
+            return generation
             
         except Exception as e:
             logger.error(f"Cache invalidation error: {e}")
             return 0
+
+        finally:
+            self.bus.publish(PREDICTION_TOPIC, model_id)
     
     async def get_cache_stats(self) -> dict:
         """Get cache statistics"""
@@ -204,12 +976,27 @@ class PredictionCache:
         
         stats = {
             "hits": self.stats.hits,
+            "local_hits": self.stats.local_hits,
+            "local_entries": len(self.local),
             "misses": self.stats.misses,
             "hit_rate": f"{hit_rate:.1f}%",
             "skipped_due_to_size": self.stats.skipped_size,
+            "compressed": self.stats.compressed,
+            "compression_saved_kb": round(self.stats.bytes_saved / 1024, 1),
+            "evicted_over_capacity": self.stats.evicted,
+            "coalesced_misses": self.stats.coalesced,
+            "stale_served": self.stats.stale_served,
             "errors": self.stats.errors,
             "enabled": self._enabled,
         }
+
+        if self._enabled:
+            try:
+                stats["models"] = self._get_model_utilization()
+            except Exception as e:
+                logger.error(f"Cache utilization error: {e}")
+
+        stats["model_hit_rates"] = self.get_model_hit_rates()
         
         # Try to get memory info from Redis
         if self._enabled:
@@ -222,24 +1009,79 @@ class PredictionCache:
         
         return stats
     
+    def get_model_hit_rates(self, model_id: Optional[str] = None) -> dict:
+        """
+        Per-model hit rates observed by this process
+
+        Args:
+            model_id: Only report this model
+
+        Returns:
+            Mapping of model ID to hits, misses and hit rate
+        """
+        counts = self._model_counts
+        if model_id is not None:
+            counts = {model_id: counts.get(model_id, [0, 0])}
+
+        return {
+            key: {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": f"{(hits / (hits + misses) * 100) if hits + misses else 0:.1f}%",
+            }
+            for key, (hits, misses) in counts.items()
+        }
+
+    def _get_model_utilization(self) -> dict:
+        """Per-model cache entries against MAX_CACHED_PREDICTIONS_PER_MODEL"""
+        model_ids = sorted(
+            m.decode() if isinstance(m, bytes) else m
+            for m in self.redis.smembers(INDEXED_MODELS_KEY)
+        )
+        if not model_ids:
+            return {}
+
+        pipe = self.redis.pipeline(transaction=False)
+        for model_id in model_ids:
+            pipe.zcard(self._index_key(model_id))
+        sizes = pipe.execute()
+
+        # Forget models whose index has expired
+        expired = [m for m, size in zip(model_ids, sizes) if not size]
+        if expired:
+            self.redis.srem(INDEXED_MODELS_KEY, *expired)
+
+        return {
+            model_id: {
+                "entries": size,
+                "capacity": MAX_CACHED_PREDICTIONS_PER_MODEL,
+                "utilization": f"{size / MAX_CACHED_PREDICTIONS_PER_MODEL * 100:.1f}%",
+            }
+            for model_id, size in zip(model_ids, sizes)
+            if size
+        }
+
     async def get_memory_usage(self) -> dict:
-        """Get Redis memory usage information"""
+        """
+        Get Redis memory usage information (without scanning the keyspace)
+
+        prediction_cache_keys is the sum of the per-model indexes, so it may
+        include entries that expired since their model was last written.
+        Rate limit keys aren't indexed and are no longer counted separately;
+        they are part of total_keys.
+        """
         if not self._enabled:
             return {"error": "Cache not enabled"}
         
         try:
             info = self.redis.info("memory")
-            
-            # Count prediction cache keys
-            pred_keys = list(self.redis.scan_iter(match="pred:*", count=1000))
-            rate_keys = list(self.redis.scan_iter(match="rate_limit:*", count=1000))
+            utilization = self._get_model_utilization()
             
             return {
                 "used_memory": info.get("used_memory_human", "unknown"),
                 "used_memory_peak": info.get("used_memory_peak_human", "unknown"),
-                "prediction_cache_keys": len(pred_keys),
-                "rate_limit_keys": len(rate_keys),
                 "total_keys": self.redis.dbsize(),
+                "prediction_cache_keys": sum(model["entries"] for model in utilization.values()),
             }
         except Exception as e:
             return {"error": str(e)}
@@ -267,14 +1109,14 @@ def _create_redis_client() -> Optional[redis.Redis]:
             logger.info("Connecting to Upstash Redis for caching...")
             client = redis.from_url(
                 redis_url,
-                decode_responses=True,  # For caching, we want string responses
+                decode_responses=False,  # Cached values are binary (format header)
                 ssl_cert_reqs=None,
             )
         else:
             logger.info("Connecting to standard Redis for caching...")
             client = redis.from_url(
                 redis_url,
-                decode_responses=True,
+                decode_responses=False,
             )
         
         # Test connection
@@ -293,7 +1135,7 @@ def get_prediction_cache() -> PredictionCache:
     
     if _prediction_cache is None:
         redis_client = _create_redis_client()
-        _prediction_cache = PredictionCache(redis_client)
+        _prediction_cache = PredictionCache(redis_client, bus=get_invalidation_bus())
         
         if redis_client:
             logger.info("PredictionCache initialized with Redis")
@@ -55,6 +55,34 @@ class Settings(BaseSettings):
     UPSTASH_REDIS_REST_TOKEN: Optional[str] = None  # For Upstash Redis
     CACHE_TTL_SECONDS: int = 3600  # 1 hour
 
+    # In-process prediction cache in front of Redis (per worker)
+    LOCAL_CACHE_MAX_ENTRIES: int = 1024
+    LOCAL_CACHE_TTL_SECONDS: int = 60  # Never exceeds the Redis entry's TTL
+
+    # In-process per-user model access lists (per worker)
+    ACCESS_CACHE_MAX_USERS: int = 10000
+    ACCESS_CACHE_TTL_SECONDS: int = 300  # Safety net; changes are invalidated explicitly
+
+    # In-process model alias maps, one per model family (per worker)
+    ALIAS_CACHE_MAX_FAMILIES: int = 10000
+    ALIAS_CACHE_TTL_SECONDS: int = 300  # Safety net; changes are invalidated explicitly
+
+    # Compression for cached prediction values (zstd, zlib, none)
+    CACHE_COMPRESSION: str = "zstd"
+    CACHE_COMPRESSION_THRESHOLD_BYTES: int = 1024
+
+    # Cache key hashing: fingerprint (128-bit hash of a canonical binary
+    # encoding) or json (SHA-256 of canonical JSON)
+    CACHE_KEY_SCHEME: str = "fingerprint"
+
+    # Serve entries this long past their TTL while one refresh runs (0 = disabled)
+    CACHE_STALE_WHILE_REVALIDATE_SECONDS: int = 0
+    # Cross-worker lock held while computing a missed prediction
+    CACHE_LOCK_TIMEOUT_MS: int = 5000
+
+    # Serialization backend for API responses and cache payloads (orjson, json)
+    SERIALIZER_BACKEND: str = "orjson"
+
     # CORS
     BACKEND_CORS_ORIGINS: list[str] | str = [
         "http://localhost:3000", 
@@ -110,6 +138,23 @@ class Settings(BaseSettings):
     BACKUP_RETENTION_DAYS: int = 7
     BACKUP_S3_BUCKET: Optional[str] = None
 
+    # Webhook Delivery (python -m app.core.webhook_dispatcher)
+    WEBHOOK_WORKER_CONCURRENCY: int = 64  # Deliveries in flight per worker
+    WEBHOOK_MAX_CONCURRENCY_PER_HOST: int = 4  # Deliveries in flight per receiver host
+    WEBHOOK_POLL_INTERVAL_SECONDS: float = 1.0
+    WEBHOOK_BACKOFF_BASE_SECONDS: float = 2.0  # Retry delay ceiling doubles per attempt
+    WEBHOOK_BACKOFF_MAX_SECONDS: float = 600.0
+    WEBHOOK_DELIVERY_LEASE_SECONDS: int = 300  # Claimed deliveries retry after this if a worker dies
+    WEBHOOK_DELIVERY_RETENTION_DAYS: int = 7  # Finished deliveries are purged after this
+    WEBHOOK_DEFAULT_BATCH_WINDOW_SECONDS: int = 5  # For batched webhooks without a window
+
+    # Prediction Log Retention
+    PREDICTION_RETENTION_DAYS: int = 90  # Monthly partitions older than this are dropped (0 keeps all)
+    PREDICTION_PARTITIONS_AHEAD: int = 2  # Future monthly partitions to create in advance
+
+    # Usage Rollups
+    USAGE_FLUSH_INTERVAL_SECONDS: float = 5.0  # Buffered analytics counters are written this often
+
 
 # Global settings instance
 settings = Settings()
@@ -0,0 +1,191 @@
+"""
+Input Fingerprinting
+Canonical, fast hashing of prediction inputs for cache keys
+
+Inputs are reduced to a canonical binary encoding (tagged, length-prefixed
+parts; dict keys sorted) and hashed with a 128-bit non-cryptographic hash:
+xxh3_128 when xxhash is installed, BLAKE2b-128 otherwise. NumPy arrays are
+hashed straight from their buffers instead of being converted to JSON.
+"""
+
+import hashlib
+import logging
+import struct
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.serialization import serializer
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
+logger = logging.getLogger(__name__)
+
+
+_pack_length = struct.Struct("<Q").pack
+
+
+def _new_hasher():
+    """128-bit hasher: xxh3_128 if available, else BLAKE2b"""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+
+def _hash_bytes(data: bytes) -> str:
+    """One-shot 128-bit hex digest"""
+    if xxhash is not None:
+        return xxhash.xxh3_128_hexdigest(data)
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _has_arrays(value: Any) -> bool:
+    """Whether an input carries ndarrays at the top level or as dict values"""
+    if isinstance(value, np.ndarray):
+        return True
+    if isinstance(value, dict):
+        for item in value.values():
+            if isinstance(item, np.ndarray):
+                return True
+    return False
+
+
+def normalize_floats(value: Any, digits: Optional[int]) -> Any:
+    """Round every float in an input so near-identical inputs share a cache key"""
+    if digits is None:
+        return value
+    if isinstance(value, float):
+        return round(value, digits)
+    if isinstance(value, np.ndarray):
+        return value.round(digits) if value.dtype.kind == "f" else value
+    if isinstance(value, dict):
+        return {key: normalize_floats(item, digits) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_floats(item, digits) for item in value]
+    return value
+
+
+class InputFingerprinter:
+    """
+    Hashes a prediction input from a canonical binary encoding
+
+    JSON-shaped values are encoded once with the fast serializer (sorted
+    keys, compact separators), so equal inputs fingerprint alike regardless
+    of dict key order. NumPy arrays, top-level or as values of the input
+    dict, are hashed from their raw buffers together with dtype and shape,
+    with every part tagged and length-prefixed. (Inputs without arrays hash
+    their JSON encoding directly; JSON never starts with those tags.)
+    """
+
+    def __init__(self, float_precision: Optional[int] = None):
+        """
+        Initialize fingerprinter
+
+        Args:
+            float_precision: Decimals to round floats to (None = exact)
+        """
+        self.float_precision = float_precision
+
+    def fingerprint(self, value: Any) -> str:
+        """
+        Hash an input
+
+        Returns:
+            32-character hex digest
+        """
+        value = normalize_floats(value, self.float_precision)
+
+        if not _has_arrays(value):
+            # Plain JSON input: hash the canonical encoding in one shot
+            return _hash_bytes(serializer.dumps(value, sort_keys=True))
+
+        hasher = _new_hasher()
+        self._update(hasher, value)
+        return hasher.hexdigest()
+
+    def _update(self, hasher, value: Any):
+        """Feed the canonical encoding of value to the hasher"""
+        if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+            self._update_array(hasher, value)
+        elif isinstance(value, dict) and _has_arrays(value):
+            hasher.update(b"d" + _pack_length(len(value)))
+            for key in sorted(value, key=str):
+                encoded_key = str(key).encode("utf-8")
+                hasher.update(_pack_length(len(encoded_key)) + encoded_key)
+                self._update(hasher, value[key])
+        else:
+            encoded = serializer.dumps(value, sort_keys=True)
+            hasher.update(b"j" + _pack_length(len(encoded)))
+            hasher.update(encoded)
+
+    @staticmethod
+    def _update_array(hasher, array: np.ndarray):
+        """Hash dtype, shape and the array's raw buffer"""
+        array = np.ascontiguousarray(array)
+        header = f"{array.dtype.str}{array.shape}".encode()
+        hasher.update(b"a" + _pack_length(len(header)) + header)
+        hasher.update(array.reshape(-1).view(np.uint8))
+
+
+class FingerprintKeyScheme:
+    """Cache key digests from the canonical binary fingerprint"""
+
+    name = "fingerprint"
+
+    def __init__(self):
+        self._fingerprinters: dict[Optional[int], InputFingerprinter] = {}
+
+    def digest(self, input_data: Any, float_precision: Optional[int] = None) -> str:
+        """Digest an input for a cache key"""
+        fingerprinter = self._fingerprinters.get(float_precision)
+        if fingerprinter is None:
+            fingerprinter = InputFingerprinter(float_precision)
+            self._fingerprinters[float_precision] = fingerprinter
+        return fingerprinter.fingerprint(input_data)
+
+
+class JSONKeyScheme:
+    """
+    Cache key digests from SHA-256 over canonical JSON
+
+    Sorted keys and compact separators, truncated to 64 bits. Digests
+    differ from the keys written before the fingerprint scheme (which
+    used json.dumps defaults), and cache keys now carry a generation
+    anyway, so neither scheme reads entries cached by the old code.
+    """
+
+    name = "json"
+
+    def digest(self, input_data: Any, float_precision: Optional[int] = None) -> str:
+        """Digest an input for a cache key"""
+        input_json = serializer.dumps(normalize_floats(input_data, float_precision), sort_keys=True)
+        return hashlib.sha256(input_json).hexdigest()[:16]
+
+
+KEY_SCHEMES: dict[str, Callable[[], Any]] = {
+    "fingerprint": FingerprintKeyScheme,
+    "json": JSONKeyScheme,
+}
+
+
+def create_key_scheme(scheme: Optional[str] = None) -> FingerprintKeyScheme | JSONKeyScheme:
+    """
+    Create a cache key scheme
+
+    Args:
+        scheme: Scheme name (defaults to settings.CACHE_KEY_SCHEME)
+
+    Returns:
+        Key scheme instance (fingerprint if the name is unknown)
+    """
+    scheme = (scheme or settings.CACHE_KEY_SCHEME).lower()
+
+    if scheme not in KEY_SCHEMES:
+        logger.warning(f"Unknown cache key scheme '{scheme}', using fingerprint")
+        scheme = "fingerprint"
+
+    return KEY_SCHEMES[scheme]()
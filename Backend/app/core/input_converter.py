@@ -0,0 +1,209 @@
+"""
+Input Conversion Service
+Compiles a per-model converter that maps prediction payloads to feature arrays
+"""
+
+import logging
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Feature dtypes a converter can emit
+SUPPORTED_DTYPES = ("float64", "float32")
+
+
+class FeatureMismatchError(ValueError):
+    """Raised when a payload's feature names don't match the model's"""
+
+
+def is_batch_payload(payload: Any) -> bool:
+    """
+    Check whether a payload holds more than one sample
+
+    Mirrors InputConverter.convert: a 2D array or a sequence of rows, either
+    top-level or as the only value of a dict.
+    """
+    if isinstance(payload, dict) and len(payload) == 1:
+        payload = next(iter(payload.values()))
+
+    if isinstance(payload, np.ndarray):
+        return payload.ndim == 2 and payload.shape[0] > 1
+
+    return (
+        isinstance(payload, (list, tuple))
+        and len(payload) > 1
+        and isinstance(payload[0], (list, tuple, np.ndarray))
+    )
+
+
+class InputConverter:
+    """
+    Converts JSON payloads into a model's 2D feature matrix.
+
+    A converter is compiled once per model version from the recorded feature
+    order (``input_schema["features"]`` or the estimator's ``feature_names_in_``)
+    and dtype, then reused for every request. Values are written straight into
+    a preallocated array instead of going through intermediate lists and
+    ``np.array`` dtype inference.
+
+    Accepted payloads:
+    - ``{"f1": 0.1, "f2": 0.2}`` → single sample (keys must match the feature names when known)
+    - ``{"features": [...]}`` → single sample or batch under one key
+    - ``[...]`` / ``[[...], [...]]`` → single sample or batch
+    - ``np.ndarray`` → used as-is when the dtype already matches
+    """
+
+    def __init__(
+        self,
+        feature_names: Optional[Sequence[str]] = None,
+        n_features: Optional[int] = None,
+        dtype: str = "float64",
+    ):
+        """
+        Initialize converter
+
+        Args:
+            feature_names: Ordered feature names the model was trained on
+            n_features: Number of features (inferred from names if given)
+            dtype: Output dtype, one of SUPPORTED_DTYPES
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(
+                f"Unsupported input dtype '{dtype}'. Use one of: {', '.join(SUPPORTED_DTYPES)}"
+            )
+
+        self.feature_names = tuple(str(name) for name in feature_names) if feature_names is not None else None
+        self._feature_set = frozenset(self.feature_names or ())
+        self.n_features = len(self.feature_names) if self.feature_names else n_features
+        self.dtype = np.dtype(dtype)
+
+    @classmethod
+    def compile(cls, model: Any, input_schema: Optional[dict] = None) -> "InputConverter":
+        """
+        Build a converter from the model record's input schema and the estimator
+
+        Args:
+            model: Loaded estimator
+            input_schema: ``Model.input_schema`` (optional keys: features, n_features,
+                dtype; an unsupported dtype falls back to float64)
+
+        Returns:
+            Compiled InputConverter
+        """
+        schema = input_schema or {}
+
+        feature_names = schema.get("features")
+        if feature_names is None and getattr(model, "feature_names_in_", None) is not None:
+            feature_names = model.feature_names_in_.tolist()
+
+        n_features = schema.get("n_features") or getattr(model, "n_features_in_", None)
+
+        # A bad recorded dtype shouldn't fail every prediction: converters are
+        # compiled once per model version, so this is logged once
+        dtype = schema.get("dtype", "float64")
+        if dtype not in SUPPORTED_DTYPES:
+            logger.warning(
+                f"Unsupported input dtype '{dtype}' in input_schema, using float64. "
+                f"Supported: {', '.join(SUPPORTED_DTYPES)}"
+            )
+            dtype = "float64"
+
+        return cls(
+            feature_names=feature_names,
+            n_features=int(n_features) if n_features else None,
+            dtype=dtype,
+        )
+
+    def convert(self, payload: Any) -> np.ndarray:
+        """
+        Convert a payload into a 2D array of shape (n_samples, n_features)
+
+        Raises:
+            ValueError: If the payload shape doesn't match the model
+        """
+        if isinstance(payload, np.ndarray):
+            return self._from_array(payload)
+
+        if isinstance(payload, dict):
+            if len(payload) == 1:
+                # Unwrap common payloads like {"features": [...]}
+                inner = next(iter(payload.values()))
+                if isinstance(inner, np.ndarray):
+                    return self._from_array(inner)
+                if isinstance(inner, (list, tuple)):
+                    return self._from_sequence(inner)
+            return self._from_mapping(payload)
+
+        if isinstance(payload, (list, tuple)):
+            return self._from_sequence(payload)
+
+        raise ValueError("Input must be a dict or list")
+
+    def _check_width(self, width: int):
+        """Validate number of features against the compiled model"""
+        if self.n_features is not None and width != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {width}")
+
+    def _from_mapping(self, payload: dict) -> np.ndarray:
+        """
+        Single sample from a feature-name → value mapping
+
+        Raises:
+            FeatureMismatchError: If the model's feature names are known and
+                the payload's keys differ from them
+        """
+        if self.feature_names is not None:
+            missing = [name for name in self.feature_names if name not in payload]
+            unexpected = [str(key) for key in payload if key not in self._feature_set]
+            if missing or unexpected:
+                problems = []
+                if missing:
+                    problems.append(f"missing: {', '.join(missing)}")
+                if unexpected:
+                    problems.append(f"unexpected: {', '.join(unexpected)}")
+                raise FeatureMismatchError(
+                    f"Input features don't match the model ({'; '.join(problems)})"
+                )
+
+            values = map(payload.__getitem__, self.feature_names)
+            return np.fromiter(values, dtype=self.dtype, count=len(self.feature_names)).reshape(1, -1)
+
+        # Feature names unknown: use payload order
+        self._check_width(len(payload))
+        return np.fromiter(payload.values(), dtype=self.dtype, count=len(payload)).reshape(1, -1)
+
+    def _from_sequence(self, values: Sequence[Any]) -> np.ndarray:
+        """Single sample from a flat sequence, or batch from a sequence of rows"""
+        if len(values) == 0:
+            raise ValueError("Input must contain at least one feature")
+
+        if not isinstance(values[0], (list, tuple, np.ndarray)):
+            self._check_width(len(values))
+            return np.fromiter(values, dtype=self.dtype, count=len(values)).reshape(1, -1)
+
+        width = self.n_features if self.n_features is not None else len(values[0])
+        X = np.empty((len(values), width), dtype=self.dtype)
+
+        for i, row in enumerate(values):
+            if not isinstance(row, (list, tuple, np.ndarray)):
+                raise ValueError("Input must be 1D feature list or 2D batch of samples")
+            if len(row) != width:
+                raise ValueError(f"Expected {width} features, got {len(row)} in row {i}")
+            X[i] = row
+
+        return X
+
+    def _from_array(self, values: np.ndarray) -> np.ndarray:
+        """Reuse an ndarray, converting only when the dtype differs"""
+        X = np.asarray(values, dtype=self.dtype)
+
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        elif X.ndim != 2:
+            raise ValueError("Input must be 1D feature list or 2D batch of samples")
+
+        self._check_width(X.shape[1])
+        return X
@@ -0,0 +1,145 @@
+"""
+Cache Invalidation Bus
+Broadcasts invalidations to every worker process over Redis pub/sub
+
+In-process caches (local prediction cache, model policies, ...) register a
+handler for a topic. Publishing runs the local handlers immediately and
+broadcasts the event so other workers drop their copies too. Without Redis
+the bus degrades to local-only delivery.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable, Optional
+
+import redis
+
+from app.core.config import settings
+from app.core.serialization import serializer
+
+logger = logging.getLogger(__name__)
+
+
+# Pub/sub channel shared by all workers
+INVALIDATION_CHANNEL = "invalidate"
+
+
+class InvalidationBus:
+    """Topic-based invalidation broadcast between worker processes"""
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        self.redis = redis_client
+        self._handlers: dict[str, list[Callable[[str], None]]] = defaultdict(list)
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def subscribe(self, topic: str, handler: Callable[[str], None]):
+        """
+        Register a handler for a topic
+
+        Args:
+            topic: Invalidation topic (e.g. "prediction")
+            handler: Called with the invalidated key, possibly from a listener thread
+        """
+        with self._lock:
+            self._handlers[topic].append(handler)
+            self._start_listener()
+
+    def publish(self, topic: str, key: str):
+        """
+        Invalidate a key locally and broadcast it to other workers
+
+        Args:
+            topic: Invalidation topic
+            key: Invalidated key (e.g. model ID)
+        """
+        self._dispatch(topic, key)
+
+        if self.redis is None:
+            return
+
+        try:
+            self.redis.publish(
+                INVALIDATION_CHANNEL, serializer.dumps({"topic": topic, "key": key})
+            )
+        except Exception as e:
+            logger.error(f"Invalidation broadcast error: {e}")
+
+    def _dispatch(self, topic: str, key: str):
+        """Run local handlers for an invalidation"""
+        for handler in list(self._handlers.get(topic, ())):
+            try:
+                handler(key)
+            except Exception as e:
+                logger.error(f"Invalidation handler error for {topic}:{key}: {e}")
+
+    def _on_message(self, message: dict):
+        """Handle a broadcast invalidation from any worker (including this one)"""
+        try:
+            event = serializer.loads(message["data"])
+            self._dispatch(event["topic"], event["key"])
+        except Exception as e:
+            logger.error(f"Invalid invalidation message: {e}")
+
+    def _start_listener(self):
+        """Start the background pub/sub listener on first subscription"""
+        if self.redis is None or self._listener is not None:
+            return
+
+        try:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_message})
+            self._listener = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+            logger.info("Invalidation listener started")
+        except Exception as e:
+            logger.error(f"Failed to start invalidation listener: {e}")
+
+    def close(self):
+        """Stop the background listener"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+# Global bus instance
+_invalidation_bus: Optional[InvalidationBus] = None
+
+
+def _create_redis_client() -> Optional[redis.Redis]:
+    """
+    Create a dedicated Redis connection for pub/sub.
+    Reuses the same connection logic as caching.
+    """
+    redis_url = settings.REDIS_URL
+
+    if not redis_url:
+        return None
+
+    try:
+        is_upstash = redis_url.startswith("rediss://") or "upstash" in redis_url.lower()
+
+        if is_upstash:
+            client = redis.from_url(redis_url, ssl_cert_reqs=None)
+        else:
+            client = redis.from_url(redis_url)
+
+        client.ping()
+        return client
+
+    except Exception as e:
+        logger.error(f"Redis invalidation bus connection failed: {e}")
+        return None
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    """Get or create the invalidation bus instance"""
+    global _invalidation_bus
+
+    if _invalidation_bus is None:
+        _invalidation_bus = InvalidationBus(_create_redis_client())
+
+        if _invalidation_bus.redis is None:
+            logger.warning("InvalidationBus running without Redis (local invalidation only)")
+
+    return _invalidation_bus
@@ -0,0 +1,87 @@
+"""
+Latency Sketch
+DDSketch-style mergeable quantile sketch for inference latencies
+
+Latencies are mapped to logarithmic bins whose width grows with the value,
+so any quantile read back is within RELATIVE_ACCURACY of the true value.
+Bins are plain (index, count) pairs: sketches for different models, hours
+or days merge by adding counts, which lets the database store one row per
+bin and merge them at query time.
+"""
+
+import math
+from typing import Iterable, Optional
+
+# Quantiles are accurate to within 1% of the true value
+RELATIVE_ACCURACY = 0.01
+
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+
+# Bin for zero latencies (sub-millisecond inferences), below every log bin
+ZERO_BIN = -(2**31)
+
+
+def bin_index(value_ms: float) -> int:
+    """Map a latency to its sketch bin"""
+    if value_ms <= 0:
+        return ZERO_BIN
+    return math.ceil(math.log(value_ms) / _LOG_GAMMA)
+
+
+def bin_value(index: int) -> float:
+    """Representative latency of a bin (within RELATIVE_ACCURACY of any value in it)"""
+    if index == ZERO_BIN:
+        return 0.0
+    return 2 * GAMMA**index / (GAMMA + 1)
+
+
+class LatencySketch:
+    """Mergeable quantile sketch over bin counts"""
+
+    def __init__(self):
+        self.bins: dict[int, int] = {}
+        self.count = 0
+
+    def add(self, value_ms: float, count: int = 1):
+        """Add a latency observation"""
+        self.add_bin(bin_index(value_ms), count)
+
+    def add_bin(self, index: int, count: int):
+        """Merge a stored bin count into the sketch"""
+        self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "LatencySketch"):
+        """Merge another sketch into this one"""
+        for index, count in other.bins.items():
+            self.add_bin(index, count)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate a quantile
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Latency in ms, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if seen > rank:
+                return bin_value(index)
+        return bin_value(max(self.bins))
+
+    def percentiles(self, quantiles: Iterable[float] = (0.5, 0.95, 0.99)) -> dict[str, Optional[float]]:
+        """Percentiles keyed as p50, p95, p99 (rounded to 0.01 ms)"""
+        result = {}
+        for q in quantiles:
+            value = self.quantile(q)
+            result[f"p{round(q * 100):g}"] = round(value, 2) if value is not None else None
+        return result
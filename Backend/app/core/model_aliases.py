@@ -0,0 +1,186 @@
+"""
+Model Alias Service
+Resolves named aliases (latest, stable, canary, ...) to model versions
+
+A model family is a user's models sharing a name; each version is its own
+row. Aliases are stored per family in model_aliases and each family's map
+is kept in process, so predicting through an alias costs no extra query.
+"latest" is maintained automatically (highest active version) on upload
+and status changes; other aliases are pinned by the owner and dropped when
+their version is archived. Changes publish an invalidation so every worker
+reloads the family's map.
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import desc
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.core.caching import LocalCache
+from app.core.config import settings
+from app.core.invalidation import InvalidationBus, get_invalidation_bus
+from app.models.model import Model
+from app.models.model_alias import ModelAlias
+
+logger = logging.getLogger(__name__)
+
+
+# Invalidation bus topic for alias maps (keyed by family key)
+ALIAS_TOPIC = "model_alias"
+
+# Maintained automatically; cannot be set or removed by hand
+LATEST_ALIAS = "latest"
+
+# Lowercase letters, digits, "-" and "_", starting with a letter
+ALIAS_PATTERN = r"^[a-z][a-z0-9_-]{0,49}$"
+
+
+def family_key(user_id: str, name: str) -> str:
+    """Cache and invalidation key of a model family"""
+    return f"{user_id}/{name}"
+
+
+class AliasResolver:
+    """In-process cache of per-family alias maps"""
+
+    def __init__(self, bus: Optional[InvalidationBus] = None):
+        self.families = LocalCache(
+            max_entries=settings.ALIAS_CACHE_MAX_FAMILIES,
+            ttl=settings.ALIAS_CACHE_TTL_SECONDS,
+        )
+        self.bus = bus or InvalidationBus()
+        self.bus.subscribe(ALIAS_TOPIC, self.families.delete)
+
+    def get_aliases(self, db: Session, user_id: str, name: str) -> dict[str, str]:
+        """
+        Get a family's aliases, loading them on first use
+
+        Args:
+            db: Database session
+            user_id: Owner UUID
+            name: Model family name
+
+        Returns:
+            Dict of alias to model ID
+        """
+        key = family_key(user_id, name)
+        aliases = self.families.get(key)
+        if aliases is None:
+            rows = (
+                db.query(ModelAlias.alias, ModelAlias.model_id)
+                .filter(ModelAlias.user_id == user_id, ModelAlias.name == name)
+                .all()
+            )
+            aliases = {alias: str(model_id) for alias, model_id in rows}
+            self.families.set(key, aliases, settings.ALIAS_CACHE_TTL_SECONDS)
+        return aliases
+
+    def resolve(self, db: Session, user_id: str, name: str, alias: str) -> Optional[str]:
+        """
+        Resolve an alias to a model ID
+
+        Args:
+            db: Database session
+            user_id: Owner UUID
+            name: Model family name
+            alias: Alias name
+
+        Returns:
+            Model ID, or None if the family has no such alias
+        """
+        return self.get_aliases(db, user_id, name).get(alias)
+
+    def set_alias(self, db: Session, model: Model, alias: str):
+        """
+        Point one of a family's aliases at a model version (committed by the caller)
+
+        Args:
+            db: Database session
+            model: Target model version
+            alias: Alias name
+        """
+        stmt = insert(ModelAlias).values(
+            user_id=model.user_id, name=model.name, alias=alias, model_id=model.id
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "name", "alias"],
+            set_={"model_id": stmt.excluded.model_id, "updated_at": func.now()},
+        )
+        db.execute(stmt)
+
+    def remove_alias(self, db: Session, user_id: str, name: str, alias: str) -> bool:
+        """
+        Remove one of a family's aliases (committed by the caller)
+
+        Returns:
+            True if the alias existed
+        """
+        deleted = (
+            db.query(ModelAlias)
+            .filter(
+                ModelAlias.user_id == user_id,
+                ModelAlias.name == name,
+                ModelAlias.alias == alias,
+            )
+            .delete(synchronize_session=False)
+        )
+        return deleted > 0
+
+    def remove_model_aliases(self, db: Session, model_id: str) -> int:
+        """
+        Remove the pinned aliases of a model version (committed by the caller)
+
+        Used when the version is archived, so no alias keeps resolving to
+        it; "latest" is left to refresh_latest.
+
+        Returns:
+            Number of aliases removed
+        """
+        return (
+            db.query(ModelAlias)
+            .filter(ModelAlias.model_id == model_id, ModelAlias.alias != LATEST_ALIAS)
+            .delete(synchronize_session=False)
+        )
+
+    def refresh_latest(self, db: Session, user_id: str, name: str) -> Optional[Model]:
+        """
+        Point "latest" at the family's highest active version (committed by the caller)
+
+        The alias is removed when no version is active.
+
+        Returns:
+            The latest active version, if any
+        """
+        db.flush()  # Include pending uploads and status changes
+        latest = (
+            db.query(Model)
+            .filter(Model.user_id == user_id, Model.name == name, Model.status == "active")
+            .order_by(desc(Model.version))
+            .first()
+        )
+        if latest is None:
+            self.remove_alias(db, user_id, name, LATEST_ALIAS)
+        else:
+            self.set_alias(db, latest, LATEST_ALIAS)
+        return latest
+
+    def invalidate(self, user_id: str, name: str):
+        """Drop a family's alias map on every worker after it changes"""
+        self.bus.publish(ALIAS_TOPIC, family_key(user_id, name))
+
+
+# Global alias resolver instance
+_alias_resolver: Optional[AliasResolver] = None
+
+
+def get_alias_resolver() -> AliasResolver:
+    """Get or create the alias resolver instance"""
+    global _alias_resolver
+
+    if _alias_resolver is None:
+        _alias_resolver = AliasResolver(get_invalidation_bus())
+
+    return _alias_resolver
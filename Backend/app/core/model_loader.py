@@ -7,10 +7,11 @@ import io
 import logging
 import pickle
 from pathlib import Path
-from typing import Any
+from typing import Any, Optional
 
 import joblib
 
+from app.core.input_converter import InputConverter
 from app.core.storage import StorageService
 
 logger = logging.getLogger(__name__)
@@ -28,6 +29,7 @@ class ModelLoader:
         """
         self.cache_size = cache_size
         self._cache: dict[str, Any] = {}
+        self._converters: dict[str, InputConverter] = {}
         self.storage = StorageService()  # Storage abstraction for S3/local
 
     async def load_model(self, file_path: str, model_id: str) -> Any:
@@ -87,19 +89,66 @@ class ModelLoader:
         if len(self._cache) >= self.cache_size:
             oldest_key = next(iter(self._cache))
             del self._cache[oldest_key]
+            self._converters.pop(oldest_key, None)
             logger.info(f"Evicted model {oldest_key} from cache")
 
         self._cache[model_id] = model
 
+    def get_input_converter(
+        self, model_id: str, model: Any, input_schema: Optional[dict] = None
+    ) -> InputConverter:
+        """
+        Get the compiled input converter for a model (compiled on first use)
+
+        Args:
+            model_id: Unique model identifier (one per model version)
+            model: Loaded model object
+            input_schema: Recorded input schema from the model record
+
+        Returns:
+            InputConverter for this model version
+        """
+        converter = self._converters.get(model_id)
+        if converter is None:
+            converter = InputConverter.compile(model, input_schema)
+            self._converters[model_id] = converter
+            logger.info(
+                f"Compiled input converter for model {model_id} "
+                f"(features={converter.n_features}, dtype={converter.dtype})"
+            )
+        return converter
+
+    async def load_input_converter(
+        self, file_path: str, model_id: str, input_schema: Optional[dict] = None
+    ) -> InputConverter:
+        """
+        Get a model's compiled input converter, loading the model only if needed
+
+        Args:
+            file_path: Storage key or path to model file
+            model_id: Unique model identifier (one per model version)
+            input_schema: Recorded input schema from the model record
+
+        Returns:
+            InputConverter for this model version
+        """
+        converter = self._converters.get(model_id)
+        if converter is None:
+            model = await self.load_model(file_path=file_path, model_id=model_id)
+            converter = self.get_input_converter(model_id, model, input_schema)
+        return converter
+
     def clear_cache(self):
         """Clear all models from cache"""
         self._cache.clear()
+        self._converters.clear()
         logger.info("Model cache cleared")
 
     def remove_from_cache(self, model_id: str):
         """Remove a specific model from cache"""
         if model_id in self._cache:
             del self._cache[model_id]
+            self._converters.pop(model_id, None)
             logger.info(f"Model {model_id} removed from cache")
 
     def is_model_cached(self, model_id: str) -> bool:
@@ -0,0 +1,224 @@
+"""
+Model Policy Service
+Per-model serving policies stored in Model.model_metadata
+
+Policies are parsed once per model and kept in process. Updating a model's
+policy publishes an invalidation so every worker re-reads it.
+"""
+
+import logging
+import random
+import threading
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Optional, TypeVar
+
+from app.core.fingerprint import InputFingerprinter
+from app.core.invalidation import InvalidationBus, get_invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+
+# Invalidation bus topic for parsed policies (keyed by model ID)
+POLICY_TOPIC = "model_policy"
+
+# model_metadata keys holding each policy
+CACHE_POLICY_KEY = "cache_policy"
+LOGGING_POLICY_KEY = "logging_policy"
+
+# How logged prediction payloads are stored
+PAYLOAD_MODES = ("full", "hash", "none")
+
+# Defaults mirror the cache's global limits
+DEFAULT_CACHE_TTL = 3600
+DEFAULT_MAX_ENTRY_BYTES = 1 * 1024 * 1024
+
+
+class _MetadataPolicy:
+    """Parsing and serialization shared by policies stored in model_metadata"""
+
+    METADATA_KEY: str
+
+    @classmethod
+    def from_metadata(cls, model_metadata: Optional[dict]):
+        """
+        Parse the policy from a model's metadata
+
+        Unknown keys are ignored; a malformed policy falls back to the defaults.
+        """
+        raw = (model_metadata or {}).get(cls.METADATA_KEY) or {}
+        known = {f.name for f in fields(cls)}
+
+        try:
+            return cls(**{key: value for key, value in raw.items() if key in known})
+        except (TypeError, ValueError, AttributeError) as e:
+            logger.error(f"Invalid {cls.METADATA_KEY} {raw!r}: {e}")
+            return cls()
+
+    def to_dict(self) -> dict:
+        """Policy as stored in model_metadata"""
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class CachePolicy(_MetadataPolicy):
+    """
+    How a model's predictions are cached
+
+    Attributes:
+        enabled: Cache predictions at all (off for stochastic models)
+        ttl: Time-to-live in seconds
+        max_entry_bytes: Largest stored (compressed) value to cache
+        float_precision: Round input floats to this many decimals before
+            hashing, so near-identical inputs share an entry (None = exact)
+    """
+
+    METADATA_KEY = CACHE_POLICY_KEY
+
+    enabled: bool = True
+    ttl: int = DEFAULT_CACHE_TTL
+    max_entry_bytes: int = DEFAULT_MAX_ENTRY_BYTES
+    float_precision: Optional[int] = None
+
+
+DEFAULT_CACHE_POLICY = CachePolicy()
+
+
+@dataclass(frozen=True)
+class LoggingPolicy(_MetadataPolicy):
+    """
+    How a model's predictions are written to the prediction log
+
+    Failed predictions are always logged; usage rollups count every
+    prediction regardless of sampling.
+
+    Attributes:
+        sample_rate: Fraction of successful predictions to log (0.0 - 1.0)
+        payload: Store input/output in "full", as a "hash" fingerprint,
+            or "none" (metrics only)
+    """
+
+    METADATA_KEY = LOGGING_POLICY_KEY
+
+    sample_rate: float = 1.0
+    payload: str = "full"
+
+    def __post_init__(self):
+        if not 0.0 <= self.sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1, got {self.sample_rate}")
+        if self.payload not in PAYLOAD_MODES:
+            raise ValueError(f"payload must be one of {PAYLOAD_MODES}, got {self.payload!r}")
+
+    def should_log(self, status: str) -> bool:
+        """Whether a prediction with this status gets a log row"""
+        if status != "success" or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+    def trim_payload(self, data: Any) -> Optional[Any]:
+        """
+        Reduce a payload to what the policy keeps
+
+        Args:
+            data: Input or output data (JSON-compatible, or containing ndarrays)
+
+        Returns:
+            The data itself, {"fingerprint": hex} or None
+        """
+        if data is None or self.payload == "none":
+            return None
+        if self.payload == "hash":
+            return {"fingerprint": InputFingerprinter().fingerprint(data)}
+        return data
+
+
+DEFAULT_LOGGING_POLICY = LoggingPolicy()
+
+PolicyT = TypeVar("PolicyT", bound=_MetadataPolicy)
+
+
+class PolicyStore:
+    """In-process cache of parsed per-model policies"""
+
+    def __init__(self, bus: Optional[InvalidationBus] = None):
+        self._policies: dict[tuple[str, type], _MetadataPolicy] = {}
+        self._lock = threading.Lock()
+        self.bus = bus or InvalidationBus()
+        self.bus.subscribe(POLICY_TOPIC, self._drop)
+
+    def get_policy(
+        self, policy_cls: type[PolicyT], model_id: str, model_metadata: Optional[dict]
+    ) -> PolicyT:
+        """
+        Get one of a model's policies, parsing its metadata on first use
+
+        Args:
+            policy_cls: Policy class (CachePolicy, LoggingPolicy)
+            model_id: The model UUID
+            model_metadata: Model.model_metadata of the loaded record
+
+        Returns:
+            Parsed policy
+        """
+        key = (model_id, policy_cls)
+        policy = self._policies.get(key)
+        if policy is None:
+            policy = policy_cls.from_metadata(model_metadata)
+            with self._lock:
+                self._policies[key] = policy
+        return policy
+
+    def get_cache_policy(self, model_id: str, model_metadata: Optional[dict]) -> CachePolicy:
+        """Get a model's cache policy"""
+        return self.get_policy(CachePolicy, model_id, model_metadata)
+
+    def get_logging_policy(self, model_id: str, model_metadata: Optional[dict]) -> LoggingPolicy:
+        """Get a model's logging policy"""
+        return self.get_policy(LoggingPolicy, model_id, model_metadata)
+
+    def invalidate(self, model_id: str):
+        """Drop a model's policy on every worker after it changes"""
+        self.bus.publish(POLICY_TOPIC, model_id)
+
+    def _drop(self, model_id: str):
+        with self._lock:
+            for key in [key for key in self._policies if key[0] == model_id]:
+                del self._policies[key]
+
+
+# Global policy store instance
+_policy_store: Optional[PolicyStore] = None
+
+
+def get_policy_store() -> PolicyStore:
+    """Get or create the policy store instance"""
+    global _policy_store
+
+    if _policy_store is None:
+        _policy_store = PolicyStore(get_invalidation_bus())
+
+    return _policy_store
+
+
+def with_policy(
+    model_metadata: Optional[dict], policy_cls: type[_MetadataPolicy], changes: dict[str, Any]
+) -> dict:
+    """
+    Return a copy of model_metadata with changes applied to one policy
+
+    Fields not in changes keep their current value. A new dict is returned
+    so SQLAlchemy detects the JSONB change.
+
+    Args:
+        model_metadata: Current Model.model_metadata
+        policy_cls: Policy class to update (CachePolicy, LoggingPolicy)
+        changes: Policy fields to set
+
+    Returns:
+        Updated metadata dict
+    """
+    current = policy_cls.from_metadata(model_metadata).to_dict()
+    merged = policy_cls.from_metadata({policy_cls.METADATA_KEY: {**current, **changes}})
+
+    updated = dict(model_metadata or {})
+    updated[policy_cls.METADATA_KEY] = merged.to_dict()
+    return updated
@@ -0,0 +1,106 @@
+"""
+Serialization Service
+Pluggable fast JSON encoding for API responses and cache payloads
+
+Uses orjson (native numpy, datetime and UUID support) when installed,
+falling back to the standard library json module.
+"""
+
+import json
+import logging
+from typing import Any, Callable, Optional
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _default(value: Any) -> Any:
+    """Fallback encoder for types the backend can't serialize natively"""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class JSONSerializer:
+    """Standard library json serializer"""
+
+    name = "json"
+
+    def dumps(self, data: Any, sort_keys: bool = False) -> bytes:
+        """Encode data to UTF-8 JSON bytes"""
+        return json.dumps(
+            data, default=_default, sort_keys=sort_keys, separators=(",", ":")
+        ).encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode JSON bytes or text"""
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    """orjson serializer with native numpy support"""
+
+    name = "orjson"
+
+    def __init__(self):
+        self._option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data: Any, sort_keys: bool = False) -> bytes:
+        """Encode data to UTF-8 JSON bytes"""
+        option = self._option | orjson.OPT_SORT_KEYS if sort_keys else self._option
+        return orjson.dumps(data, default=_default, option=option)
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode JSON bytes or text"""
+        return orjson.loads(data)
+
+
+SERIALIZERS: dict[str, Callable[[], Any]] = {
+    "json": JSONSerializer,
+    "orjson": OrjsonSerializer,
+}
+
+
+def create_serializer(backend: Optional[str] = None) -> JSONSerializer | OrjsonSerializer:
+    """
+    Create a serializer for the configured backend
+
+    Args:
+        backend: Backend name (defaults to settings.SERIALIZER_BACKEND)
+
+    Returns:
+        Serializer instance (stdlib json if the backend is unavailable)
+    """
+    backend = (backend or settings.SERIALIZER_BACKEND).lower()
+
+    if backend not in SERIALIZERS:
+        logger.warning(f"Unknown serializer backend '{backend}', using json")
+        backend = "json"
+
+    if backend == "orjson" and orjson is None:
+        logger.warning("orjson not installed, falling back to json serializer")
+        backend = "json"
+
+    return SERIALIZERS[backend]()
+
+
+# Global serializer instance
+serializer = create_serializer()
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with the configured fast serializer"""
+
+    def render(self, content: Any) -> bytes:
+        return serializer.dumps(content)
@@ -0,0 +1,232 @@
+"""
+Binary Tensor Codec
+Decodes and encodes prediction tensors sent as raw bytes instead of JSON
+
+Supported media types:
+- application/x-npy: NumPy .npy format (shape and dtype in the file header)
+- application/octet-stream: raw little-endian floats, shape in X-Tensor-Shape
+  and dtype in X-Tensor-Dtype (float32 or float64, default float64)
+"""
+
+import io
+import logging
+from typing import Mapping, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+JSON_MEDIA_TYPE = "application/json"
+NPY_MEDIA_TYPE = "application/x-npy"
+RAW_MEDIA_TYPE = "application/octet-stream"
+TENSOR_MEDIA_TYPES = (NPY_MEDIA_TYPE, RAW_MEDIA_TYPE)
+
+SHAPE_HEADER = "X-Tensor-Shape"
+DTYPE_HEADER = "X-Tensor-Dtype"
+
+# Raw tensors are always little-endian floats
+RAW_DTYPES = {"float32": np.dtype("<f4"), "float64": np.dtype("<f8")}
+
+
+class TensorCodecError(ValueError):
+    """Raised when a binary tensor body can't be decoded or encoded"""
+
+
+def _media_type(content_type: Optional[str]) -> str:
+    """Strip parameters (e.g. charset) from a Content-Type value"""
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+
+def is_tensor_content_type(content_type: Optional[str]) -> bool:
+    """Check whether a request body is a binary tensor"""
+    return _media_type(content_type) in TENSOR_MEDIA_TYPES
+
+
+def _parse_accept(accept: str) -> list[tuple[str, float]]:
+    """Media ranges and their q-values from an Accept header, in header order"""
+    ranges = []
+    for candidate in accept.split(","):
+        media_range, *params = candidate.split(";")
+        media_range = media_range.strip().lower()
+        if not media_range:
+            continue
+
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = min(max(float(value), 0.0), 1.0)
+                except ValueError:
+                    quality = 0.0  # Malformed weights are treated as not acceptable
+        ranges.append((media_range, quality))
+    return ranges
+
+
+def _acceptance(media_type: str, ranges: list[tuple[str, float]]) -> Optional[tuple[float, int, int]]:
+    """
+    How much a client accepts a media type
+
+    The most specific matching range decides the q-value (exact type over
+    type/* over */*).
+
+    Returns:
+        Sort key (q-value, specificity, -position), or None if no range matches
+    """
+    main_type = media_type.split("/", 1)[0]
+    best = None
+    for position, (media_range, quality) in enumerate(ranges):
+        if media_range == media_type:
+            specificity = 3
+        elif media_range == f"{main_type}/*":
+            specificity = 2
+        elif media_range == "*/*":
+            specificity = 1
+        else:
+            continue
+        if best is None or specificity > best[1]:
+            best = (quality, specificity, -position)
+    return best
+
+
+def negotiate_tensor_type(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick a binary tensor media type from an Accept header
+
+    JSON and the tensor types are weighed by their q-values; ties go to
+    the type matched more specifically, then to the one listed first, then
+    to JSON. A q-value of 0 marks a type as not acceptable.
+
+    Returns:
+        The preferred tensor media type, or None for JSON
+    """
+    if not accept:
+        return None
+
+    ranges = _parse_accept(accept)
+    best, best_rank = None, None
+    for media_type in (JSON_MEDIA_TYPE, *TENSOR_MEDIA_TYPES):
+        rank = _acceptance(media_type, ranges)
+        if rank is None or rank[0] <= 0:
+            continue
+        if best_rank is None or rank > best_rank:
+            best, best_rank = media_type, rank
+
+    return best if best in TENSOR_MEDIA_TYPES else None
+
+
+def _parse_shape(value: Optional[str], size: int) -> tuple[int, ...]:
+    """Parse an X-Tensor-Shape header such as '32,10'"""
+    if not value:
+        return (size,)
+
+    try:
+        shape = tuple(int(dim) for dim in value.replace("x", ",").split(",") if dim.strip())
+    except ValueError:
+        raise TensorCodecError(f"Invalid {SHAPE_HEADER} header: {value}")
+
+    if not shape or any(dim < 0 for dim in shape) or int(np.prod(shape)) != size:
+        raise TensorCodecError(
+            f"{SHAPE_HEADER} {value} doesn't match body of {size} elements"
+        )
+    return shape
+
+
+def _decode_npy(body: bytes) -> np.ndarray:
+    """Decode a .npy body as a view over the request bytes"""
+    stream = io.BytesIO(body)
+    try:
+        major, _ = np.lib.format.read_magic(stream)
+        if major == 1:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(stream)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(stream)
+    except ValueError as e:
+        raise TensorCodecError(f"Invalid .npy body: {str(e)}")
+
+    if dtype.hasobject:
+        raise TensorCodecError("Object arrays are not accepted")
+
+    count = int(np.prod(shape))
+    offset = stream.tell()
+    if len(body) - offset != count * dtype.itemsize:
+        raise TensorCodecError(".npy body is truncated")
+
+    array = np.frombuffer(body, dtype=dtype, count=count, offset=offset)
+    return array.reshape(shape, order="F" if fortran_order else "C")
+
+
+def _decode_raw(body: bytes, headers: Mapping[str, str]) -> np.ndarray:
+    """Decode a raw little-endian float body as a view over the request bytes"""
+    dtype_name = (headers.get(DTYPE_HEADER) or "float64").lower()
+    dtype = RAW_DTYPES.get(dtype_name)
+    if dtype is None:
+        raise TensorCodecError(
+            f"Unsupported {DTYPE_HEADER} '{dtype_name}'. Use one of: {', '.join(RAW_DTYPES)}"
+        )
+
+    if len(body) % dtype.itemsize:
+        raise TensorCodecError(f"Body length is not a multiple of {dtype_name} size")
+
+    size = len(body) // dtype.itemsize
+    shape = _parse_shape(headers.get(SHAPE_HEADER), size)
+    return np.frombuffer(body, dtype=dtype).reshape(shape)
+
+
+def decode_tensor(body: bytes, content_type: str, headers: Mapping[str, str]) -> np.ndarray:
+    """
+    Decode a binary request body into an ndarray without copying the data
+
+    Args:
+        body: Raw request body
+        content_type: Request Content-Type
+        headers: Request headers (for raw shape/dtype)
+
+    Returns:
+        Read-only ndarray backed by the request body
+
+    Raises:
+        TensorCodecError: If the body is malformed
+    """
+    if not body:
+        raise TensorCodecError("Empty tensor body")
+
+    if _media_type(content_type) == NPY_MEDIA_TYPE:
+        return _decode_npy(body)
+    return _decode_raw(body, headers)
+
+
+def encode_tensor(array: np.ndarray, media_type: str) -> tuple[bytes, dict[str, str]]:
+    """
+    Encode an ndarray for a binary response
+
+    Args:
+        array: Output array
+        media_type: One of TENSOR_MEDIA_TYPES
+
+    Returns:
+        Tuple of (body, headers describing the tensor)
+
+    Raises:
+        TensorCodecError: If the array can't be represented in the media type
+    """
+    if array.dtype.hasobject:
+        raise TensorCodecError("Output is not a numeric or string tensor")
+
+    if media_type == NPY_MEDIA_TYPE:
+        stream = io.BytesIO()
+        np.lib.format.write_array(stream, array, allow_pickle=False)
+        return stream.getvalue(), {}
+
+    if array.dtype.kind not in "biuf":
+        raise TensorCodecError(
+            f"{RAW_MEDIA_TYPE} responses require numeric output, use {NPY_MEDIA_TYPE}"
+        )
+
+    dtype_name = "float32" if array.dtype == np.float32 else "float64"
+    raw = np.ascontiguousarray(array, dtype=RAW_DTYPES[dtype_name])
+    return raw.tobytes(), {
+        SHAPE_HEADER: ",".join(str(dim) for dim in raw.shape),
+        DTYPE_HEADER: dtype_name,
+    }
@@ -0,0 +1,517 @@
+"""
+Usage Rollup Service
+Maintains per-model hourly aggregates and answers analytics from them
+
+Each logged prediction is counted into its model's row for the current
+hour, so analytics reads at most one row per hour of history instead of
+scanning the predictions table. Successful latencies are also counted into
+daily latency sketch bins, merged at query time into percentiles, and into
+the model's all-time counters shown by the model endpoints.
+
+Those rows are hot (every prediction for a model hits the same hourly and
+all-time rows), so increments are accumulated in process and written by a
+background timer in one batched upsert per table every
+USAGE_FLUSH_INTERVAL_SECONDS, outside the prediction log's transaction.
+A failed flush puts its increments back for the next one.
+"""
+
+import atexit
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import Date, case, cast, func, literal
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.latency_sketch import LatencySketch, bin_index
+from app.db.session import engine
+from app.models.model import Model
+from app.models.usage_rollup import ModelLatencyBin, ModelStats, ModelUsageRollup
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UsageCounts:
+    """Pending increments for one rollup row or one model's all-time counters"""
+
+    prediction_count: int = 0
+    success_count: int = 0
+    failure_count: int = 0
+    latency_count: int = 0
+    latency_sum_ms: int = 0
+    latency_min_ms: Optional[int] = None
+    latency_max_ms: Optional[int] = None
+    last_prediction_at: Optional[datetime] = None
+
+    def add(self, success: bool, inference_time_ms: Optional[int], at: datetime):
+        """Count one prediction"""
+        self.prediction_count += 1
+        self.success_count += success
+        self.failure_count += not success
+        self.last_prediction_at = at
+        if inference_time_ms is not None:
+            self.latency_count += 1
+            self.latency_sum_ms += inference_time_ms
+            if self.latency_min_ms is None or inference_time_ms < self.latency_min_ms:
+                self.latency_min_ms = inference_time_ms
+            if self.latency_max_ms is None or inference_time_ms > self.latency_max_ms:
+                self.latency_max_ms = inference_time_ms
+
+    def merge(self, other: "UsageCounts"):
+        """Add another set of pending increments"""
+        self.prediction_count += other.prediction_count
+        self.success_count += other.success_count
+        self.failure_count += other.failure_count
+        self.latency_count += other.latency_count
+        self.latency_sum_ms += other.latency_sum_ms
+        self.latency_min_ms = _min(self.latency_min_ms, other.latency_min_ms)
+        self.latency_max_ms = _max(self.latency_max_ms, other.latency_max_ms)
+        self.last_prediction_at = _max(self.last_prediction_at, other.last_prediction_at)
+
+
+def _min(a, b):
+    """Smaller of two values, ignoring None (like SQL LEAST)"""
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _max(a, b):
+    """Larger of two values, ignoring None (like SQL GREATEST)"""
+    return b if a is None else a if b is None else max(a, b)
+
+
+class UsageRecorder:
+    """
+    In-process buffer of usage increments, flushed to the rollup tables in batches
+
+    Thread-safe: predictions are recorded from background task threads and
+    flushed from a timer thread (see start).
+    """
+
+    def __init__(self, flush_interval: Optional[float] = None, bind: Optional[Engine] = None):
+        """
+        Initialize recorder
+
+        Args:
+            flush_interval: Seconds between flushes of the timer thread
+            bind: Engine to write to (defaults to the application's engine)
+        """
+        if flush_interval is None:
+            flush_interval = settings.USAGE_FLUSH_INTERVAL_SECONDS
+        self.flush_interval = flush_interval
+
+        self._lock = threading.Lock()
+        # One flush at a time, so a failed flush's increments are back before the next
+        self._flush_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        self._bind = bind
+        # (model_id, hour) -> counts
+        self._rollups: dict[tuple[UUID, datetime], UsageCounts] = {}
+        # (model_id, day, bin) -> count
+        self._bins: dict[tuple[UUID, datetime, int], int] = {}
+        # model_id -> counts
+        self._stats: dict[UUID, UsageCounts] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of models with unflushed increments"""
+        return len(self._stats)
+
+    def record(self, model_id: UUID, status: str, inference_time_ms: Optional[int]):
+        """
+        Count one prediction towards its model's rollups
+
+        Args:
+            model_id: The model UUID
+            status: Prediction status ("success" or "failed")
+            inference_time_ms: Inference time in milliseconds
+        """
+        success = status == "success"
+        latency = inference_time_ms if success else None
+        now = datetime.now(timezone.utc)
+        hour = now.replace(minute=0, second=0, microsecond=0)
+        day = hour.replace(hour=0)
+
+        with self._lock:
+            self._rollups.setdefault((model_id, hour), UsageCounts()).add(success, latency, now)
+            self._stats.setdefault(model_id, UsageCounts()).add(success, latency, now)
+            if latency is not None:
+                key = (model_id, day, bin_index(latency))
+                self._bins[key] = self._bins.get(key, 0) + 1
+
+    def start(self):
+        """Start the background thread flushing every flush_interval seconds"""
+        if self._timer is not None:
+            return
+        self._timer = threading.Thread(target=self._run, name="usage-flush", daemon=True)
+        self._timer.start()
+
+    def stop(self):
+        """Stop the timer thread and flush what is left"""
+        self._stopping.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        if self.pending:
+            self.flush()
+
+    def _run(self):
+        while not self._stopping.wait(self.flush_interval):
+            if self.pending:
+                self.flush()
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """
+        Write pending increments with one upsert per table and commit
+
+        Runs in a session of its own on the caller's connection pool, so the
+        caller's pending changes and loaded objects are untouched. Rows are
+        written in key order so concurrent flushes from several workers lock
+        them in the same order. Increments for models deleted in the
+        meantime are discarded; if the flush fails, its increments are
+        merged back into the buffer for the next flush.
+
+        Args:
+            db: Database session whose engine the flush uses (defaults to
+                the last one seen, then the application's engine)
+
+        Returns:
+            Number of models flushed
+        """
+        if db is not None:
+            self._bind = db.get_bind()
+
+        with self._flush_lock:
+            with self._lock:
+                rollups, bins, stats = self._rollups, self._bins, self._stats
+                self._rollups, self._bins, self._stats = {}, {}, {}
+
+            if not stats:
+                return 0
+            return self._write(rollups, bins, stats)
+
+    def _write(
+        self,
+        rollups: dict[tuple[UUID, datetime], UsageCounts],
+        bins: dict[tuple[UUID, datetime, int], int],
+        stats: dict[UUID, UsageCounts],
+    ) -> int:
+        """Upsert swapped-out increments, restoring them to the buffer on failure"""
+        try:
+            with Session(bind=self._bind or engine) as session, session.begin():
+                existing = {
+                    model_id
+                    for (model_id,) in session.query(Model.id).filter(Model.id.in_(list(stats)))
+                }
+                rollups = {key: counts for key, counts in rollups.items() if key[0] in existing}
+                bins = {key: count for key, count in bins.items() if key[0] in existing}
+                stats = {key: counts for key, counts in stats.items() if key in existing}
+
+                if stats:
+                    self._upsert_rollups(session, rollups)
+                    self._upsert_bins(session, bins)
+                    self._upsert_stats(session, stats)
+
+            logger.debug(f"Flushed usage rollups for {len(stats)} models")
+            return len(stats)
+
+        except Exception as e:
+            logger.error(f"Failed to flush usage rollups, keeping them for the next flush: {e}")
+            self._restore(rollups, bins, stats)
+            return 0
+
+    def _restore(
+        self,
+        rollups: dict[tuple[UUID, datetime], UsageCounts],
+        bins: dict[tuple[UUID, datetime, int], int],
+        stats: dict[UUID, UsageCounts],
+    ):
+        """Merge unwritten increments back into the live buffer"""
+        with self._lock:
+            for key, counts in rollups.items():
+                self._rollups.setdefault(key, UsageCounts()).merge(counts)
+            for key, count in bins.items():
+                self._bins[key] = self._bins.get(key, 0) + count
+            for key, counts in stats.items():
+                self._stats.setdefault(key, UsageCounts()).merge(counts)
+
+    @staticmethod
+    def _upsert_rollups(db: Session, rollups: dict[tuple[UUID, datetime], UsageCounts]):
+        rollup = ModelUsageRollup.__table__
+        stmt = insert(rollup).values(
+            [
+                {
+                    "model_id": model_id,
+                    "bucket": bucket,
+                    "prediction_count": counts.prediction_count,
+                    "success_count": counts.success_count,
+                    "failure_count": counts.failure_count,
+                    "latency_count": counts.latency_count,
+                    "latency_sum_ms": counts.latency_sum_ms,
+                    "latency_min_ms": counts.latency_min_ms,
+                    "latency_max_ms": counts.latency_max_ms,
+                }
+                for (model_id, bucket), counts in sorted(rollups.items(), key=_row_order)
+            ]
+        )
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[rollup.c.model_id, rollup.c.bucket],
+            set_={
+                "prediction_count": rollup.c.prediction_count + excluded.prediction_count,
+                "success_count": rollup.c.success_count + excluded.success_count,
+                "failure_count": rollup.c.failure_count + excluded.failure_count,
+                "latency_count": rollup.c.latency_count + excluded.latency_count,
+                "latency_sum_ms": rollup.c.latency_sum_ms + excluded.latency_sum_ms,
+                # LEAST/GREATEST ignore NULLs
+                "latency_min_ms": func.least(rollup.c.latency_min_ms, excluded.latency_min_ms),
+                "latency_max_ms": func.greatest(rollup.c.latency_max_ms, excluded.latency_max_ms),
+            },
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def _upsert_bins(db: Session, bins: dict[tuple[UUID, datetime, int], int]):
+        if not bins:
+            return
+        table = ModelLatencyBin.__table__
+        stmt = insert(table).values(
+            [
+                {"model_id": model_id, "bucket": bucket, "bin": bin, "count": count}
+                for (model_id, bucket, bin), count in sorted(bins.items(), key=_row_order)
+            ]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.model_id, table.c.bucket, table.c.bin],
+            set_={"count": table.c.count + stmt.excluded.count},
+        )
+        db.execute(stmt)
+
+    @staticmethod
+    def _upsert_stats(db: Session, stats: dict[UUID, UsageCounts]):
+        counters = ModelStats.__table__
+        stmt = insert(counters).values(
+            [
+                {
+                    "model_id": model_id,
+                    "prediction_count": counts.prediction_count,
+                    "success_count": counts.success_count,
+                    "failure_count": counts.failure_count,
+                    "latency_count": counts.latency_count,
+                    "latency_sum_ms": counts.latency_sum_ms,
+                    "last_prediction_at": counts.last_prediction_at,
+                }
+                for model_id, counts in sorted(stats.items(), key=lambda item: str(item[0]))
+            ]
+        )
+        excluded = stmt.excluded
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[counters.c.model_id],
+            set_={
+                "prediction_count": counters.c.prediction_count + excluded.prediction_count,
+                "success_count": counters.c.success_count + excluded.success_count,
+                "failure_count": counters.c.failure_count + excluded.failure_count,
+                "latency_count": counters.c.latency_count + excluded.latency_count,
+                "latency_sum_ms": counters.c.latency_sum_ms + excluded.latency_sum_ms,
+                "last_prediction_at": func.greatest(
+                    counters.c.last_prediction_at, excluded.last_prediction_at
+                ),
+            },
+        )
+        db.execute(stmt)
+
+
+def _row_order(item: tuple[tuple, Any]) -> tuple:
+    """Sort key for pending rows: model ID as text, then the rest of the key"""
+    key = item[0]
+    return (str(key[0]), *key[1:])
+
+
+# Global usage recorder instance
+_usage_recorder: Optional[UsageRecorder] = None
+
+
+def get_usage_recorder() -> UsageRecorder:
+    """Get or create the usage recorder (flushed by a timer thread and at interpreter exit)"""
+    global _usage_recorder
+
+    if _usage_recorder is None:
+        _usage_recorder = UsageRecorder()
+        _usage_recorder.start()
+        atexit.register(_usage_recorder.stop)
+
+    return _usage_recorder
+
+
+def get_model_stats(db: Session, model_ids: Iterable[UUID]) -> dict[UUID, dict[str, Any]]:
+    """
+    All-time statistics for a set of models in one query
+
+    Args:
+        db: Database session
+        model_ids: Model UUIDs (e.g. one page of a model list)
+
+    Returns:
+        Dict of model ID to statistics; models without predictions get zeros
+    """
+    model_ids = list(model_ids)
+    rows = (
+        db.query(ModelStats).filter(ModelStats.model_id.in_(model_ids)).all()
+        if model_ids
+        else []
+    )
+    by_id = {row.model_id: row for row in rows}
+
+    stats = {}
+    for model_id in model_ids:
+        row = by_id.get(model_id)
+        if row is None or not row.prediction_count:
+            stats[model_id] = {
+                "total_predictions": 0,
+                "avg_inference_time_ms": None,
+                "success_rate": 0,
+                "last_prediction_at": None,
+            }
+            continue
+
+        stats[model_id] = {
+            "total_predictions": row.prediction_count,
+            "avg_inference_time_ms": (
+                round(row.latency_sum_ms / row.latency_count, 2) if row.latency_count else None
+            ),
+            "success_rate": round(row.success_count / row.prediction_count * 100, 2),
+            "last_prediction_at": row.last_prediction_at,
+        }
+    return stats
+
+
+def get_latency_percentiles(db: Session, model_id: UUID, days: int) -> dict[str, Any]:
+    """
+    Latency percentiles over a window and per day, from the latency sketch bins
+
+    Args:
+        db: Database session
+        model_id: The model UUID
+        days: Number of days to include
+
+    Returns:
+        Dict with "overall" percentiles and "daily" percentiles keyed by date
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    day = cast(ModelLatencyBin.bucket, Date)
+
+    rows = (
+        db.query(day.label("day"), ModelLatencyBin.bin, ModelLatencyBin.count)
+        .filter(ModelLatencyBin.model_id == model_id, ModelLatencyBin.bucket >= cutoff)
+        .all()
+    )
+
+    overall = LatencySketch()
+    daily: dict[str, LatencySketch] = {}
+    for row in rows:
+        overall.add_bin(row.bin, row.count)
+        daily.setdefault(str(row.day), LatencySketch()).add_bin(row.bin, row.count)
+
+    return {
+        "overall": overall.percentiles(),
+        "daily": {date: sketch.percentiles() for date, sketch in daily.items()},
+    }
+
+
+def get_usage_summary(db: Session, model_id: UUID, days: int) -> dict[str, Any]:
+    """
+    All-time statistics and daily trends for a model in one query
+
+    Groups the model's rollups by ROLLUP(day), where day is only set for
+    buckets inside the window: the grouped rows are the daily trends (plus
+    one row for everything older) and the grand total row is the all-time
+    summary.
+
+    Args:
+        db: Database session
+        model_id: The model UUID
+        days: Number of days of daily trends
+
+    Returns:
+        Dict with "statistics" and "usage_trends"
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    buckets = (
+        db.query(
+            case(
+                (ModelUsageRollup.bucket >= cutoff, cast(ModelUsageRollup.bucket, Date)),
+                else_=literal(None, Date),
+            ).label("day"),
+            ModelUsageRollup.prediction_count,
+            ModelUsageRollup.success_count,
+            ModelUsageRollup.failure_count,
+            ModelUsageRollup.latency_count,
+            ModelUsageRollup.latency_sum_ms,
+            ModelUsageRollup.latency_min_ms,
+            ModelUsageRollup.latency_max_ms,
+        )
+        .filter(ModelUsageRollup.model_id == model_id)
+        .subquery()
+    )
+
+    rows = (
+        db.query(
+            buckets.c.day,
+            func.grouping(buckets.c.day).label("is_total"),
+            func.sum(buckets.c.prediction_count).label("count"),
+            func.sum(buckets.c.success_count).label("successes"),
+            func.sum(buckets.c.failure_count).label("failures"),
+            func.sum(buckets.c.latency_count).label("latency_count"),
+            func.sum(buckets.c.latency_sum_ms).label("latency_sum"),
+            func.min(buckets.c.latency_min_ms).label("latency_min"),
+            func.max(buckets.c.latency_max_ms).label("latency_max"),
+        )
+        .group_by(func.rollup(buckets.c.day))
+        .order_by(buckets.c.day)
+        .all()
+    )
+
+    # ROLLUP over no rows still yields a grand total, with NULL sums
+    total = next((row for row in rows if row.is_total and row.count is not None), None)
+    total_predictions = int(total.count) if total else 0
+    successful_predictions = int(total.successes) if total else 0
+
+    statistics = {
+        "total_predictions": total_predictions,
+        "successful_predictions": successful_predictions,
+        "failed_predictions": int(total.failures) if total else 0,
+        "success_rate": (
+            round(successful_predictions / total_predictions * 100, 2)
+            if total_predictions > 0
+            else 0
+        ),
+        "avg_inference_time_ms": _average(total) if total else None,
+        "min_inference_time_ms": total.latency_min if total else None,
+        "max_inference_time_ms": total.latency_max if total else None,
+    }
+
+    usage_trends = [
+        {
+            "date": str(row.day),
+            "prediction_count": int(row.count),
+            "avg_inference_time_ms": _average(row),
+        }
+        for row in rows
+        if not row.is_total and row.day is not None
+    ]
+
+    return {"statistics": statistics, "usage_trends": usage_trends}
+
+
+def _average(row) -> Optional[float]:
+    """Average latency of a grouped row"""
+    if not row.latency_count:
+        return None
+    return round(float(row.latency_sum) / float(row.latency_count), 2)
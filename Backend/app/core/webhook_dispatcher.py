@@ -0,0 +1,432 @@
+"""
+Webhook Dispatcher
+Worker that delivers queued webhook events from the webhook_deliveries outbox
+
+Due deliveries are claimed with FOR UPDATE SKIP LOCKED and leased by
+pushing next_attempt_at forward, so several workers can run side by side
+and a crashed worker's claims become due again once the lease expires.
+Claiming counts as an attempt, so rows with attempts = 0 have never been
+sent. Each destination host gets one shared keep-alive HTTP client and a
+bounded number of concurrent requests. Failed attempts are retried with
+exponential backoff and full jitter until the webhook's retry_count is
+used up.
+
+Webhooks with a batch_size above 1 receive their events as one signed JSON
+array per POST: a batch goes out once batch_size events are waiting or
+the oldest one's batch window has passed, whichever comes first.
+
+Run as a separate process:
+    python -m app.core.webhook_dispatcher
+"""
+
+import asyncio
+import json
+import logging
+import random
+import signal
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional, Sequence
+from urllib.parse import urlsplit
+from uuid import UUID
+
+import httpx
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+from app.core.logging import setup_logging
+from app.core.webhook_service import generate_webhook_signature
+from app.db.session import SessionLocal
+from app.models.webhook import Webhook
+from app.models.webhook_delivery import WebhookDelivery
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DeliveryJob:
+    """One claimed POST (a single delivery or a batch), detached from the database session"""
+
+    delivery_ids: tuple[UUID, ...]
+    webhook_id: UUID
+    url: str
+    secret: str
+    timeout: float
+    max_attempts: int
+    attempts: int  # Highest attempt number among the deliveries
+    payload: Any  # Event body, or a list of event bodies for batched webhooks
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Seconds to wait before retrying after a failed attempt
+
+    Exponential backoff with full jitter: a random delay up to
+    base * 2^(attempt - 1), capped, so retries against a recovering
+    receiver spread out instead of arriving in waves.
+
+    Args:
+        attempt: Number of attempts made so far (1 after the first failure)
+    """
+    ceiling = min(
+        settings.WEBHOOK_BACKOFF_MAX_SECONDS,
+        settings.WEBHOOK_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1),
+    )
+    return random.uniform(0, ceiling)
+
+
+class WebhookDispatcher:
+    """Pool of concurrent webhook deliveries fed from the outbox"""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        concurrency: Optional[int] = None,
+        per_host: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        Initialize dispatcher
+
+        Args:
+            session_factory: Creates database sessions
+            concurrency: Deliveries in flight across all hosts
+            per_host: Deliveries in flight per destination host
+            poll_interval: Seconds between outbox polls when idle
+            transport: Optional httpx transport for the HTTP clients
+        """
+        self.session_factory = session_factory
+        self.concurrency = concurrency or settings.WEBHOOK_WORKER_CONCURRENCY
+        self.per_host = per_host or settings.WEBHOOK_MAX_CONCURRENCY_PER_HOST
+        self.poll_interval = poll_interval or settings.WEBHOOK_POLL_INTERVAL_SECONDS
+        self.transport = transport
+
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._in_flight: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    # ==================== OUTBOX ====================
+
+    def claim(self, limit: int) -> list[DeliveryJob]:
+        """
+        Lease up to limit jobs worth of due deliveries
+
+        Due deliveries of batched webhooks are grouped into batches and
+        topped up with that webhook's waiting events; webhooks with a full
+        batch waiting are claimed before their window ends.
+
+        Args:
+            limit: Maximum jobs (POSTs) to claim
+
+        Returns:
+            Claimed jobs
+        """
+        now = datetime.now(timezone.utc)
+        lease_until = now + timedelta(seconds=settings.WEBHOOK_DELIVERY_LEASE_SECONDS)
+
+        with self.session_factory() as db:
+            due = (
+                self._pending(db)
+                .filter(WebhookDelivery.next_attempt_at <= now)
+                .order_by(WebhookDelivery.next_attempt_at)
+                .limit(limit)
+                .all()
+            )
+
+            groups: list[tuple[Webhook, list[WebhookDelivery]]] = []
+            batched: dict[UUID, tuple[Webhook, list[WebhookDelivery]]] = {}
+            for delivery, webhook in due:
+                if webhook.is_batched:
+                    batched.setdefault(webhook.id, (webhook, []))[1].append(delivery)
+                else:
+                    groups.append((webhook, [delivery]))
+
+            for webhook, deliveries in batched.values():
+                size = webhook.batch_size
+                chunks = [deliveries[i : i + size] for i in range(0, len(deliveries), size)]
+                chunks[-1].extend(
+                    self._waiting(db, webhook, size - len(chunks[-1]), [d.id for d in deliveries])
+                )
+                groups.extend((webhook, chunk) for chunk in chunks)
+
+            if len(groups) < limit:
+                for webhook in self._full_batches(db, set(batched), limit - len(groups)):
+                    deliveries = self._waiting(db, webhook, webhook.batch_size)
+                    if deliveries:
+                        groups.append((webhook, deliveries))
+
+            jobs = []
+            for webhook, deliveries in groups:
+                for delivery in deliveries:
+                    delivery.next_attempt_at = lease_until
+                    delivery.attempts += 1
+                jobs.append(
+                    DeliveryJob(
+                        delivery_ids=tuple(delivery.id for delivery in deliveries),
+                        webhook_id=webhook.id,
+                        url=str(webhook.url),
+                        secret=webhook.secret,
+                        timeout=float(webhook.timeout_seconds),
+                        max_attempts=max(1, int(webhook.retry_count)),
+                        attempts=max(delivery.attempts for delivery in deliveries),
+                        payload=(
+                            [delivery.payload for delivery in deliveries]
+                            if webhook.is_batched
+                            else deliveries[0].payload
+                        ),
+                    )
+                )
+            db.commit()
+
+        return jobs
+
+    @staticmethod
+    def _pending(db: Session) -> Query:
+        """Pending deliveries with their webhook, skipping rows other workers hold"""
+        return (
+            db.query(WebhookDelivery, Webhook)
+            .join(Webhook, Webhook.id == WebhookDelivery.webhook_id)
+            .filter(WebhookDelivery.status == "pending")
+            .with_for_update(skip_locked=True, of=WebhookDelivery)
+        )
+
+    def _waiting(
+        self, db: Session, webhook: Webhook, limit: int, exclude: Sequence[UUID] = ()
+    ) -> list[WebhookDelivery]:
+        """Lock up to limit never-sent events of a batched webhook, oldest first"""
+        if limit <= 0:
+            return []
+        query = self._pending(db).filter(
+            WebhookDelivery.webhook_id == webhook.id,
+            WebhookDelivery.attempts == 0,
+        )
+        if exclude:
+            query = query.filter(WebhookDelivery.id.notin_(exclude))
+        rows = query.order_by(WebhookDelivery.created_at).limit(limit).all()
+        return [delivery for delivery, _ in rows]
+
+    @staticmethod
+    def _full_batches(db: Session, exclude: set[UUID], limit: int) -> list[Webhook]:
+        """Batched webhooks with at least batch_size never-sent events waiting"""
+        query = (
+            db.query(Webhook)
+            .join(WebhookDelivery, WebhookDelivery.webhook_id == Webhook.id)
+            .filter(
+                Webhook.batch_size > 1,
+                WebhookDelivery.status == "pending",
+                WebhookDelivery.attempts == 0,
+            )
+            .group_by(Webhook.id)
+            .having(func.count(WebhookDelivery.id) >= Webhook.batch_size)
+        )
+        if exclude:
+            query = query.filter(Webhook.id.notin_(exclude))
+        return query.limit(limit).all()
+
+    def record_result(
+        self, job: DeliveryJob, response_status: Optional[int], error: Optional[str]
+    ):
+        """
+        Store the outcome of a delivery attempt for every delivery in the job
+
+        Any response below 500 ends the delivery (client errors are not
+        retried); server errors and network failures are retried with
+        backoff until the webhook's attempts are used up. Retried events
+        of a batch share one retry time, so they stay batched together.
+        """
+        now = datetime.now(timezone.utc)
+        retry_at = now + timedelta(seconds=backoff_delay(job.attempts))
+        delivered = response_status is not None and response_status < 500
+
+        with self.session_factory() as db:
+            # Missing rows: webhook deleted meanwhile
+            deliveries = (
+                db.query(WebhookDelivery)
+                .filter(WebhookDelivery.id.in_(job.delivery_ids))
+                .all()
+            )
+
+            failed = 0
+            for delivery in deliveries:
+                delivery.response_status = response_status
+                delivery.last_error = error
+                if delivered:
+                    delivery.status = "delivered"
+                    delivery.delivered_at = now
+                elif delivery.attempts >= job.max_attempts:
+                    delivery.status = "failed"
+                    failed += 1
+                else:
+                    delivery.next_attempt_at = retry_at
+
+            if delivered and deliveries:
+                db.query(Webhook).filter(Webhook.id == job.webhook_id).update(
+                    {Webhook.last_triggered_at: now}
+                )
+            if failed:
+                logger.error(
+                    f"Webhook {job.webhook_id}: {failed} deliveries failed after "
+                    f"{job.max_attempts} attempts: {error or response_status}"
+                )
+
+            db.commit()
+
+    def purge(self) -> int:
+        """
+        Delete finished deliveries older than the retention window
+
+        Returns:
+            Number of deliveries deleted
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            days=settings.WEBHOOK_DELIVERY_RETENTION_DAYS
+        )
+        with self.session_factory() as db:
+            deleted = (
+                db.query(WebhookDelivery)
+                .filter(
+                    WebhookDelivery.status != "pending",
+                    WebhookDelivery.created_at < cutoff,
+                )
+                .delete(synchronize_session=False)
+            )
+            db.commit()
+        return deleted
+
+    # ==================== HTTP ====================
+
+    def _client_for(self, host: str) -> httpx.AsyncClient:
+        """Shared keep-alive client for a destination host"""
+        client = self._clients.get(host)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=self.per_host, max_keepalive_connections=self.per_host
+            )
+            client = httpx.AsyncClient(limits=limits, transport=self.transport)
+            self._clients[host] = client
+        return client
+
+    def _slot_for(self, host: str) -> asyncio.Semaphore:
+        """Bounds concurrent deliveries to one host"""
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.per_host)
+            self._host_slots[host] = slot
+        return slot
+
+    async def deliver(self, job: DeliveryJob):
+        """POST one delivery or batch and record the outcome"""
+        host = urlsplit(job.url).netloc
+        body = json.dumps(job.payload)
+        headers = {
+            "Content-Type": "application/json",
+            "X-Webhook-Signature": generate_webhook_signature(body, job.secret),
+            "X-Webhook-Timestamp": datetime.utcnow().isoformat(),
+            "X-Webhook-Id": str(job.webhook_id),
+        }
+        if isinstance(job.payload, list):
+            headers["X-Webhook-Batch-Size"] = str(len(job.payload))
+        else:
+            headers["X-Webhook-Delivery"] = str(job.delivery_ids[0])
+
+        response_status, error = None, None
+        async with self._slot_for(host):
+            try:
+                response = await self._client_for(host).post(
+                    job.url, content=body, headers=headers, timeout=job.timeout
+                )
+                response_status = response.status_code
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+                logger.warning(
+                    f"Webhook {job.webhook_id} attempt {job.attempts}/{job.max_attempts} "
+                    f"failed: {error}"
+                )
+
+        await asyncio.to_thread(self.record_result, job, response_status, error)
+
+    # ==================== WORKER LOOP ====================
+
+    def _start(self, job: DeliveryJob):
+        task = asyncio.create_task(self.deliver(job))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def run_once(self) -> int:
+        """
+        Deliver every currently due delivery and wait for them to finish
+
+        Returns:
+            Number of deliveries attempted (events in a batch count individually)
+        """
+        jobs = await asyncio.to_thread(self.claim, self.concurrency)
+        for job in jobs:
+            self._start(job)
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        return sum(len(job.delivery_ids) for job in jobs)
+
+    async def run(self):
+        """Poll the outbox and keep up to concurrency deliveries in flight until stopped"""
+        logger.info(
+            f"Webhook dispatcher started (concurrency={self.concurrency}, per_host={self.per_host})"
+        )
+        last_purge = datetime.min.replace(tzinfo=timezone.utc)
+
+        try:
+            while not self._stopping.is_set():
+                if datetime.now(timezone.utc) - last_purge > timedelta(hours=1):
+                    await asyncio.to_thread(self.purge)
+                    last_purge = datetime.now(timezone.utc)
+
+                free = self.concurrency - len(self._in_flight)
+                jobs = await asyncio.to_thread(self.claim, free) if free > 0 else []
+                for job in jobs:
+                    self._start(job)
+
+                if free > 0 and len(jobs) == free:
+                    continue  # More may be due right away
+                if len(self._in_flight) >= self.concurrency:
+                    await asyncio.wait(self._in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._in_flight:
+                await asyncio.gather(*self._in_flight, return_exceptions=True)
+            await self.close()
+            logger.info("Webhook dispatcher stopped")
+
+    def stop(self):
+        """Ask the run loop to finish in-flight deliveries and exit"""
+        self._stopping.set()
+
+    async def close(self):
+        """Close the per-host HTTP clients"""
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+async def _main():
+    dispatcher = WebhookDispatcher()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, dispatcher.stop)
+    await dispatcher.run()
+
+
+def main():
+    """Run the webhook dispatcher until SIGINT/SIGTERM"""
+    setup_logging()
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,24 @@
 """
 Webhook service
-Handles webhook event dispatching
+Queues webhook events for delivery
+
+Events are written to the webhook_deliveries outbox in the caller's
+request; app.core.webhook_dispatcher delivers them from a separate worker,
+so slow receivers never hold up API workers.
 """
 
 import hashlib
 import hmac
-import json
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any, Dict
 
-import httpx
+from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.webhook import Webhook
+from app.models.webhook_delivery import WebhookDelivery
 
 logger = logging.getLogger(__name__)
 
@@ -23,60 +28,47 @@ def generate_webhook_signature(payload: str, secret: str) -> str:
     return hmac.new(secret.encode(), payload.encode(), hashlib.sha256).hexdigest()
 
 
-async def dispatch_webhook(webhook: Webhook, event_data: Dict[str, Any]) -> bool:
-    """
-    Dispatch a webhook event
-
-    Args:
-        webhook: Webhook model instance
-        event_data: Event data to send
-
-    Returns:
-        True if successful, False otherwise
-    """
-    payload = json.dumps(event_data)
-    signature = generate_webhook_signature(payload, webhook.secret)
-
-    headers = {
-        "Content-Type": "application/json",
-        "X-Webhook-Signature": signature,
-        "X-Webhook-Timestamp": datetime.utcnow().isoformat(),
-        "X-Webhook-Id": str(webhook.id),
+def build_event_payload(event_type: str, model_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Event body as posted to receivers"""
+    return {
+        "event_type": event_type,
+        "timestamp": datetime.utcnow().isoformat(),
+        "model_id": model_id,
+        "data": data,
     }
 
-    retry_count = int(webhook.retry_count)
-    timeout = int(webhook.timeout_seconds)
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        for attempt in range(retry_count):
-            try:
-                response = await client.post(
-                    str(webhook.url), content=payload, headers=headers
-                )
+def enqueue_delivery(
+    db: Session, webhook: Webhook, event_payload: Dict[str, Any], flush: bool = False
+) -> WebhookDelivery:
+    """
+    Queue an event for one webhook (flushed with the caller's transaction)
 
-                if response.status_code < 500:  # Success or client error
-                    logger.info(
-                        f"Webhook {webhook.id} dispatched successfully. "
-                        f"Status: {response.status_code}"
-                    )
-                    return True
+    Events for batched webhooks become due when their batch window ends;
+    the dispatcher sends them earlier once a full batch is waiting.
 
-            except httpx.RequestError as e:
-                logger.warning(
-                    f"Webhook {webhook.id} dispatch failed on attempt {attempt + 1}/{retry_count}: {str(e)}"
-                )
-                if attempt < retry_count - 1:
-                    continue
+    Args:
+        db: Database session
+        webhook: Target webhook
+        event_payload: Event body (see build_event_payload)
+        flush: Send right away, together with any pending batch
 
-    logger.error(f"Webhook {webhook.id} dispatch failed after {retry_count} attempts")
-    return False
+    Returns:
+        The pending delivery
+    """
+    delivery = WebhookDelivery(webhook_id=webhook.id, payload=event_payload)
+    if webhook.is_batched and not flush:
+        window = webhook.batch_window_seconds or settings.WEBHOOK_DEFAULT_BATCH_WINDOW_SECONDS
+        delivery.next_attempt_at = func.now() + timedelta(seconds=window)
+    db.add(delivery)
+    return delivery
 
 
-async def trigger_webhooks(
+def trigger_webhooks(
     db: Session, event_type: str, model_id: str, user_id: str, data: Dict[str, Any]
 ):
     """
-    Trigger all relevant webhooks for an event
+    Queue an event for all relevant webhooks
 
     Args:
         db: Database session
@@ -86,45 +78,29 @@ async def trigger_webhooks(
         data: Event-specific data
     """
     try:
-        # Find active webhooks for this user and event type
-        webhooks = (
+        # Subscribed, active webhooks for this user, event and model
+        # (events containment is served by the GIN index on webhooks.events)
+        relevant_webhooks = (
             db.query(Webhook)
-            .filter(Webhook.user_id == user_id, Webhook.is_active == True)
+            .filter(
+                Webhook.user_id == user_id,
+                Webhook.is_active == True,
+                Webhook.events.contains([event_type]),
+                or_(Webhook.model_id.is_(None), Webhook.model_id == model_id),
+            )
             .all()
         )
 
-        # Filter webhooks that listen to this event
-        relevant_webhooks = [
-            webhook
-            for webhook in webhooks
-            if event_type in webhook.events
-            and (webhook.model_id is None or str(webhook.model_id) == model_id)
-        ]
-
         if not relevant_webhooks:
             return
 
-        # Prepare event payload
-        event_payload = {
-            "event_type": event_type,
-            "timestamp": datetime.utcnow().isoformat(),
-            "model_id": model_id,
-            "data": data,
-        }
-
-        # Dispatch webhooks asynchronously
+        event_payload = build_event_payload(event_type, model_id, data)
         for webhook in relevant_webhooks:
-            try:
-                success = await dispatch_webhook(webhook, event_payload)
-
-                # Update last_triggered_at
-                if success:
-                    webhook.last_triggered_at = datetime.utcnow()
-                    db.commit()
+            enqueue_delivery(db, webhook, event_payload)
+        db.commit()
 
-            except Exception as e:
-                logger.error(f"Failed to dispatch webhook {webhook.id}: {str(e)}")
-                continue
+        logger.info(f"Queued {event_type} event for {len(relevant_webhooks)} webhooks")
 
     except Exception as e:
         logger.error(f"Failed to trigger webhooks: {str(e)}")
+        db.rollback()
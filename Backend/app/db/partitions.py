@@ -0,0 +1,231 @@
+"""
+Prediction log partition maintenance
+Creates upcoming monthly partitions and drops expired ones
+
+The predictions table is range-partitioned by created_at into one partition
+per calendar month (predictions_pYYYY_MM) plus a default partition that
+catches rows outside every range. Retention drops whole partitions instead
+of running large DELETEs; usage rollups are separate tables, so analytics
+outlive the raw rows.
+
+Run periodically (the partition-maintenance service in docker-compose.yml
+runs it daily, or schedule it from cron):
+    python -m app.db.partitions
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from app.core.config import settings
+from app.core.logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+PARENT_TABLE = "predictions"
+DEFAULT_PARTITION = f"{PARENT_TABLE}_default"
+
+_PARTITION_NAME = re.compile(rf"^{PARENT_TABLE}_p(\d{{4}})_(\d{{2}})$")
+
+
+def month_start(moment: datetime) -> datetime:
+    """First instant (UTC) of the month containing moment"""
+    moment = moment.astimezone(timezone.utc) if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(start: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months"""
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(start: datetime) -> str:
+    """Partition table name for the month beginning at start"""
+    return f"{PARENT_TABLE}_p{start.year:04d}_{start.month:02d}"
+
+
+def create_default_partition(connection: Connection):
+    """Create the catch-all partition for rows outside every monthly range"""
+    connection.execute(
+        text(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF {PARENT_TABLE} DEFAULT")
+    )
+
+
+def create_month_partition(connection: Connection, start: datetime) -> bool:
+    """
+    Create the partition for one month if it does not exist
+
+    Rows that already landed in the default partition for that month are
+    moved into the new partition before it is attached.
+
+    Args:
+        connection: Database connection (inside a transaction)
+        start: First instant of the month
+
+    Returns:
+        True if the partition was created
+    """
+    name = partition_name(start)
+    exists = connection.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+    if exists:
+        return False
+
+    bounds = {"start": start, "end": add_months(start, 1)}
+    connection.execute(
+        text(f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+    )
+    connection.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= :start AND created_at < :end
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved
+            """
+        ),
+        bounds,
+    )
+    # Bounds are literals in DDL, so format them from trusted datetimes
+    connection.execute(
+        text(
+            f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{bounds['start'].isoformat()}') TO ('{bounds['end'].isoformat()}')"
+        )
+    )
+    logger.info(f"Created partition {name}")
+    return True
+
+
+def ensure_partitions(
+    connection: Connection,
+    months_ahead: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> list[str]:
+    """
+    Make sure the current month and the next months_ahead months have partitions
+
+    Args:
+        connection: Database connection (inside a transaction)
+        months_ahead: Future months to prepare (default from settings)
+        now: Reference time (default: current time)
+
+    Returns:
+        Names of the partitions created
+    """
+    if months_ahead is None:
+        months_ahead = settings.PREDICTION_PARTITIONS_AHEAD
+    current = month_start(now or datetime.now(timezone.utc))
+
+    create_default_partition(connection)
+    created = []
+    for offset in range(months_ahead + 1):
+        start = add_months(current, offset)
+        if create_month_partition(connection, start):
+            created.append(partition_name(start))
+    return created
+
+
+def list_month_partitions(connection: Connection) -> dict[str, datetime]:
+    """
+    Monthly partitions currently attached to the predictions table
+
+    Returns:
+        Dict of partition name to month start
+    """
+    rows = connection.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :parent
+            """
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+
+    partitions = {}
+    for name in rows:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[name] = datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+    return partitions
+
+
+def drop_expired_partitions(
+    connection: Connection,
+    retention_days: Optional[int] = None,
+    now: Optional[datetime] = None,
+) -> list[str]:
+    """
+    Drop monthly partitions whose whole range is older than the retention window
+
+    Expired rows stranded in the default partition are deleted as well.
+
+    Args:
+        connection: Database connection (inside a transaction)
+        retention_days: Days of predictions to keep (default from settings, 0 keeps all)
+        now: Reference time (default: current time)
+
+    Returns:
+        Names of the partitions dropped
+    """
+    if retention_days is None:
+        retention_days = settings.PREDICTION_RETENTION_DAYS
+    if retention_days <= 0:
+        return []
+
+    cutoff = (now or datetime.now(timezone.utc)) - timedelta(days=retention_days)
+
+    dropped = []
+    for name, start in sorted(list_month_partitions(connection).items()):
+        if add_months(start, 1) <= cutoff:
+            connection.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+            logger.info(f"Dropped expired partition {name}")
+
+    connection.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+        {"cutoff": cutoff},
+    )
+    return dropped
+
+
+def run_maintenance(connection: Connection, now: Optional[datetime] = None) -> dict[str, list[str]]:
+    """
+    Create upcoming partitions and drop expired ones
+
+    Args:
+        connection: Database connection (inside a transaction)
+        now: Reference time (default: current time)
+
+    Returns:
+        Dict with the "created" and "dropped" partition names
+    """
+    return {
+        "created": ensure_partitions(connection, now=now),
+        "dropped": drop_expired_partitions(connection, now=now),
+    }
+
+
+def main():
+    """Run partition maintenance against the configured database"""
+    from app.db.session import engine
+
+    setup_logging()
+    with engine.begin() as connection:
+        result = run_maintenance(connection)
+    logger.info(
+        f"Partition maintenance done: created={result['created']} dropped={result['dropped']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -94,12 +94,13 @@ app.openapi = lambda: get_openapi_schema(app)
 
 # Include routers
 app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
+# Before models so /models/shared-with-me is not taken for a model ID
+app.include_router(model_shares.router, prefix=settings.API_V1_PREFIX)
 app.include_router(models.router, prefix=settings.API_V1_PREFIX)
 app.include_router(predictions.router, prefix=settings.API_V1_PREFIX)
 app.include_router(users.router, prefix=settings.API_V1_PREFIX)
 app.include_router(health.router, prefix=settings.API_V1_PREFIX)
 app.include_router(api_keys.router, prefix=settings.API_V1_PREFIX)
-app.include_router(model_shares.router, prefix=settings.API_V1_PREFIX)
 app.include_router(webhooks.router, prefix=settings.API_V1_PREFIX)
 
 
@@ -4,9 +4,12 @@
 # and to make them available when importing from app.models
 from app.models.api_key import APIKey
 from app.models.model import Model
+from app.models.model_alias import ModelAlias
 from app.models.model_share import ModelShare
 from app.models.prediction import Prediction
+from app.models.usage_rollup import ModelLatencyBin, ModelStats, ModelUsageRollup
 from app.models.user import User
 from app.models.webhook import Webhook
+from app.models.webhook_delivery import WebhookDelivery
 
-__all__ = ["User", "Model", "Prediction", "APIKey", "ModelShare", "Webhook"]
+__all__ = ["User", "Model", "Prediction", "APIKey", "ModelShare", "Webhook", "ModelUsageRollup", "ModelLatencyBin", "ModelStats", "WebhookDelivery", "ModelAlias"]
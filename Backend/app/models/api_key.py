@@ -5,7 +5,7 @@ Alternative authentication method for programmatic access
 
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -19,14 +19,13 @@ class APIKey(Base):
     __tablename__ = "api_keys"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # Foreign key to user
     user_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Key information
@@ -46,5 +45,10 @@ class APIKey(Base):
     # Relationships
     user = relationship("User", back_populates="api_keys")
 
+    __table_args__ = (
+        # GET /api-keys keyset pagination
+        Index("ix_api_keys_user_created", "user_id", "created_at", "id"),
+    )
+
     def __repr__(self) -> str:
         return f"<APIKey(id={self.id}, name={self.name})>"
@@ -5,8 +5,8 @@ Represents ML model metadata and versioning
 
 import uuid
 
-from sqlalchemy import (BigInteger, Column, DateTime, ForeignKey, Integer,
-                        String, Text, UniqueConstraint)
+from sqlalchemy import (BigInteger, Column, DateTime, ForeignKey, Index,
+                        Integer, String, Text, UniqueConstraint)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -20,14 +20,13 @@ class Model(Base):
     __tablename__ = "models"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # Foreign key to user
     user_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Model information
@@ -62,11 +61,14 @@ class Model(Base):
     user = relationship("User", back_populates="models")
     predictions = relationship("Prediction", back_populates="model")
 
-    # Constraints
+    # Constraints and indexes
     __table_args__ = (
+        # Also serves the latest-version lookup on upload (user_id, name, version desc)
         UniqueConstraint(
             "user_id", "name", "version", name="unique_user_model_version"
         ),
+        # Model listing: user's models newest first
+        Index("ix_models_user_created", "user_id", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
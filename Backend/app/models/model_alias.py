@@ -0,0 +1,44 @@
+"""
+Model alias database model
+Named pointers (latest, stable, canary, ...) to versions of a model family
+"""
+
+from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class ModelAlias(Base):
+    """One alias of a model family (a user's models sharing a name)"""
+
+    __tablename__ = "model_aliases"
+
+    # Composite primary key: one row per family and alias
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    name = Column(String(255), primary_key=True)  # Model family name
+    alias = Column(String(50), primary_key=True)
+
+    # Version the alias points at
+    model_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("models.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # Relationships
+    model = relationship("Model")
+
+    def __repr__(self) -> str:
+        return f"<ModelAlias(name={self.name}, alias={self.alias}, model_id={self.model_id})>"
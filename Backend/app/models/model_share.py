@@ -6,7 +6,7 @@ Handles sharing models between users
 import enum
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -28,14 +28,13 @@ class ModelShare(Base):
     __tablename__ = "model_shares"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # Foreign keys
     model_id = Column(
         UUID(as_uuid=True),
         ForeignKey("models.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     owner_id = Column(
         UUID(as_uuid=True),
@@ -47,7 +46,6 @@ class ModelShare(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
     # Permission level
@@ -56,7 +54,7 @@ class ModelShare(Base):
     )
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
@@ -67,6 +65,9 @@ class ModelShare(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint("model_id", "shared_with_user_id", name="unique_model_share"),
+        # Keyset pagination of a model's shares and of "shared with me"
+        Index("ix_model_shares_model_created", "model_id", "created_at", "id"),
+        Index("ix_model_shares_recipient_created", "shared_with_user_id", "created_at", "id"),
     )
 
     def __repr__(self) -> str:
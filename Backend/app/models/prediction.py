@@ -1,55 +1,67 @@
 """
 Prediction database model
 Logs all prediction requests for analytics and debugging
+
+The table is range-partitioned by month on created_at (see app.db.partitions)
 """
 
 import uuid
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (Column, DateTime, ForeignKey, Index, Integer, String,
+                        Text, event)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.db.base import Base
+from app.db.partitions import ensure_partitions
 
 
 class Prediction(Base):
     """Prediction log model"""
 
     __tablename__ = "predictions"
+    __table_args__ = (
+        # History: user's predictions (optionally for one model) newest first
+        Index("ix_predictions_user_created", "user_id", "created_at", "id"),
+        Index("ix_predictions_user_model_created", "user_id", "model_id", "created_at", "id"),
+        # Analytics: a model's predictions by status (e.g. recent errors)
+        Index("ix_predictions_model_status_created", "model_id", "status", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    # Primary key (must include the partition key)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # Foreign keys
     model_id = Column(
         UUID(as_uuid=True),
         ForeignKey("models.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     user_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
 
-    # Prediction data (stored as JSON)
-    input_data = Column(JSONB, nullable=False)
+    # Prediction data (stored as JSON; trimmed or omitted per the model's logging policy)
+    input_data = Column(JSONB, nullable=True)
     output_data = Column(JSONB, nullable=True)
 
     # Performance metrics
     inference_time_ms = Column(Integer, nullable=True)  # Inference time in milliseconds
 
     # Status
-    status = Column(
-        String(20), default="success", index=True
-    )  # 'success', 'failed', 'pending'
+    status = Column(String(20), default="success")  # 'success', 'failed', 'pending'
     error_message = Column(Text, nullable=True)
 
     # Timestamp
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+    )
 
     # Relationships
     model = relationship("Model", back_populates="predictions")
@@ -57,3 +69,9 @@ class Prediction(Base):
 
     def __repr__(self) -> str:
         return f"<Prediction(id={self.id}, model_id={self.model_id}, status={self.status})>"
+
+
+@event.listens_for(Prediction.__table__, "after_create")
+def _create_partitions(target, connection, **kw):
+    """Create the default and upcoming monthly partitions with the table"""
+    ensure_partitions(connection)
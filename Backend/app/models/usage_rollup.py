@@ -0,0 +1,89 @@
+"""
+Usage rollup database model
+Per-model prediction aggregates maintained by the log path
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class ModelUsageRollup(Base):
+    """Hourly prediction counts and latency aggregates for a model"""
+
+    __tablename__ = "model_usage_rollups"
+
+    # Composite primary key: one row per model per hour
+    model_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("models.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket = Column(DateTime(timezone=True), primary_key=True)  # Start of the hour
+
+    # Counts
+    prediction_count = Column(BigInteger, nullable=False, default=0)
+    success_count = Column(BigInteger, nullable=False, default=0)
+    failure_count = Column(BigInteger, nullable=False, default=0)
+
+    # Latency of successful predictions (sum/count give the average)
+    latency_count = Column(BigInteger, nullable=False, default=0)
+    latency_sum_ms = Column(BigInteger, nullable=False, default=0)
+    latency_min_ms = Column(Integer, nullable=True)
+    latency_max_ms = Column(Integer, nullable=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ModelUsageRollup(model_id={self.model_id}, bucket={self.bucket}, "
+            f"count={self.prediction_count})>"
+        )
+
+
+class ModelLatencyBin(Base):
+    """Daily latency sketch bin counts for a model (see app.core.latency_sketch)"""
+
+    __tablename__ = "model_latency_bins"
+
+    # Composite primary key: one row per model per day per sketch bin
+    model_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("models.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    bucket = Column(DateTime(timezone=True), primary_key=True)  # Start of the day
+    bin = Column(Integer, primary_key=True)
+
+    count = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<ModelLatencyBin(model_id={self.model_id}, bucket={self.bucket}, "
+            f"bin={self.bin}, count={self.count})>"
+        )
+
+
+class ModelStats(Base):
+    """All-time prediction counters for a model, read by the model endpoints"""
+
+    __tablename__ = "model_stats"
+
+    model_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("models.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    # Counts
+    prediction_count = Column(BigInteger, nullable=False, default=0)
+    success_count = Column(BigInteger, nullable=False, default=0)
+    failure_count = Column(BigInteger, nullable=False, default=0)
+
+    # Latency of successful predictions (sum/count give the average)
+    latency_count = Column(BigInteger, nullable=False, default=0)
+    latency_sum_ms = Column(BigInteger, nullable=False, default=0)
+
+    last_prediction_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ModelStats(model_id={self.model_id}, count={self.prediction_count})>"
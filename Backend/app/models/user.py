@@ -19,7 +19,7 @@ class User(Base):
     __tablename__ = "users"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # User information
     email = Column(String(255), unique=True, nullable=False, index=True)
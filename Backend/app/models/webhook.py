@@ -5,7 +5,8 @@ Stores webhook configurations for event notifications
 
 import uuid
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import (Boolean, Column, DateTime, ForeignKey, Index, Integer,
+                        String, Text)
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -19,14 +20,13 @@ class Webhook(Base):
     __tablename__ = "webhooks"
 
     # Primary key
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # Foreign key
     user_id = Column(
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     model_id = Column(
         UUID(as_uuid=True),
@@ -56,8 +56,13 @@ class Webhook(Base):
     )  # How many times to retry on failure
     timeout_seconds = Column(String(10), default="30", nullable=False)
 
+    # Batching: post up to batch_size events as one array, waiting at most
+    # batch_window_seconds for a batch to fill (NULL or 1 = one POST per event)
+    batch_size = Column(Integer, nullable=True)
+    batch_window_seconds = Column(Integer, nullable=True)
+
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     last_triggered_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -65,5 +70,22 @@ class Webhook(Base):
     user = relationship("User", back_populates="webhooks")
     model = relationship("Model")
 
+    __table_args__ = (
+        # GET /webhooks keyset pagination
+        Index("ix_webhooks_user_created", "user_id", "created_at", "id"),
+        # Subscription lookup: events @> '["<event>"]'
+        Index(
+            "ix_webhooks_events",
+            "events",
+            postgresql_using="gin",
+            postgresql_ops={"events": "jsonb_path_ops"},
+        ),
+    )
+
+    @property
+    def is_batched(self) -> bool:
+        """Whether events are delivered in batches"""
+        return (self.batch_size or 1) > 1
+
     def __repr__(self) -> str:
         return f"<Webhook(id={self.id}, url={self.url}, events={self.events})>"
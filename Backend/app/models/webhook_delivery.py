@@ -0,0 +1,64 @@
+"""
+Webhook delivery model
+Durable outbox of webhook events waiting to be delivered
+"""
+
+import uuid
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func, text
+
+from app.db.base import Base
+
+
+class WebhookDelivery(Base):
+    """One event queued for one webhook (see app.core.webhook_dispatcher)"""
+
+    __tablename__ = "webhook_deliveries"
+
+    # Primary key
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    # Foreign key
+    webhook_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("webhooks.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Event payload as posted to the receiver
+    payload = Column(JSONB, nullable=False)
+
+    # Delivery state
+    status = Column(
+        String(20), default="pending", nullable=False
+    )  # 'pending', 'delivered', 'failed'
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    response_status = Column(Integer, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    webhook = relationship("Webhook")
+
+    __table_args__ = (
+        # Workers claim due pending deliveries in next_attempt_at order
+        Index(
+            "ix_webhook_deliveries_pending",
+            "next_attempt_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        Index("ix_webhook_deliveries_webhook_created", "webhook_id", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<WebhookDelivery(id={self.id}, webhook_id={self.webhook_id}, "
+            f"status={self.status}, attempts={self.attempts})>"
+        )
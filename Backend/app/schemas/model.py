@@ -21,11 +21,41 @@ class ModelCreate(BaseModel):
     )
 
 
+class CachePolicyUpdate(BaseModel):
+    """Schema for a model's prediction cache policy (omitted fields keep their value)"""
+
+    enabled: Optional[bool] = Field(None, description="Cache predictions for this model")
+    ttl: Optional[int] = Field(
+        None, ge=1, le=30 * 24 * 3600, description="Cache TTL in seconds (max 30 days)"
+    )
+    max_entry_bytes: Optional[int] = Field(
+        None, ge=1, le=1024 * 1024, description="Largest cached result in bytes (max 1MB)"
+    )
+    float_precision: Optional[int] = Field(
+        None, ge=0, le=15, description="Round input floats to N decimals when building cache keys"
+    )
+
+
+class LoggingPolicyUpdate(BaseModel):
+    """Schema for a model's prediction logging policy (omitted fields keep their value)"""
+
+    sample_rate: Optional[float] = Field(
+        None, ge=0.0, le=1.0, description="Fraction of successful predictions to log"
+    )
+    payload: Optional[str] = Field(
+        None,
+        pattern="^(full|hash|none)$",
+        description="Store input/output in full, as a hash, or not at all",
+    )
+
+
 class ModelUpdate(BaseModel):
     """Schema for updating model metadata"""
 
     description: Optional[str] = None
     status: Optional[str] = Field(None, pattern="^(active|deprecated|archived)$")
+    cache_policy: Optional[CachePolicyUpdate] = None
+    logging_policy: Optional[LoggingPolicyUpdate] = None
 
 
 # Response Schemas
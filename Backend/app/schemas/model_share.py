@@ -4,6 +4,7 @@ Model sharing schemas
 from pydantic import BaseModel, Field, HttpUrl, ConfigDict
 from typing import Optional
 from datetime import datetime
+from uuid import UUID
 from enum import Enum
 
 
@@ -29,8 +30,8 @@ class ModelShareResponse(BaseModel):
     """Model share response"""
     model_config = ConfigDict(from_attributes=True)
     
-    id: str = Field(..., description="Share ID")
-    model_id: str = Field(..., description="Model ID")
+    id: UUID = Field(..., description="Share ID")
+    model_id: UUID = Field(..., description="Model ID")
     permission: SharePermission = Field(..., description="Permission level")
     created_at: datetime = Field(..., description="Creation timestamp")
 
@@ -3,7 +3,7 @@ Prediction schemas for request and response validation
 """
 
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -33,13 +33,16 @@ class BatchPredictionInput(BaseModel):
 
 
 class PredictionResult(BaseModel):
-    """Schema for prediction result"""
+    """Schema for prediction result (lists with one entry per row for batches)"""
 
     prediction: Any = Field(..., description="Model prediction output")
-    confidence: Optional[float] = Field(None, description="Prediction confidence score")
-    probabilities: Optional[List[float]] = Field(
+    confidence: Optional[Union[float, List[float]]] = Field(
+        None, description="Prediction confidence score"
+    )
+    probabilities: Optional[Union[List[float], List[List[float]]]] = Field(
         None, description="Class probabilities"
     )
+    batch_size: Optional[int] = Field(None, description="Number of rows in a batch input")
 
 
 class PredictionMetadata(BaseModel):
@@ -17,6 +17,12 @@ class WebhookCreate(BaseModel):
     )
     retry_count: Optional[int] = Field(default=3, description="Number of retries")
     timeout_seconds: Optional[int] = Field(default=30, description="Request timeout")
+    batch_size: Optional[int] = Field(
+        None, ge=1, le=1000, description="Post up to N events as one array (1 = no batching)"
+    )
+    batch_window_seconds: Optional[int] = Field(
+        None, ge=1, le=3600, description="Longest wait for a batch to fill"
+    )
 
 
 class WebhookUpdate(BaseModel):
@@ -27,6 +33,12 @@ class WebhookUpdate(BaseModel):
     is_active: Optional[bool] = Field(None, description="Enable/disable webhook")
     retry_count: Optional[int] = Field(None, description="Number of retries")
     timeout_seconds: Optional[int] = Field(None, description="Request timeout")
+    batch_size: Optional[int] = Field(
+        None, ge=1, le=1000, description="Post up to N events as one array (1 = no batching)"
+    )
+    batch_window_seconds: Optional[int] = Field(
+        None, ge=1, le=3600, description="Longest wait for a batch to fill"
+    )
 
 
 class WebhookResponse(BaseModel):
@@ -41,6 +53,8 @@ class WebhookResponse(BaseModel):
     is_active: bool = Field(..., description="Active status")
     retry_count: str = Field(..., description="Retry count")
     timeout_seconds: str = Field(..., description="Timeout in seconds")
+    batch_size: Optional[int] = Field(None, description="Events per batch")
+    batch_window_seconds: Optional[int] = Field(None, description="Batch window in seconds")
     created_at: datetime = Field(..., description="Created at")
     last_triggered_at: Optional[datetime] = Field(None, description="Last triggered time")
 
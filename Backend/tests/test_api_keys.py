@@ -65,6 +65,44 @@ class TestAPIKeyListing:
         assert "prefix" in data["data"][0]
 
 
+    def test_list_api_keys_keyset_pagination(self, client: TestClient, auth_headers: dict):
+        """Test following cursors through the list with each count mode"""
+        for i in range(3):
+            client.post("/api/v1/api-keys", headers=auth_headers, json={"name": f"Key {i}"})
+
+        response = client.get(
+            "/api/v1/api-keys", headers=auth_headers, params={"per_page": 2}
+        )
+        first = response.json()
+        assert len(first["data"]) == 2
+        assert first["pagination"]["total_items"] == 3
+        assert first["pagination"]["has_more"] is True
+
+        response = client.get(
+            "/api/v1/api-keys",
+            headers=auth_headers,
+            params={"per_page": 2, "cursor": first["pagination"]["next_cursor"]},
+        )
+        second = response.json()
+        assert len(second["data"]) == 1
+        assert second["pagination"]["total_items"] is None
+        assert second["pagination"]["has_more"] is False
+
+        ids = {key["id"] for key in first["data"] + second["data"]}
+        assert len(ids) == 3
+
+        # Small estimates fall back to an exact count
+        response = client.get(
+            "/api/v1/api-keys", headers=auth_headers, params={"count_mode": "estimate"}
+        )
+        assert response.json()["pagination"]["total_items"] == 3
+
+        response = client.get(
+            "/api/v1/api-keys", headers=auth_headers, params={"count_mode": "bogus"}
+        )
+        assert response.status_code == 422
+
+
 class TestAPIKeyAuthentication:
     """Test authentication using API keys"""
 
@@ -0,0 +1,364 @@
+"""Tests for the prediction cache machinery"""
+
+import asyncio
+import time
+import zlib
+
+import fakeredis
+import numpy as np
+import pytest
+
+from app.core.caching import (
+    FORMAT_RAW,
+    FORMAT_ZLIB,
+    MAX_CACHED_PREDICTIONS_PER_MODEL,
+    LocalCache,
+    PredictionCache,
+    ValueCodec,
+)
+from app.core.fingerprint import InputFingerprinter
+from app.core.invalidation import InvalidationBus
+from app.core.serialization import OrjsonSerializer
+
+MODEL_ID = "model-1"
+
+
+def make_cache(server=None) -> PredictionCache:
+    """Prediction cache on an in-memory Redis (pass a server to share it between workers)"""
+    client = fakeredis.FakeRedis(server=server or fakeredis.FakeServer())
+    return PredictionCache(client, bus=InvalidationBus())
+
+
+class Counter:
+    """Compute function that counts its calls"""
+
+    def __init__(self, result=None, delay: float = 0.0):
+        self.calls = 0
+        self.result = result or {"prediction": [1]}
+        self.delay = delay
+
+    async def __call__(self) -> dict:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.result
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Test that the local cache drops the least recently used entry when full"""
+    local = LocalCache(max_entries=2, ttl=60)
+    local.set("a", 1, 60)
+    local.set("b", 2, 60)
+    assert local.get("a") == 1  # "b" is now least recently used
+
+    local.set("c", 3, 60)
+
+    assert local.get("b") is None
+    assert local.get("a") == 1
+    assert local.get("c") == 3
+
+
+def test_local_cache_expires_entries():
+    """Test that entries expire after the shorter of their TTL and the cache TTL"""
+    local = LocalCache(max_entries=10, ttl=0.05)
+    local.set("a", 1, 60)
+    local.set("b", 2, 0)  # Not stored
+
+    assert local.get("a") == 1
+    assert local.get("b") is None
+    time.sleep(0.06)
+    assert local.get("a") is None
+
+
+def test_codec_compressed_value_round_trips():
+    """Test that large payloads are compressed and decode to the original bytes"""
+    codec = ValueCodec(codec="zlib", threshold=64)
+    payload = b'{"prediction":[' + b"0.5," * 100 + b"0.5]}"
+
+    encoded = codec.encode(payload)
+
+    assert encoded[:1] == FORMAT_ZLIB
+    assert len(encoded) < len(payload)
+    assert codec.decode(encoded) == payload
+
+
+def test_codec_small_value_is_stored_raw():
+    """Test that payloads below the threshold only get the format header"""
+    codec = ValueCodec(codec="zlib", threshold=64)
+
+    encoded = codec.encode(b'{"a":1}')
+
+    assert encoded == FORMAT_RAW + b'{"a":1}'
+    assert codec.decode(encoded) == b'{"a":1}'
+
+
+def test_codec_decodes_values_without_header():
+    """Test that values written before format headers still decode"""
+    codec = ValueCodec(codec="zstd", threshold=64)
+
+    assert codec.decode(b'{"prediction":[1,2]}') == b'{"prediction":[1,2]}'
+    assert codec.decode(FORMAT_ZLIB + zlib.compress(b"[1]")) == b"[1]"
+
+
+def test_fingerprint_ignores_key_order():
+    """Test that equal dict inputs fingerprint alike regardless of key order"""
+    fingerprinter = InputFingerprinter()
+
+    assert fingerprinter.fingerprint({"a": 1, "b": 2}) == fingerprinter.fingerprint({"b": 2, "a": 1})
+    assert fingerprinter.fingerprint({"a": 1}) != fingerprinter.fingerprint({"a": 2})
+
+
+def test_fingerprint_arrays_include_dtype_and_shape():
+    """Test that arrays hash by content, dtype and shape"""
+    fingerprinter = InputFingerprinter()
+    array = np.arange(6, dtype=np.float64)
+
+    assert fingerprinter.fingerprint(array) == fingerprinter.fingerprint(array.copy())
+    assert fingerprinter.fingerprint(array) != fingerprinter.fingerprint(array.astype(np.float32))
+    assert fingerprinter.fingerprint(array) != fingerprinter.fingerprint(array.reshape(2, 3))
+
+
+def test_fingerprint_float_precision():
+    """Test that rounding makes near-identical inputs share a fingerprint"""
+    fingerprinter = InputFingerprinter(float_precision=3)
+
+    assert fingerprinter.fingerprint([1.00001, 2.0]) == fingerprinter.fingerprint([1.0, 2.00004])
+    assert fingerprinter.fingerprint([1.001]) != fingerprinter.fingerprint([1.002])
+
+
+def test_orjson_serializer_handles_numpy_and_sorts_keys():
+    """Test that numpy values serialize natively and sort_keys is canonical"""
+    serializer = OrjsonSerializer()
+
+    encoded = serializer.dumps({"b": np.array([1.5, 2.5]), "a": np.int64(3)}, sort_keys=True)
+
+    assert encoded == b'{"a":3,"b":[1.5,2.5]}'
+    assert serializer.loads(encoded) == {"a": 3, "b": [1.5, 2.5]}
+
+
+async def test_generation_bump_makes_old_keys_unreachable():
+    """Test that invalidating a model hides its entries without deleting them"""
+    cache = make_cache()
+    await cache.set_prediction(MODEL_ID, {"x": 1}, {"prediction": [1]})
+    old_key = cache._key_for(MODEL_ID, {"x": 1}, None, cache._resolve_policy(None, None))
+
+    generation = await cache.invalidate_model_cache(MODEL_ID)
+
+    assert generation == 1
+    assert await cache.get_prediction(MODEL_ID, {"x": 1}) is None
+    assert cache.redis.exists(old_key)  # Left to age out by TTL
+    new_key = cache._key_for(MODEL_ID, {"x": 1}, None, cache._resolve_policy(None, None))
+    assert new_key != old_key
+
+
+async def test_model_index_is_trimmed_to_capacity():
+    """Test that the oldest entries are evicted beyond MAX_CACHED_PREDICTIONS_PER_MODEL"""
+    cache = make_cache()
+    extra = 5
+    for i in range(MAX_CACHED_PREDICTIONS_PER_MODEL + extra):
+        await cache.set_prediction(MODEL_ID, {"x": i}, {"prediction": [i]})
+
+    index_key = cache._index_key(MODEL_ID)
+    assert cache.redis.zcard(index_key) == MAX_CACHED_PREDICTIONS_PER_MODEL
+    assert cache.stats.evicted == extra
+
+    policy = cache._resolve_policy(None, None)
+    oldest = cache._key_for(MODEL_ID, {"x": 0}, None, policy)
+    newest = cache._key_for(MODEL_ID, {"x": MAX_CACHED_PREDICTIONS_PER_MODEL + extra - 1}, None, policy)
+    assert not cache.redis.exists(oldest)
+    assert cache.redis.exists(newest)
+
+
+async def test_large_value_round_trips_compressed():
+    """Test that a compressed cache entry reads back as the original result"""
+    cache = make_cache()
+    result = {"prediction": list(range(2000))}
+    await cache.set_prediction(MODEL_ID, {"x": 1}, result)
+    cache.local.clear()
+
+    assert cache.stats.compressed == 1
+    assert await cache.get_prediction(MODEL_ID, {"x": 1}) == result
+
+
+async def test_get_many_and_set_many():
+    """Test that batch writes are readable by batch and single lookups"""
+    cache = make_cache()
+    inputs = [{"x": i} for i in range(3)]
+
+    stored = await cache.set_many(MODEL_ID, inputs[:2], [{"prediction": [0]}, {"prediction": [1]}])
+    cache.local.clear()
+
+    assert stored == 2
+    assert await cache.get_many(MODEL_ID, inputs) == [{"prediction": [0]}, {"prediction": [1]}, None]
+    assert await cache.get_prediction(MODEL_ID, {"x": 1}) == {"prediction": [1]}
+
+
+async def test_concurrent_misses_compute_once():
+    """Test that concurrent get_or_compute calls for one key share a computation"""
+    cache = make_cache()
+    compute = Counter(delay=0.05)
+
+    results = await asyncio.gather(
+        *(cache.get_or_compute(MODEL_ID, {"x": 1}, compute) for _ in range(10))
+    )
+
+    assert compute.calls == 1
+    assert all(result == compute.result for result, _ in results)
+    assert [from_cache for _, from_cache in results].count(False) == 1  # Only the leader
+    assert cache.stats.coalesced == 9
+
+
+async def test_stale_entry_served_while_one_refresh_runs():
+    """Test that a stale entry is returned at once and refreshed in the background once"""
+    cache = make_cache()
+    cache.stale_seconds = 60
+    await cache.set_prediction(MODEL_ID, {"x": 1}, {"prediction": ["old"]})
+
+    # Leave less than the stale window: the entry is now stale
+    cache_key = cache._key_for(MODEL_ID, {"x": 1}, None, cache._resolve_policy(None, None))
+    cache.redis.pexpire(cache_key, 30_000)
+    cache.local.clear()
+
+    compute = Counter(result={"prediction": ["new"]}, delay=0.05)
+    results = await asyncio.gather(
+        *(cache.get_or_compute(MODEL_ID, {"x": 1}, compute) for _ in range(5))
+    )
+
+    assert results == [({"prediction": ["old"]}, True)] * 5
+    assert cache.stats.stale_served == 5
+    assert len(cache._refresh_tasks) == 1
+    await asyncio.gather(*cache._refresh_tasks.values())
+    await asyncio.gather(*cache._write_tasks)
+    assert compute.calls == 1
+    assert await cache.get_prediction(MODEL_ID, {"x": 1}) == {"prediction": ["new"]}
+
+
+async def test_waiters_report_served_from_cache_alike():
+    """Test that in-process and cross-worker waiters both report a shared result as cached"""
+    server = fakeredis.FakeServer()
+    holder, other_worker = make_cache(server), make_cache(server)
+    compute = Counter(delay=0.1)
+    other_compute = Counter()
+
+    results = await asyncio.gather(
+        holder.get_or_compute(MODEL_ID, {"x": 1}, compute),
+        holder.get_or_compute(MODEL_ID, {"x": 1}, compute),
+        other_worker.get_or_compute(MODEL_ID, {"x": 1}, other_compute),
+    )
+
+    assert (compute.calls, other_compute.calls) == (1, 0)
+    assert results == [(compute.result, False), (compute.result, True), (compute.result, True)]
+
+
+async def test_result_is_returned_before_it_is_cached():
+    """Test that the leader returns first and writes the entry, then releases the lock"""
+    pytest.importorskip("lupa")
+    cache = make_cache()
+    compute = Counter()
+
+    result, from_cache = await cache.get_or_compute(MODEL_ID, {"x": 1}, compute)
+
+    cache_key = cache._key_for(MODEL_ID, {"x": 1}, None, cache._resolve_policy(None, None))
+    assert (result, from_cache) == (compute.result, False)
+    assert not cache.redis.exists(cache_key)
+    assert cache.redis.exists(f"lock:{cache_key}")  # Held until the write is done
+
+    await asyncio.gather(*cache._write_tasks)
+
+    assert cache.redis.exists(cache_key)
+    assert not cache.redis.exists(f"lock:{cache_key}")
+    assert not cache._write_tasks
+
+
+async def test_lock_waiter_stops_when_holder_fails():
+    """Test that a worker waiting on another worker's lock computes once the lock is released"""
+    pytest.importorskip("lupa")  # fakeredis needs lupa for the release script
+    server = fakeredis.FakeServer()
+    holder, waiter = make_cache(server), make_cache(server)
+
+    async def failing():
+        await asyncio.sleep(0.1)
+        raise RuntimeError("model failed")
+
+    compute = Counter()
+    started = time.monotonic()
+    failed, (result, from_cache) = await asyncio.gather(
+        holder.get_or_compute(MODEL_ID, {"x": 1}, failing),
+        waiter.get_or_compute(MODEL_ID, {"x": 1}, compute),
+        return_exceptions=True,
+    )
+
+    assert isinstance(failed, RuntimeError)
+    assert (result, from_cache) == (compute.result, False)
+    assert time.monotonic() - started < 1  # Well under CACHE_LOCK_TIMEOUT_MS
+    assert waiter.stats.misses == 1  # Polling doesn't count misses
+
+
+async def test_lock_release_checks_ownership():
+    """Test that a holder whose lock was taken over doesn't release the new lock"""
+    pytest.importorskip("lupa")
+    cache = make_cache()
+    cache.redis.set("lock:k", b"new-holder")
+
+    cache._release_lock("lock:k", b"old-holder")
+    assert cache.redis.get("lock:k") == b"new-holder"
+
+    cache._release_lock("lock:k", b"new-holder")
+    assert not cache.redis.exists("lock:k")
+
+
+async def test_set_many_caps_batch_at_model_capacity():
+    """Test that a batch larger than the model's capacity writes only what fits"""
+    cache = make_cache()
+    count = MAX_CACHED_PREDICTIONS_PER_MODEL + 20
+    inputs = [{"x": i} for i in range(count)]
+
+    stored = await cache.set_many(MODEL_ID, inputs, [{"prediction": [i]} for i in range(count)])
+
+    assert stored == MAX_CACHED_PREDICTIONS_PER_MODEL
+    assert cache.redis.zcard(cache._index_key(MODEL_ID)) == MAX_CACHED_PREDICTIONS_PER_MODEL
+    assert cache.stats.evicted == 0
+    assert len(cache.redis.keys("pred:*")) == MAX_CACHED_PREDICTIONS_PER_MODEL
+
+
+async def test_result_computed_before_invalidation_is_not_served_after_it():
+    """Test that a miss is written under the generation it was looked up in"""
+    cache = make_cache()
+
+    async def compute_across_invalidation():
+        await cache.invalidate_model_cache(MODEL_ID)
+        return {"prediction": ["old model"]}
+
+    result, _ = await cache.get_or_compute(MODEL_ID, {"x": 1}, compute_across_invalidation)
+    await asyncio.gather(*cache._write_tasks)
+    cache.local.clear()
+
+    assert result == {"prediction": ["old model"]}
+    assert await cache.get_prediction(MODEL_ID, {"x": 1}) is None
+
+
+async def test_set_many_writes_under_lookup_keys():
+    """Test that batch misses are stored under the keys they were looked up with"""
+    cache = make_cache()
+    inputs = [{"x": 1}, {"x": 2}]
+    keys = cache.cache_keys(MODEL_ID, inputs)
+    assert await cache.get_many(MODEL_ID, inputs, keys=keys) == [None, None]
+
+    await cache.invalidate_model_cache(MODEL_ID)
+    await cache.set_many(MODEL_ID, inputs, [{"prediction": [1]}, {"prediction": [2]}], keys=keys)
+    cache.local.clear()
+
+    assert all(cache.redis.exists(key) for key in keys)
+    assert await cache.get_many(MODEL_ID, inputs) == [None, None]
+
+
+async def test_memory_usage_counts_indexed_predictions(monkeypatch):
+    """Test that prediction_cache_keys sums the per-model indexes"""
+    cache = make_cache()
+    monkeypatch.setattr(cache.redis, "info", lambda section: {}, raising=False)  # Not in fakeredis
+    await cache.set_many(MODEL_ID, [{"x": 1}, {"x": 2}], [{"prediction": [1]}, {"prediction": [2]}])
+    await cache.set_prediction("model-2", {"x": 1}, {"prediction": [1]})
+
+    memory = await cache.get_memory_usage()
+
+    assert memory["prediction_cache_keys"] == 3
+    assert memory["total_keys"] >= 3
@@ -0,0 +1,144 @@
+"""Query plan regression tests for hot endpoint queries"""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.api.pagination import Explain, encode_cursor, keyset_query
+from app.api.v1.api_keys import api_key_list_query
+from app.api.v1.model_shares import model_shares_query, shared_with_me_query
+from app.api.v1.models import latest_version_query, model_list_query, recent_errors_query
+from app.api.v1.predictions import prediction_history_query
+from app.api.v1.webhooks import webhook_list_query
+from app.models.api_key import APIKey
+from app.models.model import Model
+from app.models.model_share import ModelShare
+from app.models.prediction import Prediction
+from app.models.webhook import Webhook
+
+USER_ID = uuid.uuid4()
+MODEL_ID = uuid.uuid4()
+PER_PAGE = 20
+
+
+def page(query, created_at_column, id_column, cursor=None):
+    """A list query as paginate_keyset runs it"""
+    return keyset_query(query, created_at_column, id_column, PER_PAGE, cursor=cursor)
+
+
+# The endpoints' own query builders, as each endpoint pages them
+HOT_QUERIES = {
+    # GET /predict/history
+    "history": (
+        lambda db: page(prediction_history_query(db, USER_ID), Prediction.created_at, Prediction.id),
+        "ix_predictions_user_created",
+    ),
+    # GET /predict/history?model_id=...
+    "history_by_model": (
+        lambda db: page(
+            prediction_history_query(db, USER_ID, MODEL_ID), Prediction.created_at, Prediction.id
+        ),
+        "ix_predictions_user_model_created",
+    ),
+    # GET /predict/history?cursor=...
+    "history_after_cursor": (
+        lambda db: page(
+            prediction_history_query(db, USER_ID),
+            Prediction.created_at,
+            Prediction.id,
+            cursor=encode_cursor(datetime.now(timezone.utc), uuid.uuid4()),
+        ),
+        "ix_predictions_user_created",
+    ),
+    # GET /models/{id}/analytics recent errors
+    "recent_errors": (
+        lambda db: recent_errors_query(db, MODEL_ID),
+        "ix_predictions_model_status_created",
+    ),
+    # POST /models/upload latest version lookup
+    "latest_model_version": (
+        lambda db: latest_version_query(db, USER_ID, "model").limit(1),
+        "unique_user_model_version",
+    ),
+    # GET /models
+    "list_models": (
+        lambda db: page(model_list_query(db, USER_ID), Model.created_at, Model.id),
+        "ix_models_user_created",
+    ),
+    # GET /models/{id}/shares
+    "list_model_shares": (
+        lambda db: page(model_shares_query(db, MODEL_ID), ModelShare.created_at, ModelShare.id),
+        "ix_model_shares_model_created",
+    ),
+    # GET /models/shared-with-me
+    "shared_with_me": (
+        lambda db: page(shared_with_me_query(db, USER_ID), ModelShare.created_at, ModelShare.id),
+        "ix_model_shares_recipient_created",
+    ),
+    # GET /webhooks
+    "list_webhooks": (
+        lambda db: page(webhook_list_query(db, USER_ID), Webhook.created_at, Webhook.id),
+        "ix_webhooks_user_created",
+    ),
+    # GET /api-keys
+    "list_api_keys": (
+        lambda db: page(api_key_list_query(db, USER_ID), APIKey.created_at, APIKey.id),
+        "ix_api_keys_user_created",
+    ),
+}
+
+def explain(
+    db, query, disabled=("enable_seqscan", "enable_bitmapscan", "enable_sort")
+) -> str:
+    """
+    EXPLAIN a query with sequential scans, bitmap scans and sorts discouraged
+
+    Test tables are nearly empty, so without this the planner would pick
+    whatever is cheapest for a handful of rows. Discouraging the
+    alternatives leaves only an index that matches both the filter and
+    the ORDER BY.
+    """
+    for setting in disabled:
+        db.execute(text(f"SET LOCAL {setting} = off"))
+    rows = db.execute(Explain(query.statement))
+    return "\n".join(row[0] for row in rows)
+
+
+def index_names(db, index: str) -> set[str]:
+    """An index plus its per-partition children"""
+    children = db.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = CAST(:index AS regclass)
+            """
+        ),
+        {"index": index},
+    ).scalars()
+    return {index, *children}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(db, name):
+    """Test that each hot endpoint query is served by its intended index"""
+    build_query, index = HOT_QUERIES[name]
+
+    plan = explain(db, build_query(db))
+
+    assert "Seq Scan" not in plan, plan
+    assert any(f" {candidate} " in f"{line} " for line in plan.splitlines()
+               for candidate in index_names(db, index)), plan
+
+
+def test_webhook_events_filter_uses_gin_index(db):
+    """Test that the events containment filter used by webhook fan-out is indexable"""
+    query = db.query(Webhook).filter(Webhook.events.contains(["error"]))
+
+    # GIN indexes are only read through bitmap scans
+    plan = explain(db, query, disabled=("enable_seqscan", "enable_indexscan"))
+
+    assert "ix_webhooks_events" in plan, plan
@@ -0,0 +1,165 @@
+"""Tests for webhook delivery"""
+
+import json
+from datetime import datetime, timezone
+
+import httpx
+from fastapi import status
+from sqlalchemy.orm import sessionmaker
+
+from app.core.webhook_dispatcher import WebhookDispatcher
+from app.core.webhook_service import generate_webhook_signature, trigger_webhooks
+from app.models.model import Model
+from app.models.webhook_delivery import WebhookDelivery
+
+
+def create_webhook(client, auth_headers, **fields):
+    """Create a webhook through the API and return its data (including the secret)"""
+    payload = {"url": "https://hooks.example.com/inferx", "events": ["prediction", "error"]}
+    payload.update(fields)
+    response = client.post("/api/v1/webhooks", headers=auth_headers, json=payload)
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["data"]
+
+
+def make_dispatcher(db, handler):
+    """Dispatcher on the test database with a mock receiver"""
+    return WebhookDispatcher(
+        session_factory=sessionmaker(bind=db.get_bind()),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+async def test_webhook_test_event_is_delivered(client, auth_headers, db):
+    """Test that a queued test event is posted, signed, by the dispatcher"""
+    webhook = create_webhook(client, auth_headers)
+
+    response = client.post(
+        f"/api/v1/webhooks/{webhook['id']}/test", headers=auth_headers, json={}
+    )
+    assert response.status_code == status.HTTP_200_OK
+    delivery_id = response.json()["delivery_id"]
+
+    received = []
+
+    def receiver(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(200)
+
+    assert await make_dispatcher(db, receiver).run_once() == 1
+
+    assert len(received) == 1
+    body = received[0].content.decode()
+    assert json.loads(body)["data"]["test"] is True
+    assert received[0].headers["X-Webhook-Signature"] == generate_webhook_signature(
+        body, webhook["secret"]
+    )
+
+    db.expire_all()
+    delivery = db.get(WebhookDelivery, delivery_id)
+    assert delivery.status == "delivered"
+    assert delivery.webhook.last_triggered_at is not None
+
+
+async def test_webhook_delivery_retries_then_fails(client, auth_headers, db):
+    """Test that server errors are retried with backoff until attempts run out"""
+    webhook = create_webhook(client, auth_headers, retry_count=2)
+
+    response = client.post(
+        f"/api/v1/webhooks/{webhook['id']}/test", headers=auth_headers, json={}
+    )
+    delivery_id = response.json()["delivery_id"]
+
+    dispatcher = make_dispatcher(db, lambda request: httpx.Response(503))
+
+    await dispatcher.run_once()
+    db.expire_all()
+    delivery = db.get(WebhookDelivery, delivery_id)
+    assert delivery.status == "pending"
+    assert delivery.attempts == 1
+    assert delivery.response_status == 503
+
+    # Not due again until the backoff has passed
+    delivery.next_attempt_at = datetime.now(timezone.utc)
+    db.commit()
+
+    await dispatcher.run_once()
+    db.expire_all()
+    delivery = db.get(WebhookDelivery, delivery_id)
+    assert delivery.status == "failed"
+    assert delivery.attempts == 2
+
+
+def test_trigger_webhooks_matches_subscriptions(client, auth_headers, db, test_user, test_model):
+    """Test that an event is queued only for webhooks subscribed to its type and model"""
+    errors = create_webhook(client, auth_headers, events=["error"])
+    model_errors = create_webhook(
+        client, auth_headers, events=["error"], model_id=str(test_model.id)
+    )
+    create_webhook(client, auth_headers, events=["prediction"])
+
+    other_model = Model(
+        user_id=test_user.id,
+        name="other_model",
+        model_type="sklearn",
+        file_path=test_model.file_path,
+    )
+    db.add(other_model)
+    db.commit()
+    create_webhook(client, auth_headers, events=["error"], model_id=str(other_model.id))
+
+    trigger_webhooks(
+        db,
+        event_type="error",
+        model_id=str(test_model.id),
+        user_id=str(test_user.id),
+        data={"error": "boom"},
+    )
+
+    queued = {str(delivery.webhook_id) for delivery in db.query(WebhookDelivery).all()}
+    assert queued == {errors["id"], model_errors["id"]}
+
+
+async def test_batched_webhook_posts_signed_array(client, auth_headers, db, test_user, test_model):
+    """Test that a batched webhook gets waiting events as one signed array once the batch fills"""
+    webhook = create_webhook(
+        client, auth_headers, events=["prediction"], batch_size=3, batch_window_seconds=60
+    )
+
+    received = []
+
+    def receiver(request: httpx.Request) -> httpx.Response:
+        received.append(request)
+        return httpx.Response(200)
+
+    dispatcher = make_dispatcher(db, receiver)
+
+    def trigger(n):
+        trigger_webhooks(
+            db,
+            event_type="prediction",
+            model_id=str(test_model.id),
+            user_id=str(test_user.id),
+            data={"n": n},
+        )
+
+    # Still inside the batch window and short of a full batch
+    trigger(1)
+    trigger(2)
+    assert await dispatcher.run_once() == 0
+
+    trigger(3)
+    trigger(4)
+    assert await dispatcher.run_once() == 3
+
+    assert len(received) == 1
+    body = received[0].content.decode()
+    assert [event["data"]["n"] for event in json.loads(body)] == [1, 2, 3]
+    assert received[0].headers["X-Webhook-Batch-Size"] == "3"
+    assert received[0].headers["X-Webhook-Signature"] == generate_webhook_signature(
+        body, webhook["secret"]
+    )
+
+    db.expire_all()
+    statuses = sorted(delivery.status for delivery in db.query(WebhookDelivery).all())
+    assert statuses == ["delivered", "delivered", "delivered", "pending"]